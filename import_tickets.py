@@ -0,0 +1,27 @@
+import os
+import sys
+
+from dotenv import load_dotenv
+
+from src.database.database_connect import DatabaseConnect
+from src.database.ticket_import import TicketImporter
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python import_tickets.py <file.csv|file.jsonl>")
+        sys.exit(1)
+    if os.path.exists(".env.local"):
+        load_dotenv(dotenv_path=".env.local")
+    else:
+        load_dotenv()
+    path = sys.argv[1]
+    file_format = "jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv"
+    database_connection = DatabaseConnect()
+    database_connection.connect()
+    with open(path, newline="", encoding="utf-8") as file:
+        report = TicketImporter(database_connection).import_tickets(file, file_format)
+    database_connection.disconnect()
+    print("Imported tickets: " + str(report["imported"]))
+    print("Rejected rows: " + str(len(report["rejected"])))
+    for line, ticket_id, reason in report["rejected"]:
+        print("  line {}: {} ({})".format(line, ticket_id, reason))
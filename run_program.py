@@ -1,13 +1,42 @@
 # load and run tms.py
+import asyncio
 import os
 from src.database.database_connect import DatabaseConnect
 from src.backlog import Backlog
+from src.column_store import ColumnStore
 from src.gui import GUI
 from src.interface import Interface
 from src.tms import TMS
+from src.async_tms import AsyncTMS
 from src.db import DB
+from src.async_db import AsyncDB
+from src.caching_data import CachingData
+from src.hybrid_data import HybridData
+from src.write_behind_data import WriteBehindData
+from src.database.ticket_listener import TicketListener
 from dotenv import load_dotenv
 
+
+def notify_all(callbacks):
+    """
+    Combine the callbacks of a TicketListener.
+
+    :param callbacks: The functions to call with the changed ticket IDs, in order.
+    :return: A function calling each of them.
+    """
+
+    def on_change(ticket_ids):
+        for callback in callbacks:
+            callback(ticket_ids)
+
+    return on_change
+
+
+async def run_async(interface):
+    async with AsyncDB(os.getenv("SEARCH") == "fulltext") as data:
+        await AsyncTMS(interface, data).main()
+
+
 if __name__ == "__main__":
     if os.path.exists(".env.local"):
         load_dotenv(dotenv_path=".env.local")
@@ -19,10 +48,53 @@ if __name__ == "__main__":
         interface = GUI()
     else:
         interface = Interface()
-    data = None
-    if os.getenv("DATA") == "database":
-        data = DB(DatabaseConnect())
+    if os.getenv("DATA") == "asyncdatabase":
+        asyncio.run(run_async(interface))
     else:
-        data = Backlog()
-    tms = TMS(interface, data)
-    tms.main()
+        data = None
+        database_connection = None
+        listener = None
+        write_behind = None
+        backlog = None
+        on_change = []
+        if os.getenv("DATA") == "database":
+            database_connection = DatabaseConnect()
+            data = DB(database_connection, os.getenv("SEARCH") == "fulltext")
+            if os.getenv("WRITE_BEHIND"):
+                data = write_behind = WriteBehindData(
+                    data,
+                    int(os.getenv("WRITE_BEHIND_SIZE", "1000")),
+                    float(os.getenv("WRITE_BEHIND_INTERVAL_MS", "50")) / 1000,
+                    max_retries=int(os.getenv("WRITE_BEHIND_RETRIES", "3")),
+                )
+        elif os.getenv("DATA") == "hybrid":
+            database_connection = DatabaseConnect()
+            data = HybridData(DB(database_connection))
+            # Apply the writes of other processes to the tickets in memory.
+            on_change.append(data.refresh)
+        elif os.getenv("DATA") == "column":
+            data = ColumnStore()
+        else:
+            data = backlog = Backlog()
+            if os.getenv("SNAPSHOT") and os.path.exists(os.getenv("SNAPSHOT")):
+                backlog.load_snapshot(os.getenv("SNAPSHOT"))
+        if os.getenv("CACHE_SIZE"):
+            data = CachingData(
+                data,
+                int(os.getenv("CACHE_SIZE")),
+                float(os.getenv("CACHE_TTL", "60")),
+            )
+            if database_connection is not None:
+                # Drop the results of the tickets written by other processes.
+                on_change.append(data.invalidate)
+        if on_change:
+            listener = TicketListener(database_connection, notify_all(on_change))
+            listener.start()
+        tms = TMS(interface, data)
+        tms.main()
+        if write_behind is not None:
+            write_behind.close()
+        if backlog is not None and os.getenv("SNAPSHOT"):
+            backlog.save_snapshot(os.getenv("SNAPSHOT"))
+        if listener is not None:
+            listener.stop()
@@ -5,6 +5,7 @@ setup(
     version="0.4",
     packages=find_packages(),
     install_requires=["python-dotenv", "psycopg2", "PySimpleGUI", "sphinx"],
+    extras_require={"async": ["asyncpg"]},
     tests_require=["coverage"],
     test_suite="test",
 )
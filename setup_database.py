@@ -3,19 +3,7 @@ import os
 from dotenv import load_dotenv
 
 from src.database.database_connect import DatabaseConnect
-
-create_table_ticket = """
-    CREATE TABLE IF NOT EXISTS ticket (
-    id TEXT PRIMARY KEY,
-    name TEXT NOT NULL,
-    description TEXT NOT NULL,
-    ticket_type TEXT NOT NULL,
-    state TEXT NOT NULL,
-    responsible TEXT NOT NULL,
-    date_created TIMESTAMP NOT NULL DEFAULT NOW()
-);
-"""
-
+from src.database.migrations import MigrationRunner
 
 if __name__ == "__main__":
     if os.path.exists(".env.local"):
@@ -24,6 +12,9 @@ if __name__ == "__main__":
         load_dotenv()
     database_connection = DatabaseConnect()
     database_connection.connect()
-    database_connection.execute(create_table_ticket)
-    print("Tables created successfully")
+    versions = MigrationRunner(database_connection).run()
+    if versions:
+        print("Applied migrations: " + ", ".join(str(v) for v in versions))
+    else:
+        print("Database is up to date")
     database_connection.disconnect()
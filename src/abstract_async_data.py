@@ -0,0 +1,98 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+from src.constants import State, Responsible
+from src.ticket import Ticket
+
+
+class AbstractAsyncData(ABC):
+    """
+    AbstractAsyncData is an abstract base class that defines the interface for
+    asynchronous data operations, the coroutine counterpart of AbstractData used by
+    AsyncTMS.
+    """
+
+    @abstractmethod
+    async def search_tickets(self, keyword) -> list[Ticket]:
+        """
+        Search for tickets using a keyword.
+
+        :param keyword: The keyword to search for.
+        :return: A list of Ticket objects that match the keyword.
+        """
+        pass
+
+    @abstractmethod
+    async def get_ticket(self, ticket_id) -> Optional[Ticket]:
+        """
+        Get a ticket by its ID.
+
+        :param ticket_id: The ID of the ticket.
+        :return: The Ticket object with the given ID, or None if no such ticket exists.
+        """
+        pass
+
+    @abstractmethod
+    async def id_exists(self, ticket_id) -> bool:
+        """
+        Check if a ticket ID exists.
+
+        :param ticket_id: The ID of the ticket.
+        :return: True if the ticket ID exists, False otherwise.
+        """
+        pass
+
+    @abstractmethod
+    async def create_ticket(self, ticket):
+        """
+        Create a new ticket.
+
+        :param ticket: The Ticket object to create.
+        """
+        pass
+
+    @abstractmethod
+    async def set_ticket_state(
+        self,
+        ticket_id,
+        state: State,
+        responsible: Optional[Responsible] = None,
+        only_responsible: Optional[Responsible] = None,
+    ) -> Optional[Ticket]:
+        """
+        Change the state, and optionally the responsible, of an open ticket.
+
+        :param ticket_id: The ID of the ticket.
+        :param state: The new state of the ticket.
+        :param responsible: The new responsible of the ticket, or None to keep it.
+        :param only_responsible: If given, the ticket is only changed if it is
+            currently assigned to this responsible.
+        :return: The changed Ticket object, or None if no open ticket matched.
+        """
+        pass
+
+    @abstractmethod
+    async def get_old_new_ticket(self) -> list[Ticket]:
+        """
+        Get a list of new tickets that are older than 3 days.
+
+        :return: A list of Ticket objects.
+        """
+        pass
+
+    @abstractmethod
+    async def get_old_assigned_ticket(self) -> list[Ticket]:
+        """
+        Get a list of assigned tickets that are older than 10 days.
+
+        :return: A list of Ticket objects.
+        """
+        pass
+
+    @abstractmethod
+    async def get_old_ticket_list(self) -> list[Ticket]:
+        """
+        Get a list of all tickets that are older than 20 days.
+
+        :return: A list of Ticket objects.
+        """
+        pass
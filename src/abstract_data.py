@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from typing import Optional
+from src.constants import PAGE_SIZE, State, Responsible, Type
 from src.ticket import Ticket
 
 
@@ -18,6 +19,22 @@ class AbstractData(ABC):
         """
         pass
 
+    @abstractmethod
+    def search_tickets_page(
+        self, keyword, cursor=None, limit=PAGE_SIZE
+    ) -> tuple[list[Ticket], Optional[tuple]]:
+        """
+        Get one page of the open tickets matching a keyword, ordered by creation
+        date then ID.
+
+        :param keyword: The keyword to search for.
+        :param cursor: The cursor returned with the previous page, or None for the first page.
+        :param limit: The maximum number of tickets in the page.
+        :return: A tuple of the tickets of the page and the cursor of the next page,
+            or None if this page is the last one.
+        """
+        pass
+
     @abstractmethod
     def get_ticket(self, ticket_id) -> Optional[Ticket]:
         """
@@ -39,12 +56,12 @@ class AbstractData(ABC):
         pass
 
     @abstractmethod
-    def create_ticket(self, ticket) -> bool:
+    def create_ticket(self, ticket) -> Optional[Ticket]:
         """
         Create a new ticket.
 
         :param ticket: The Ticket object to create.
-        :return: True if the ticket was created successfully, False otherwise.
+        :return: The created ticket as stored, or None if it was not created.
         """
         pass
 
@@ -68,6 +85,91 @@ class AbstractData(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_tickets(self, ticket_ids) -> list[Optional[Ticket]]:
+        """
+        Get several open tickets in one operation.
+
+        :param ticket_ids: An iterable of ticket IDs.
+        :return: A list holding, for each ID in order, its ticket or None if no open
+            ticket has this ID.
+        """
+        pass
+
+    @abstractmethod
+    def create_tickets(self, tickets) -> list[bool]:
+        """
+        Create several tickets in one operation.
+
+        :param tickets: An iterable of the tickets to create.
+        :return: A list telling for each ticket if it was created, in order. A
+            ticket is not created if its ID exists or appears earlier in the batch.
+        """
+        pass
+
+    @abstractmethod
+    def update_tickets(self, tickets) -> list[bool]:
+        """
+        Update the state and responsible of several tickets in one operation.
+
+        :param tickets: An iterable of the tickets to update.
+        :return: A list telling for each ticket if it was updated, in order.
+        """
+        pass
+
+    @abstractmethod
+    def close_tickets(
+        self, tickets, only_responsible: Optional[Responsible] = None
+    ) -> list[bool]:
+        """
+        Close several tickets in one operation.
+
+        :param tickets: An iterable of the tickets to close.
+        :param only_responsible: If given, a ticket is only closed if it is
+            currently assigned to this responsible.
+        :return: A list telling for each ticket if it was closed, in order. A
+            ticket appearing twice is only closed by its first occurrence.
+        """
+        pass
+
+    @abstractmethod
+    def set_ticket_state(
+        self,
+        ticket_id,
+        state: State,
+        responsible: Optional[Responsible] = None,
+        only_responsible: Optional[Responsible] = None,
+    ) -> Optional[Ticket]:
+        """
+        Change the state, and optionally the responsible, of an open ticket in one step.
+        Setting the CLOSED state closes the ticket.
+
+        :param ticket_id: The ID of the ticket.
+        :param state: The new state of the ticket.
+        :param responsible: The new responsible of the ticket, or None to keep it.
+        :param only_responsible: If given, the ticket is only changed if it is
+            currently assigned to this responsible.
+        :return: The changed Ticket object, or None if no open ticket matched.
+        """
+        pass
+
+    @abstractmethod
+    def filter_tickets(
+        self,
+        state: Optional[State] = None,
+        responsible: Optional[Responsible] = None,
+        ticket_type: Optional[Type] = None,
+    ) -> list[Ticket]:
+        """
+        Get the open tickets matching all the given criteria.
+
+        :param state: The state to filter on, or None to accept any state.
+        :param responsible: The responsible to filter on, or None to accept any.
+        :param ticket_type: The type to filter on, or None to accept any type.
+        :return: A list of Ticket objects matching every given criterion.
+        """
+        pass
+
     @abstractmethod
     def get_old_new_ticket(self) -> list[Ticket]:
         """
@@ -94,3 +196,48 @@ class AbstractData(ABC):
         :return: A list of Ticket objects that are older than 20 days.
         """
         pass
+
+    @abstractmethod
+    def get_tar_3(self) -> dict[str, list[Ticket]]:
+        """
+        Get the three lists of old tickets of the TAR-3 report in one operation.
+
+        :return: A dictionary with the "new", "assigned" and "all" keys, holding the
+            results of get_old_new_ticket, get_old_assigned_ticket and
+            get_old_ticket_list respectively.
+        """
+        pass
+
+    @abstractmethod
+    def count_tar_3(self) -> dict[str, int]:
+        """
+        Count the tickets of each list of the TAR-3 report without fetching them.
+
+        :return: A dictionary with the "new", "assigned" and "all" keys, holding the
+            number of tickets of each list of get_tar_3.
+        """
+        pass
+
+    @abstractmethod
+    def get_tar_3_page(
+        self, bucket, cursor=None, limit=PAGE_SIZE
+    ) -> tuple[list[Ticket], Optional[tuple]]:
+        """
+        Get one page of a list of the TAR-3 report, oldest first.
+
+        :param bucket: The list to get a page of: "new", "assigned" or "all".
+        :param cursor: The cursor returned with the previous page, or None for the first page.
+        :param limit: The maximum number of tickets in the page.
+        :return: A tuple of the tickets of the page and the cursor of the next page,
+            or None if this page is the last one.
+        """
+        pass
+
+    def flush(self):
+        """
+        Write the writes kept back by the data source, if any.
+
+        It is called when the program exits. Data sources writing immediately
+        have nothing to do.
+        """
+        pass
@@ -0,0 +1,143 @@
+import heapq
+from bisect import bisect_left, bisect_right
+
+
+class AgingIndex:
+    """
+    An index keeping keys ordered by their creation timestamp, then by key.
+    It answers "created before a given time" queries with a binary search and a slice.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty index.
+        """
+        self.timestamps: list[int] = []
+        self.keys: list = []
+
+    def __len__(self):
+        """
+        Get the number of indexed keys.
+
+        :return: The number of indexed keys.
+        """
+        return len(self.keys)
+
+    def _position(self, timestamp, key) -> int:
+        """
+        Get the position of a key in the index, or the position where it belongs.
+
+        :param timestamp: The creation timestamp of the key.
+        :param key: The key to locate.
+        :return: The position of the key.
+        """
+        low = bisect_left(self.timestamps, timestamp)
+        high = bisect_right(self.timestamps, timestamp, low)
+        return bisect_left(self.keys, key, low, high)
+
+    def add(self, timestamp, key):
+        """
+        Add a key to the index.
+
+        :param timestamp: The creation timestamp of the key.
+        :param key: The key to add.
+        """
+        position = self._position(timestamp, key)
+        self.timestamps.insert(position, timestamp)
+        self.keys.insert(position, key)
+
+    def add_many(self, entries):
+        """
+        Add several keys to the index in one pass.
+
+        The entries are sorted and merged with the indexed keys, instead of being
+        inserted one at a time.
+
+        :param entries: An iterable of (timestamp, key) pairs.
+        """
+        entries = sorted(entries)
+        if len(entries) <= 1:
+            for timestamp, key in entries:
+                self.add(timestamp, key)
+            return
+        merged = list(heapq.merge(zip(self.timestamps, self.keys), entries))
+        self.timestamps[:] = [timestamp for timestamp, _ in merged]
+        self.keys[:] = [key for _, key in merged]
+
+    def remove(self, timestamp, key) -> bool:
+        """
+        Remove a key from the index.
+
+        :param timestamp: The creation timestamp the key was added with.
+        :param key: The key to remove.
+        :return: True if the key was indexed, False otherwise.
+        """
+        position = self._position(timestamp, key)
+        if position == len(self.keys) or self.keys[position] != key:
+            return False
+        del self.timestamps[position]
+        del self.keys[position]
+        return True
+
+    def remove_many(self, entries):
+        """
+        Remove several keys from the index in one pass.
+
+        :param entries: An iterable of the (timestamp, key) pairs the keys were
+            added with.
+        """
+        entries = set(entries)
+        if len(entries) <= 1:
+            for timestamp, key in entries:
+                self.remove(timestamp, key)
+            return
+        kept = [
+            entry for entry in zip(self.timestamps, self.keys) if entry not in entries
+        ]
+        self.timestamps[:] = [timestamp for timestamp, _ in kept]
+        self.keys[:] = [key for _, key in kept]
+
+    def clear(self):
+        """
+        Remove every key from the index.
+        """
+        self.timestamps.clear()
+        self.keys.clear()
+
+    def created_before(self, cutoff) -> list:
+        """
+        Get the keys created at or before the cutoff, oldest first.
+
+        :param cutoff: The latest creation timestamp to include.
+        :return: A list of keys.
+        """
+        return self.keys[: bisect_right(self.timestamps, cutoff)]
+
+    def count_created_before(self, cutoff) -> int:
+        """
+        Count the keys created at or before the cutoff.
+
+        :param cutoff: The latest creation timestamp to include.
+        :return: The number of keys.
+        """
+        return bisect_right(self.timestamps, cutoff)
+
+    def page_created_before(self, cutoff, after=None, limit=None) -> list:
+        """
+        Get a page of the keys created at or before the cutoff, oldest first.
+
+        :param cutoff: The latest creation timestamp to include.
+        :param after: The (timestamp, key) pair the page starts after, or None to
+            start with the oldest key.
+        :param limit: The maximum number of keys, or None for no limit.
+        :return: A list of keys.
+        """
+        start = 0
+        if after is not None:
+            start = self._position(*after)
+            if start < len(self.keys) and self.keys[start] == after[1]:
+                start += 1
+        end = bisect_right(self.timestamps, cutoff)
+        if limit is not None:
+            end = min(end, start + limit)
+        return self.keys[start:end]
@@ -0,0 +1,252 @@
+import os
+from typing import Optional
+
+from src.abstract_async_data import AbstractAsyncData
+from src.database.database_connect import DatabaseConnect, numbered_placeholders
+from src.db import (
+    PREPARED_STATEMENTS,
+    TAR_3_CONDITIONS,
+    data_to_ticket,
+    ranked_search_query,
+    set_state_query,
+    uses_full_text,
+)
+from src.ticket import Ticket
+from src.constants import State, Responsible
+
+try:
+    import asyncpg
+except ImportError:  # The asynchronous backend is optional.
+    asyncpg = None
+
+
+class AsyncDB(AbstractAsyncData):
+    """
+    This class represents the asynchronous database operations for the ticket
+    management system, run with asyncpg on a pool of connections.
+
+    It runs the same queries as DB, so the two can share a database. Every call
+    takes a connection of the pool for the time of its query, so concurrent
+    coroutines run their queries at the same time, up to DATABASE_POOL_MAX
+    connections (10 by default). asyncpg prepares the statements it runs and keeps
+    them per connection, so the fixed queries are only planned once per connection.
+    """
+
+    def __init__(self, full_text_search: bool = False, pool=None):
+        """
+        Initialize the AsyncDB class without connecting.
+
+        :param full_text_search: True to search the name and description with the
+            full-text search vector instead of substrings.
+        :param pool: A connection pool to use, or None to create one on connect.
+        """
+        self.full_text_search = full_text_search
+        self.pool = pool
+
+    @staticmethod
+    def pool_parameters() -> dict:
+        """
+        Get the parameters of the connection pool from the environment variables
+        read by DatabaseConnect.
+
+        :return: A dictionary of asyncpg.create_pool keyword arguments.
+        """
+        parameters = DatabaseConnect.connection_parameters()
+        pool_parameters = {
+            "database": parameters["dbname"],
+            "user": parameters["user"],
+            "password": parameters["password"],
+            "host": parameters["host"],
+            "port": int(parameters["port"]) if parameters["port"] else None,
+        }
+        synchronous_commit = os.getenv("DATABASE_SYNCHRONOUS_COMMIT")
+        if synchronous_commit:
+            pool_parameters["server_settings"] = {
+                "synchronous_commit": synchronous_commit
+            }
+        pool_max = int(os.getenv("DATABASE_POOL_MAX", "0"))
+        if pool_max > 0:
+            pool_parameters["max_size"] = pool_max
+            pool_parameters["min_size"] = min(
+                int(os.getenv("DATABASE_POOL_MIN", "1")), pool_max
+            )
+        return pool_parameters
+
+    async def connect(self):
+        """
+        Create the connection pool, unless one was given.
+        """
+        if self.pool is not None:
+            return
+        if asyncpg is None:
+            raise RuntimeError("The asynchronous backend requires asyncpg")
+        self.pool = await asyncpg.create_pool(**self.pool_parameters())
+
+    async def disconnect(self):
+        """
+        Close the connection pool.
+        """
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+
+    async def __aenter__(self):
+        """
+        Connect when entering an async with block.
+
+        :return: This AsyncDB object.
+        """
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        """
+        Disconnect when leaving an async with block.
+        """
+        await self.disconnect()
+
+    async def fetch(self, query, data=()):
+        """
+        Fetch all rows from a query.
+
+        :param query: The SQL query to fetch from, with %s placeholders.
+        :param data: The data to use in the query.
+        :return: The rows of the query.
+        """
+        return await self.pool.fetch(numbered_placeholders(query), *data)
+
+    async def fetchrow(self, query, data=()):
+        """
+        Fetch the first row of a query.
+
+        :param query: The SQL query to fetch from, with %s placeholders.
+        :param data: The data to use in the query.
+        :return: The first row of the query, or None if it has no rows.
+        """
+        return await self.pool.fetchrow(numbered_placeholders(query), *data)
+
+    async def execute(self, query, data=()):
+        """
+        Execute a query.
+
+        :param query: The SQL query to execute, with %s placeholders.
+        :param data: The data to use in the query.
+        """
+        await self.pool.execute(numbered_placeholders(query), *data)
+
+    async def search_tickets(self, keyword) -> list[Ticket]:
+        """
+        Search tickets in the database using a keyword.
+
+        :param keyword: A string to search in the database.
+        :return: A list of Ticket objects that match the keyword.
+        """
+        full_text = uses_full_text(keyword, self.full_text_search)
+        result = await self.fetch(*ranked_search_query(keyword, full_text))
+        return [data_to_ticket(row) for row in result]
+
+    async def get_ticket(self, ticket_id) -> Optional[Ticket]:
+        """
+        Get a ticket from the database using its ID.
+
+        :param ticket_id: The ID of the ticket.
+        :return: A Ticket object if found, None otherwise.
+        """
+        result = await self.fetchrow(
+            PREPARED_STATEMENTS["get_ticket"], (ticket_id, State.CLOSED.value)
+        )
+        if result:
+            return data_to_ticket(result)
+        return None
+
+    async def id_exists(self, ticket_id) -> bool:
+        """
+        Check if a ticket ID exists in the database.
+
+        :param ticket_id: The ID of the ticket.
+        :return: True if the ticket ID exists, False otherwise.
+        """
+        result = await self.fetchrow(
+            PREPARED_STATEMENTS["id_exists"], (ticket_id, State.CLOSED.value)
+        )
+        return result is not None
+
+    async def create_ticket(self, ticket):
+        """
+        Create a new ticket in the database.
+
+        :param ticket: A Ticket object to be created in the database.
+        """
+        data = (
+            ticket.id,
+            ticket.name,
+            ticket.details,
+            ticket.type.value,
+            ticket.state.value,
+            ticket.responsible.value,
+        )
+        await self.execute(PREPARED_STATEMENTS["create_ticket"], data)
+
+    async def set_ticket_state(
+        self,
+        ticket_id,
+        state: State,
+        responsible: Optional[Responsible] = None,
+        only_responsible: Optional[Responsible] = None,
+    ) -> Optional[Ticket]:
+        """
+        Change the state, and optionally the responsible, of an open ticket
+        with a single conditional UPDATE returning the changed row.
+
+        :param ticket_id: The ID of the ticket.
+        :param state: The new state of the ticket.
+        :param responsible: The new responsible of the ticket, or None to keep it.
+        :param only_responsible: If given, the ticket is only changed if it is
+            currently assigned to this responsible.
+        :return: The changed Ticket object, or None if no open ticket matched.
+        """
+        name, data = set_state_query(ticket_id, state, responsible, only_responsible)
+        result = await self.fetchrow(PREPARED_STATEMENTS[name], data)
+        if result:
+            return data_to_ticket(result)
+        return None
+
+    async def _tar_3_list(self, bucket) -> list[Ticket]:
+        """
+        Get a list of the TAR-3 report, ordered by creation date then id.
+
+        :param bucket: The list to get: "new", "assigned" or "all".
+        :return: A list of Ticket objects.
+        """
+        condition, data = TAR_3_CONDITIONS[bucket]
+        query = f"""
+            SELECT t.id,t.name,t.description,t.ticket_type,t.state,t.responsible,t.date_created
+            FROM ticket t
+            WHERE {condition}
+            ORDER BY t.date_created, t.id
+        """
+        return [data_to_ticket(row) for row in await self.fetch(query, data)]
+
+    async def get_old_new_ticket(self) -> list[Ticket]:
+        """
+        Get a list of new tickets that are older than 3 days.
+
+        :return: A list of Ticket objects.
+        """
+        return await self._tar_3_list("new")
+
+    async def get_old_assigned_ticket(self) -> list[Ticket]:
+        """
+        Get a list of assigned tickets that are older than 10 days.
+
+        :return: A list of Ticket objects.
+        """
+        return await self._tar_3_list("assigned")
+
+    async def get_old_ticket_list(self) -> list[Ticket]:
+        """
+        Get a list of all tickets that are older than 20 days.
+
+        :return: A list of Ticket objects.
+        """
+        return await self._tar_3_list("all")
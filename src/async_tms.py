@@ -0,0 +1,182 @@
+import asyncio
+
+from src.abstract_interface import AbstractInterface
+from src.abstract_async_data import AbstractAsyncData
+from src.ticket import Ticket
+from src.tms import TMS
+from src.constants import State, Responsible, Type
+
+
+class AsyncTMS:
+    """
+    This class represents the ticket management system on an asynchronous data
+    source.
+
+    Its command methods are the coroutine counterparts of those of TMS, with the
+    same checks and messages, so a single process can serve many ticket operations
+    at the same time. The interface is still called synchronously.
+    """
+
+    def __init__(
+        self, abstract_interface: AbstractInterface, abstract_data: AbstractAsyncData
+    ):
+        """
+        Initialize a new instance of the AsyncTMS class.
+
+        :param abstract_interface: The interface to use for user interaction.
+        :param abstract_data: The asynchronous data source to use for ticket management.
+        """
+        self.interface = abstract_interface
+        self.data = abstract_data
+
+    async def close_ticket(self, case_id):
+        """
+        Close a ticket by its ID.
+
+        :param case_id: The ID of the ticket to close.
+        :return: True if the ticket was closed successfully, False otherwise.
+        """
+        self.interface.print_close_ticket(case_id)
+        ticket = await self.data.set_ticket_state(
+            case_id, State.CLOSED, only_responsible=Responsible.L1
+        )
+        if ticket is not None:
+            return True
+        if await self.data.get_ticket(case_id) is None:
+            self.interface.print_ticket_invalid_id(case_id)
+        else:
+            self.interface.print_l1_close_ticket()
+        return False
+
+    async def create_ticket(self, id, name, description, ticket_type):
+        """
+        Create a new ticket with the given details.
+
+        :param id: The ID of the ticket.
+        :param name: The name of the customer.
+        :param description: The description of the ticket.
+        :param ticket_type: The type of the ticket.
+        :return: True if the ticket was created successfully, False otherwise.
+        """
+        error = TMS.new_ticket_error(id, name, description, ticket_type)
+        if error is not None:
+            TMS.print_new_ticket_error(self.interface, error)
+            return False
+        if await self.data.id_exists(id):
+            self.interface.print_id_already_exists()
+            return False
+        ticket = Ticket(
+            id, name, description, Type.get_enum(ticket_type), State.NEW, Responsible.L1
+        )
+        self.interface.print_created_ticket(ticket)
+        await self.data.create_ticket(ticket)
+        return True
+
+    async def print_one_ticket(self, case_id):
+        """
+        Print the details of a ticket with the given ID.
+
+        :param case_id: The ID of the ticket to print.
+        :return: True if the ticket was found and printed, False otherwise.
+        """
+        ticket = await self.data.get_ticket(case_id)
+        if ticket is None:
+            self.interface.print_ticket_invalid_id(case_id)
+            return False
+        self.interface.print_searched_ticket(ticket)
+        return True
+
+    async def search_tickets(self, keyword):
+        """
+        Search for tickets using a keyword.
+
+        :param keyword: The keyword to search for.
+        :return: True if any tickets were found, False otherwise.
+        """
+        self.interface.print_searched_keyword(keyword)
+        tickets = await self.data.search_tickets(keyword)
+        if len(tickets) == 0:
+            self.interface.print_keyword_not_found(keyword)
+            return False
+        self.interface.print_search(keyword, tickets)
+        return True
+
+    async def update_ticket(self, case_id, new_state, new_assign):
+        """
+        Update the state and responsible for a ticket.
+
+        :param case_id: The ID of the ticket to update.
+        :param new_state: The new state of the ticket.
+        :param new_assign: The new assignee of the ticket.
+        :return: True if the ticket was updated successfully, False otherwise.
+        """
+        new_state_enum = TMS.update_state(new_state)
+        if new_state_enum is None:
+            self.interface.print_invalid_state(new_state)
+            return False
+        new_assign_enum = Responsible.get_enum(new_assign)
+        if new_assign_enum is None:
+            self.interface.print_invalid_responsible(new_assign)
+            return False
+        self.interface.print_updated_ticket(case_id, new_assign, new_state)
+        ticket = await self.data.set_ticket_state(
+            case_id, new_state_enum, new_assign_enum
+        )
+        if ticket is None:
+            self.interface.print_ticket_invalid_id(case_id)
+            return False
+        return True
+
+    async def get_tar_3(self):
+        """
+        Get the old tickets for the TAR-3 report.
+
+        The three lists are queried at the same time.
+
+        :return: A dictionary containing the old tickets.
+        """
+        lists = await asyncio.gather(
+            self.data.get_old_new_ticket(),
+            self.data.get_old_assigned_ticket(),
+            self.data.get_old_ticket_list(),
+        )
+        return {
+            bucket: {"tickets": tickets, "count": len(tickets)}
+            for bucket, tickets in zip(("new", "assigned", "all"), lists)
+        }
+
+    async def main(self):
+        """
+        Run the main loop of the ticket management system.
+        """
+        while 1:
+            val = self.interface.print_main_form()
+            if val == "1":  # Create a ticket
+                id, name, description, ticket_type = (
+                    self.interface.print_form_create_ticket()
+                )
+                if id is not None:
+                    await self.create_ticket(id, name, description, ticket_type)
+            elif val == "2":  # Assign a ticket
+                id, state, assign_name = self.interface.print_form_update_ticket()
+                if id is not None:
+                    await self.update_ticket(id, state, assign_name)
+            elif val == "3":  # Close a ticket
+                id = self.interface.print_form_close_ticket()
+                if id is not None:
+                    await self.close_ticket(id)
+            elif val == "4":  # Search issues
+                keyword = self.interface.print_form_search_ticket()
+                if keyword is not None:
+                    await self.search_tickets(keyword)
+            elif val == "5":  # Display issue
+                id = self.interface.print_one_form_ticket()
+                if id is not None:
+                    await self.print_one_ticket(id)
+            elif val == "6":  # Sortie
+                tickets = await self.get_tar_3()
+                self.interface.print_tar_3_tickets(tickets)
+            elif val == "7":  # Sortie
+                break
+            else:
+                self.interface.print_invalid_selection()
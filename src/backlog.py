@@ -1,24 +1,313 @@
+import datetime
+import heapq
 from abc import ABC
 from typing import Optional
 
-from src.constants import State
+from src.constants import PAGE_SIZE, State, Responsible, Type
 
-from src.ticket import Ticket
+from src.ticket import Ticket, to_timestamp
 from src.abstract_data import AbstractData
+from src.aging_index import AgingIndex
+from src.trigram_index import TrigramIndex
+from src.snapshot import Snapshot, write_snapshot
 
 
 class Backlog(AbstractData, ABC):
     """
     This class represents a backlog of tickets stocked in the RAM.
     It provides methods to manage tickets such as creating, updating, closing, and searching for tickets.
+
+    Open tickets are kept in a dictionary indexed by ID, which also preserves
+    insertion order, so lookups by ID run in constant time. Their searchable
+    fields are also kept in a trigram index used by search_tickets, and the
+    tickets are filed in buckets by state, by responsible and by both, so
+    filtered queries only visit the matching bucket. Each state also has an
+    aging index ordering its tickets by creation date, so the TAR-3 queries
+    are answered with a binary search instead of parsing every ticket date.
+
+    The secondary indexes are rebuilt lazily after the tickets are replaced
+    as a whole, and are kept up to date incrementally afterwards.
+
+    The tickets can be saved to a snapshot file and loaded from it. A loaded
+    snapshot stays mapped in memory: tickets looked up by ID are decoded from it
+    one at a time, and the tickets are only all decoded on the first other use.
     """
 
     def __init__(self):
         """
         Initialize a new instance of the Backlog class.
         """
-        self.tickets: list[Ticket] = []
-        self.deleted_tickets: list[Ticket] = []
+        self._tickets: dict[str, Ticket] = {}
+        self._search_index = TrigramIndex()
+        self._by_state: dict[State, dict[str, Ticket]] = {}
+        self._by_responsible: dict[Responsible, dict[str, Ticket]] = {}
+        self._by_state_responsible: dict[
+            tuple[State, Responsible], dict[str, Ticket]
+        ] = {}
+        self._by_state_age: dict[State, AgingIndex] = {}
+        self._by_age = AgingIndex()
+        self._filed: dict[str, tuple[State, Responsible, int]] = {}
+        self._indexed = True
+        self._deleted_tickets: list[Ticket] = []
+        self._snapshot: Optional[Snapshot] = None
+
+    @property
+    def tickets(self) -> list[Ticket]:
+        """
+        Get the open tickets in insertion order.
+
+        :return: A list of the open tickets.
+        """
+        self._ensure_loaded()
+        return list(self._tickets.values())
+
+    @tickets.setter
+    def tickets(self, tickets):
+        """
+        Replace the open tickets. The secondary indexes are rebuilt on next use.
+
+        :param tickets: An iterable of tickets.
+        """
+        self._ensure_loaded()
+        self._tickets = {ticket.id: ticket for ticket in tickets}
+        self._indexed = False
+
+    @property
+    def deleted_tickets(self) -> list[Ticket]:
+        """
+        Get the closed tickets in the order they were closed.
+
+        :return: The list of the closed tickets.
+        """
+        self._ensure_loaded()
+        return self._deleted_tickets
+
+    def save_snapshot(self, path):
+        """
+        Save the open and closed tickets to a snapshot file.
+
+        :param path: The path of the snapshot file, replaced if it exists.
+        """
+        write_snapshot(path, self.tickets + self.deleted_tickets)
+
+    def load_snapshot(self, path):
+        """
+        Replace the open and closed tickets with the ones of a snapshot file.
+
+        The file is mapped in memory and the tickets are decoded on next use.
+
+        :param path: The path of the snapshot file, written by save_snapshot.
+        :raises ValueError: If the file is not a valid snapshot.
+        """
+        snapshot = Snapshot(path)
+        if self._snapshot is not None:
+            self._snapshot.close()
+        self._snapshot = snapshot
+        self._tickets = {}
+        self._deleted_tickets = []
+        self._indexed = False
+
+    def _ensure_loaded(self):
+        """
+        Decode the tickets of the snapshot given to load_snapshot and unmap it.
+        """
+        if self._snapshot is None:
+            return
+        snapshot, self._snapshot = self._snapshot, None
+        with snapshot:
+            for ticket in snapshot:
+                if ticket.state == State.CLOSED:
+                    self._deleted_tickets.append(ticket)
+                else:
+                    self._tickets[ticket.id] = ticket
+        self._indexed = False
+
+    def _ensure_indexes(self):
+        """
+        Rebuild the secondary indexes if the tickets were replaced since the last build.
+        """
+        self._ensure_loaded()
+        if self._indexed:
+            return
+        self._search_index.clear()
+        self._by_state.clear()
+        self._by_responsible.clear()
+        self._by_state_responsible.clear()
+        self._by_state_age.clear()
+        self._by_age.clear()
+        self._filed.clear()
+        self._index_tickets(self._tickets.values())
+        self._indexed = True
+
+    def _index_ticket(self, ticket):
+        """
+        Add a ticket to the secondary indexes.
+
+        :param ticket: The ticket to index.
+        """
+        self._search_index.add(ticket.id, self.searchable_fields(ticket))
+        timestamp = ticket.get_timestamp()
+        self._by_age.add(timestamp, ticket.id)
+        self._file_ticket(ticket, timestamp)
+
+    def _index_tickets(self, tickets):
+        """
+        Add several tickets to the secondary indexes in one pass.
+
+        :param tickets: The tickets to index.
+        """
+        entries = []
+        for ticket in tickets:
+            self._search_index.add(ticket.id, self.searchable_fields(ticket))
+            entries.append((ticket, ticket.get_timestamp()))
+        self._by_age.add_many((timestamp, ticket.id) for ticket, timestamp in entries)
+        self._file_tickets(entries)
+
+    def _file_tickets(self, entries):
+        """
+        File several tickets in the buckets matching their current state and
+        responsible, merging them in the aging indexes in one pass.
+
+        :param entries: A list of (ticket, creation timestamp) pairs.
+        """
+        by_state_age: dict[State, list[tuple[int, str]]] = {}
+        for ticket, timestamp in entries:
+            by_state_age.setdefault(ticket.state, []).append((timestamp, ticket.id))
+            self._by_state.setdefault(ticket.state, {})[ticket.id] = ticket
+            self._by_responsible.setdefault(ticket.responsible, {})[ticket.id] = ticket
+            self._by_state_responsible.setdefault(
+                (ticket.state, ticket.responsible), {}
+            )[ticket.id] = ticket
+            self._filed[ticket.id] = (ticket.state, ticket.responsible, timestamp)
+        for state, state_entries in by_state_age.items():
+            self._by_state_age.setdefault(state, AgingIndex()).add_many(state_entries)
+
+    def _unfile_tickets(self, ticket_ids) -> list[int]:
+        """
+        Remove several tickets from the buckets they were filed in, removing them
+        from the aging indexes in one pass.
+
+        :param ticket_ids: The IDs of the tickets to remove, without duplicates.
+        :return: The creation timestamps the tickets were filed with, in order.
+        """
+        by_state_age: dict[State, list[tuple[int, str]]] = {}
+        timestamps = []
+        for ticket_id in ticket_ids:
+            state, responsible, timestamp = self._filed.pop(ticket_id)
+            self._by_state[state].pop(ticket_id)
+            self._by_responsible[responsible].pop(ticket_id)
+            self._by_state_responsible[(state, responsible)].pop(ticket_id)
+            by_state_age.setdefault(state, []).append((timestamp, ticket_id))
+            timestamps.append(timestamp)
+        for state, state_entries in by_state_age.items():
+            self._by_state_age[state].remove_many(state_entries)
+        return timestamps
+
+    def _file_ticket(self, ticket, timestamp):
+        """
+        File a ticket in the buckets matching its current state and responsible.
+
+        :param ticket: The ticket to file.
+        :param timestamp: The creation timestamp of the ticket.
+        """
+        key = (ticket.state, ticket.responsible)
+        self._by_state.setdefault(ticket.state, {})[ticket.id] = ticket
+        self._by_responsible.setdefault(ticket.responsible, {})[ticket.id] = ticket
+        self._by_state_responsible.setdefault(key, {})[ticket.id] = ticket
+        self._by_state_age.setdefault(ticket.state, AgingIndex()).add(
+            timestamp, ticket.id
+        )
+        self._filed[ticket.id] = (ticket.state, ticket.responsible, timestamp)
+
+    def _unfile_ticket(self, ticket_id):
+        """
+        Remove a ticket from the buckets it was filed in.
+
+        The buckets are found from the recorded key rather than from the ticket,
+        whose state may already have been changed by the caller.
+
+        :param ticket_id: The ID of the ticket to remove.
+        :return: The creation timestamp the ticket was filed with.
+        """
+        state, responsible, timestamp = self._filed.pop(ticket_id)
+        self._by_state[state].pop(ticket_id)
+        self._by_responsible[responsible].pop(ticket_id)
+        self._by_state_responsible[(state, responsible)].pop(ticket_id)
+        self._by_state_age[state].remove(timestamp, ticket_id)
+        return timestamp
+
+    @staticmethod
+    def _cutoff(days) -> int:
+        """
+        Get the latest creation timestamp of a ticket that is at least the given age.
+
+        :param days: The minimum age of the ticket in days.
+        :return: The cutoff timestamp.
+        """
+        return to_timestamp(datetime.datetime.now()) - days * 24 * 60 * 60
+
+    def _created_before(self, aging_index, days) -> list[Ticket]:
+        """
+        Get the tickets of an aging index that are at least the given age.
+
+        :param aging_index: The aging index to look into, or None if it is empty.
+        :param days: The minimum age of the tickets in days.
+        :return: A list of tickets, oldest first.
+        """
+        if aging_index is None:
+            return []
+        return [
+            self._tickets[ticket_id]
+            for ticket_id in aging_index.created_before(self._cutoff(days))
+        ]
+
+    def _page(self, ticket_ids, limit) -> tuple[list[Ticket], Optional[tuple]]:
+        """
+        Build a page from the IDs of its tickets, oldest first.
+
+        :param ticket_ids: The IDs of the tickets of the page, followed by the ID of
+            the first ticket of the next page if there is one.
+        :param limit: The maximum number of tickets in the page.
+        :return: A tuple of the tickets of the page and the cursor of the next page,
+            or None if this page is the last one.
+        """
+        tickets = [self._tickets[ticket_id] for ticket_id in ticket_ids[:limit]]
+        if len(ticket_ids) <= limit:
+            return tickets, None
+        last = ticket_ids[limit - 1]
+        return tickets, (self._filed[last][2], last)
+
+    def _tar_3_bucket(self, bucket) -> tuple[Optional[AgingIndex], int]:
+        """
+        Get the aging index and the cutoff timestamp of a list of the TAR-3 report.
+
+        :param bucket: The list of the report: "new", "assigned" or "all".
+        :return: A tuple of the aging index, or None if it is empty, and the cutoff.
+        """
+        if bucket == "new":
+            return self._by_state_age.get(State.NEW), self._cutoff(3)
+        if bucket == "assigned":
+            return self._by_state_age.get(State.ASSIGNED), self._cutoff(10)
+        if bucket == "all":
+            return self._by_age, self._cutoff(20)
+        raise KeyError(bucket)
+
+    @staticmethod
+    def searchable_fields(ticket) -> tuple[str, ...]:
+        """
+        Get the fields of a ticket that are matched by search_tickets.
+
+        :param ticket: The ticket to get the fields of.
+        :return: A tuple of the searchable fields of the ticket.
+        """
+        return (
+            ticket.id,
+            ticket.name,
+            ticket.type.value,
+            ticket.details,
+            ticket.state.value,
+            ticket.responsible.value,
+        )
 
     def search_tickets(self, keyword):
         """
@@ -27,18 +316,47 @@ class Backlog(AbstractData, ABC):
         :param keyword: The keyword to search for.
         :return: A list of tickets that match the keyword.
         """
-        tickets = []
-        for ticket in self.tickets:
-            if (
+        self._ensure_indexes()
+
+        def matches(ticket_id):
+            ticket = self._tickets[ticket_id]
+            return (
                 keyword in ticket.id
                 or keyword in ticket.name
                 or keyword in ticket.type.value
                 or keyword in ticket.details
                 or keyword in ticket.state.value
                 or keyword in ticket.responsible.value
-            ):
-                tickets.append(ticket)
-        return tickets
+            )
+
+        return [
+            self._tickets[ticket_id]
+            for ticket_id in self._search_index.search(keyword, matches)
+        ]
+
+    def search_tickets_page(
+        self, keyword, cursor=None, limit=PAGE_SIZE
+    ) -> tuple[list[Ticket], Optional[tuple]]:
+        """
+        Get one page of the tickets that match the given keyword, oldest first.
+
+        The cursor holds the timestamp and ID of the last ticket of the previous page.
+
+        :param keyword: The keyword to search for.
+        :param cursor: The cursor returned with the previous page, or None for the first page.
+        :param limit: The maximum number of tickets in the page.
+        :return: A tuple of the tickets of the page and the cursor of the next page,
+            or None if this page is the last one.
+        """
+        keys = [
+            (self._filed[ticket.id][2], ticket.id)
+            for ticket in self.search_tickets(keyword)
+        ]
+        if cursor is not None:
+            keys = [key for key in keys if key > tuple(cursor)]
+        # One extra key tells whether another page follows.
+        keys = heapq.nsmallest(limit + 1, keys)
+        return self._page([ticket_id for _, ticket_id in keys], limit)
 
     def get_ticket(self, ticket_id) -> Optional[Ticket]:
         """
@@ -47,10 +365,9 @@ class Backlog(AbstractData, ABC):
         :param ticket_id: The ID of the ticket to get.
         :return: The ticket with the given ID, or None if no such ticket exists.
         """
-        for ticket in self.tickets:
-            if ticket.id == ticket_id:
-                return ticket
-        return None
+        if self._snapshot is not None:
+            return self._snapshot.get(ticket_id)
+        return self._tickets.get(ticket_id)
 
     def id_exists(self, ticket_id) -> bool:
         """
@@ -59,22 +376,44 @@ class Backlog(AbstractData, ABC):
         :param ticket_id: The ID of the ticket to check.
         :return: True if a ticket with the given ID exists, False otherwise.
         """
-        for ticket in self.tickets:
-            if ticket.id == ticket_id:
-                return True
-        return False
+        if self._snapshot is not None:
+            return self._snapshot.get(ticket_id) is not None
+        return ticket_id in self._tickets
 
-    def create_ticket(self, ticket) -> bool:
+    def create_ticket(self, ticket) -> Optional[Ticket]:
         """
         Create a new ticket.
 
-        :param ticket: The ticket to create.
-        :return: True if the ticket was created successfully, False otherwise.
+        :param ticket: The ticket to create, stored as is.
+        :return: The ticket, or None if its ID exists.
         """
         if self.id_exists(ticket.id):
-            return False
-        self.tickets.append(ticket)
-        return True
+            return None
+        self._ensure_indexes()
+        self._tickets[ticket.id] = ticket
+        self._index_ticket(ticket)
+        return ticket
+
+    def create_tickets(self, tickets) -> list[bool]:
+        """
+        Create several tickets, indexing them in one pass.
+
+        :param tickets: An iterable of the tickets to create.
+        :return: A list telling for each ticket if it was created, in order. A
+            ticket is not created if its ID exists or appears earlier in the batch.
+        """
+        self._ensure_indexes()
+        results = []
+        created = []
+        for ticket in tickets:
+            if ticket.id in self._tickets:
+                results.append(False)
+                continue
+            self._tickets[ticket.id] = ticket
+            created.append(ticket)
+            results.append(True)
+        self._index_tickets(created)
+        return results
 
     def update_ticket(self, ticket) -> bool:
         """
@@ -83,12 +422,18 @@ class Backlog(AbstractData, ABC):
         :param ticket: The ticket to update.
         :return: True if the ticket was updated successfully, False otherwise.
         """
-        for i in range(len(self.tickets)):
-            if self.tickets[i].id == ticket.id:
-                self.tickets[i].state = ticket.state
-                self.tickets[i].responsible = ticket.responsible
-                return True
-        return False
+        self._ensure_loaded()
+        stored = self._tickets.get(ticket.id)
+        if stored is None:
+            return False
+        self._ensure_indexes()
+        stored.state = ticket.state
+        stored.responsible = ticket.responsible
+        self._search_index.update(stored.id, self.searchable_fields(stored))
+        if self._filed[stored.id][:2] != (stored.state, stored.responsible):
+            timestamp = self._unfile_ticket(stored.id)
+            self._file_ticket(stored, timestamp)
+        return True
 
     def close_ticket(self, ticket) -> bool:
         """
@@ -97,41 +442,254 @@ class Backlog(AbstractData, ABC):
         :param ticket: The ticket to close.
         :return: True if the ticket was closed successfully, False otherwise.
         """
-        for i in range(len(self.tickets)):
-            if self.tickets[i].id == ticket.id:
-                self.tickets[i].state = ticket.state
-                self.deleted_tickets.append(self.tickets.pop(i))
-                return True
-        return False
+        self._ensure_loaded()
+        if ticket.id not in self._tickets:
+            return False
+        self._ensure_indexes()
+        stored = self._tickets.pop(ticket.id)
+        stored.state = ticket.state
+        self._search_index.remove(stored.id)
+        self._by_age.remove(self._unfile_ticket(stored.id), stored.id)
+        self._deleted_tickets.append(stored)
+        return True
+
+    def get_tickets(self, ticket_ids) -> list[Optional[Ticket]]:
+        """
+        Get several tickets by their IDs.
+
+        :param ticket_ids: An iterable of ticket IDs.
+        :return: A list holding, for each ID in order, its ticket or None.
+        """
+        return [self.get_ticket(ticket_id) for ticket_id in ticket_ids]
+
+    def update_tickets(self, tickets) -> list[bool]:
+        """
+        Update several tickets, refiling the changed ones in one pass.
+
+        :param tickets: An iterable of the tickets to update.
+        :return: A list telling for each ticket if it was updated, in order.
+        """
+        self._ensure_indexes()
+        results = []
+        changed: dict[str, Ticket] = {}
+        for ticket in tickets:
+            stored = self._tickets.get(ticket.id)
+            if stored is None:
+                results.append(False)
+                continue
+            stored.state = ticket.state
+            stored.responsible = ticket.responsible
+            self._search_index.update(stored.id, self.searchable_fields(stored))
+            if self._filed[stored.id][:2] != (stored.state, stored.responsible):
+                changed[stored.id] = stored
+            results.append(True)
+        timestamps = self._unfile_tickets(changed)
+        self._file_tickets(list(zip(changed.values(), timestamps)))
+        return results
+
+    def replace_tickets(self, tickets) -> list[bool]:
+        """
+        Replace open tickets with new versions of them, keeping their order and
+        reindexing them in one pass.
+
+        Unlike closing a ticket and creating it again, every field can change and
+        no closed ticket is recorded.
+
+        :param tickets: An iterable of the new versions of the tickets.
+        :return: A list telling for each ticket if it was replaced, in order.
+        """
+        self._ensure_indexes()
+        results = []
+        replaced: dict[str, Ticket] = {}
+        for ticket in tickets:
+            if ticket.id not in self._tickets:
+                results.append(False)
+                continue
+            self._tickets[ticket.id] = ticket
+            replaced[ticket.id] = ticket
+            results.append(True)
+        timestamps = self._unfile_tickets(replaced)
+        self._by_age.remove_many(zip(timestamps, replaced))
+        for ticket in replaced.values():
+            self._search_index.update(ticket.id, self.searchable_fields(ticket))
+        entries = [(ticket, ticket.get_timestamp()) for ticket in replaced.values()]
+        self._by_age.add_many((timestamp, ticket.id) for ticket, timestamp in entries)
+        self._file_tickets(entries)
+        return results
+
+    def close_tickets(
+        self, tickets, only_responsible: Optional[Responsible] = None
+    ) -> list[bool]:
+        """
+        Close several tickets, removing them from the indexes in one pass.
+
+        :param tickets: An iterable of the tickets to close.
+        :param only_responsible: If given, a ticket is only closed if it is
+            currently assigned to this responsible.
+        :return: A list telling for each ticket if it was closed, in order.
+        """
+        self._ensure_indexes()
+        results = []
+        closed = []
+        for ticket in tickets:
+            stored = self._tickets.get(ticket.id)
+            if stored is None or (
+                only_responsible is not None and stored.responsible != only_responsible
+            ):
+                results.append(False)
+                continue
+            del self._tickets[ticket.id]
+            stored.state = ticket.state
+            self._search_index.remove(stored.id)
+            self._deleted_tickets.append(stored)
+            closed.append(stored.id)
+            results.append(True)
+        timestamps = self._unfile_tickets(closed)
+        self._by_age.remove_many(zip(timestamps, closed))
+        return results
+
+    def set_ticket_state(
+        self,
+        ticket_id,
+        state: State,
+        responsible: Optional[Responsible] = None,
+        only_responsible: Optional[Responsible] = None,
+    ) -> Optional[Ticket]:
+        """
+        Change the state, and optionally the responsible, of an open ticket.
+        Setting the CLOSED state closes the ticket.
+
+        :param ticket_id: The ID of the ticket.
+        :param state: The new state of the ticket.
+        :param responsible: The new responsible of the ticket, or None to keep it.
+        :param only_responsible: If given, the ticket is only changed if it is
+            currently assigned to this responsible.
+        :return: The changed ticket, or None if no open ticket matched.
+        """
+        self._ensure_loaded()
+        stored = self._tickets.get(ticket_id)
+        if stored is None or (
+            only_responsible is not None and stored.responsible != only_responsible
+        ):
+            return None
+        stored.state = state
+        if responsible is not None:
+            stored.responsible = responsible
+        if state == State.CLOSED:
+            self.close_ticket(stored)
+        else:
+            self.update_ticket(stored)
+        return stored
+
+    def filter_tickets(
+        self,
+        state: Optional[State] = None,
+        responsible: Optional[Responsible] = None,
+        ticket_type: Optional[Type] = None,
+    ) -> list[Ticket]:
+        """
+        Get the open tickets matching all the given criteria.
+
+        Only the bucket matching the state and responsible criteria is visited,
+        in the order the tickets were filed in it.
+
+        :param state: The state to filter on, or None to accept any state.
+        :param responsible: The responsible to filter on, or None to accept any.
+        :param ticket_type: The type to filter on, or None to accept any type.
+        :return: A list of the matching tickets.
+        """
+        self._ensure_indexes()
+        if state is not None and responsible is not None:
+            bucket = self._by_state_responsible.get((state, responsible), {})
+        elif state is not None:
+            bucket = self._by_state.get(state, {})
+        elif responsible is not None:
+            bucket = self._by_responsible.get(responsible, {})
+        else:
+            bucket = self._tickets
+        if ticket_type is None:
+            return list(bucket.values())
+        return [ticket for ticket in bucket.values() if ticket.type == ticket_type]
 
     def get_old_new_ticket(self) -> list[Ticket]:
         """
         Get a list of new tickets that are at least 3 days old.
 
-        :return: A list of new tickets that are at least 3 days old.
+        :return: A list of new tickets that are at least 3 days old, oldest first.
         """
-        return [
-            ticket
-            for ticket in self.tickets
-            if ticket.state == State.NEW and ticket.get_age().days >= 3
-        ]
+        self._ensure_indexes()
+        return self._created_before(self._by_state_age.get(State.NEW), 3)
 
     def get_old_assigned_ticket(self) -> list[Ticket]:
         """
         Get a list of assigned tickets that are at least 10 days old.
 
-        :return: A list of assigned tickets that are at least 10 days old.
+        :return: A list of assigned tickets that are at least 10 days old, oldest first.
         """
-        return [
-            ticket
-            for ticket in self.tickets
-            if ticket.state == State.ASSIGNED and ticket.get_age().days >= 10
-        ]
+        self._ensure_indexes()
+        return self._created_before(self._by_state_age.get(State.ASSIGNED), 10)
 
     def get_old_ticket_list(self) -> list[Ticket]:
         """
         Get a list of all tickets that are at least 20 days old.
 
-        :return: A list of all tickets that are at least 20 days old.
+        :return: A list of all tickets that are at least 20 days old, oldest first.
+        """
+        self._ensure_indexes()
+        return self._created_before(self._by_age, 20)
+
+    def get_tar_3(self) -> dict[str, list[Ticket]]:
+        """
+        Get the three lists of old tickets of the TAR-3 report.
+
+        Each list is a slice of an aging index, so no ticket outside the result is visited.
+
+        :return: A dictionary with the "new", "assigned" and "all" lists, oldest first.
+        """
+        self._ensure_indexes()
+        return {
+            "new": self._created_before(self._by_state_age.get(State.NEW), 3),
+            "assigned": self._created_before(
+                self._by_state_age.get(State.ASSIGNED), 10
+            ),
+            "all": self._created_before(self._by_age, 20),
+        }
+
+    def count_tar_3(self) -> dict[str, int]:
+        """
+        Count the tickets of each list of the TAR-3 report.
+
+        Each count is a binary search in an aging index, so no ticket is visited.
+
+        :return: A dictionary with the number of "new", "assigned" and "all" tickets.
+        """
+        self._ensure_indexes()
+        counts = {}
+        for bucket in ("new", "assigned", "all"):
+            aging_index, cutoff = self._tar_3_bucket(bucket)
+            counts[bucket] = (
+                0 if aging_index is None else aging_index.count_created_before(cutoff)
+            )
+        return counts
+
+    def get_tar_3_page(
+        self, bucket, cursor=None, limit=PAGE_SIZE
+    ) -> tuple[list[Ticket], Optional[tuple]]:
+        """
+        Get one page of a list of the TAR-3 report, oldest first.
+
+        The cursor holds the timestamp and id of the last ticket of the previous page.
+
+        :param bucket: The list to get a page of: "new", "assigned" or "all".
+        :param cursor: The cursor returned with the previous page, or None for the first page.
+        :param limit: The maximum number of tickets in the page.
+        :return: A tuple of the tickets of the page and the cursor of the next page,
+            or None if this page is the last one.
         """
-        return [ticket for ticket in self.tickets if ticket.get_age().days >= 20]
+        self._ensure_indexes()
+        aging_index, cutoff = self._tar_3_bucket(bucket)
+        if aging_index is None:
+            return [], None
+        # One extra key tells whether another page follows.
+        ticket_ids = aging_index.page_created_before(cutoff, cursor, limit + 1)
+        return self._page(ticket_ids, limit)
@@ -0,0 +1,489 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from src.abstract_data import AbstractData
+from src.constants import PAGE_SIZE, State, Responsible, Type
+from src.ticket import Ticket
+
+# Returned by LRUCache.get for an absent or expired key.
+_MISSING = object()
+
+
+def _copy_result(result):
+    """
+    Copy the tickets of a cached result, so callers changing them do not change
+    the cache.
+
+    :param result: A Ticket, a list of tickets, a (tickets, cursor) page, or any
+        other value, such as None or a boolean, returned as is.
+    :return: The result with copies of its tickets.
+    """
+    if isinstance(result, Ticket):
+        return result.copy()
+    if isinstance(result, list):
+        return [_copy_result(ticket) for ticket in result]
+    if isinstance(result, tuple):
+        tickets, cursor = result
+        return _copy_result(tickets), cursor
+    return result
+
+
+class LRUCache:
+    """
+    A bounded mapping dropping its least recently used entry when full and its
+    entries older than a time to live.
+
+    It counts the hits, misses and evictions, expired entries being counted as
+    misses.
+    """
+
+    def __init__(self, max_size: int, ttl: float, clock: Callable[[], float]):
+        """
+        Initialize an empty cache.
+
+        :param max_size: The maximum number of entries.
+        :param ttl: The number of seconds an entry stays valid.
+        :param clock: A function returning the current time in seconds.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        """
+        Get the number of entries, including the expired ones not dropped yet.
+
+        :return: The number of entries.
+        """
+        return len(self._entries)
+
+    def get(self, key):
+        """
+        Get the value of a key.
+
+        :param key: The key to look up.
+        :return: The value, or _MISSING if the key is absent or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= self.clock():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return _MISSING
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key, value):
+        """
+        Set the value of a key, evicting the least recently used entry if full.
+
+        :param key: The key to set.
+        :param value: The value of the key.
+        """
+        self._entries[key] = (self.clock() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key):
+        """
+        Remove a key if present.
+
+        :param key: The key to remove.
+        """
+        self._entries.pop(key, None)
+
+    def clear(self):
+        """
+        Remove every entry.
+        """
+        self._entries.clear()
+
+
+class CachingData(AbstractData):
+    """
+    A data source wrapping another one with a read-through cache.
+
+    The results of get_ticket, get_tickets, id_exists and the searches are kept in
+    bounded LRU caches whose entries expire after a time to live, as copies the
+    callers cannot change. Every write goes to the
+    wrapped data source and then drops the cached lookups of the tickets it
+    wrote and every cached search, since a write can add a ticket to, or remove it
+    from, any search result. Other reads are not cached.
+    """
+
+    def __init__(
+        self,
+        data: AbstractData,
+        max_size: int = 1024,
+        ttl: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the cache in front of a data source.
+
+        :param data: The data source to wrap.
+        :param max_size: The maximum number of entries of each cache, tickets and
+            searches.
+        :param ttl: The number of seconds a cached result stays valid.
+        :param clock: A function returning the current time in seconds.
+        """
+        self.data = data
+        self._tickets = LRUCache(max_size, ttl, clock)
+        self._searches = LRUCache(max_size, ttl, clock)
+        self._lock = threading.Lock()
+        # Increased by every invalidation, so a result read before a write is not
+        # cached after it.
+        self._generation = 0
+
+    def stats(self) -> dict[str, int]:
+        """
+        Get the counters of the caches.
+
+        :return: A dictionary with the number of "hits", "misses" and "evictions",
+            and the number of cached "tickets" and "searches".
+        """
+        with self._lock:
+            return {
+                "hits": self._tickets.hits + self._searches.hits,
+                "misses": self._tickets.misses + self._searches.misses,
+                "evictions": self._tickets.evictions + self._searches.evictions,
+                "tickets": len(self._tickets),
+                "searches": len(self._searches),
+            }
+
+    def _cached(self, cache: LRUCache, key, read):
+        """
+        Get a result from a cache, reading and caching it on a miss.
+
+        The cache keeps its own copies of the tickets and returns new copies, so
+        the tickets returned can be changed by the caller.
+
+        :param cache: The cache of the result.
+        :param key: The key of the result.
+        :param read: A function reading the result from the wrapped data source.
+        :return: The result.
+        """
+        with self._lock:
+            value = cache.get(key)
+            generation = self._generation
+        if value is not _MISSING:
+            return _copy_result(value)
+        value = read()
+        with self._lock:
+            if generation == self._generation:
+                cache.put(key, _copy_result(value))
+        return value
+
+    def invalidate(self, ticket_ids=None):
+        """
+        Drop the cached lookups of some tickets and every cached search.
+
+        It can be given to a TicketListener to drop the results of the tickets
+        written by other processes.
+
+        :param ticket_ids: An iterable of the IDs of the tickets, or None to drop
+            every cached result.
+        """
+        with self._lock:
+            self._generation += 1
+            if ticket_ids is None:
+                self._tickets.clear()
+            else:
+                for ticket_id in ticket_ids:
+                    self._tickets.pop(("get_ticket", ticket_id))
+                    self._tickets.pop(("id_exists", ticket_id))
+            self._searches.clear()
+
+    def search_tickets(self, keyword) -> list[Ticket]:
+        """
+        Search for tickets using a keyword, from the cache if possible.
+
+        :param keyword: The keyword to search for.
+        :return: A list of Ticket objects that match the keyword.
+        """
+        return self._cached(
+            self._searches,
+            ("search_tickets", keyword),
+            lambda: list(self.data.search_tickets(keyword)),
+        )
+
+    def search_tickets_page(
+        self, keyword, cursor=None, limit=PAGE_SIZE
+    ) -> tuple[list[Ticket], Optional[tuple]]:
+        """
+        Get one page of the open tickets matching a keyword, from the cache if
+        possible.
+
+        :param keyword: The keyword to search for.
+        :param cursor: The cursor returned with the previous page, or None for the first page.
+        :param limit: The maximum number of tickets in the page.
+        :return: A tuple of the tickets of the page and the cursor of the next page,
+            or None if this page is the last one.
+        """
+        return self._cached(
+            self._searches,
+            ("search_tickets_page", keyword, cursor, limit),
+            lambda: self._read_page(keyword, cursor, limit),
+        )
+
+    def _read_page(
+        self, keyword, cursor, limit
+    ) -> tuple[list[Ticket], Optional[tuple]]:
+        """
+        Read one page of a search from the wrapped data source.
+
+        :param keyword: The keyword to search for.
+        :param cursor: The cursor of the page.
+        :param limit: The maximum number of tickets in the page.
+        :return: A tuple of the tickets of the page, as a list, and the next cursor.
+        """
+        tickets, next_cursor = self.data.search_tickets_page(keyword, cursor, limit)
+        return list(tickets), next_cursor
+
+    def get_ticket(self, ticket_id) -> Optional[Ticket]:
+        """
+        Get a ticket by its ID, from the cache if possible.
+
+        :param ticket_id: The ID of the ticket.
+        :return: The Ticket object with the given ID, or None if no such ticket exists.
+        """
+        return self._cached(
+            self._tickets,
+            ("get_ticket", ticket_id),
+            lambda: self.data.get_ticket(ticket_id),
+        )
+
+    def id_exists(self, ticket_id) -> bool:
+        """
+        Check if a ticket ID exists, from the cache if possible.
+
+        :param ticket_id: The ID of the ticket.
+        :return: True if the ticket ID exists, False otherwise.
+        """
+        return self._cached(
+            self._tickets,
+            ("id_exists", ticket_id),
+            lambda: self.data.id_exists(ticket_id),
+        )
+
+    def create_ticket(self, ticket) -> Optional[Ticket]:
+        """
+        Create a new ticket.
+
+        :param ticket: The Ticket object to create.
+        :return: The result of the wrapped data source.
+        """
+        try:
+            return self.data.create_ticket(ticket)
+        finally:
+            self.invalidate([ticket.id])
+
+    def update_ticket(self, ticket) -> bool:
+        """
+        Update an existing ticket.
+
+        :param ticket: The Ticket object with updated data.
+        :return: True if the ticket was updated, False otherwise.
+        """
+        try:
+            return self.data.update_ticket(ticket)
+        finally:
+            self.invalidate([ticket.id])
+
+    def close_ticket(self, ticket) -> bool:
+        """
+        Close an existing ticket.
+
+        :param ticket: The Ticket object to close.
+        :return: True if the ticket was closed, False otherwise.
+        """
+        try:
+            return self.data.close_ticket(ticket)
+        finally:
+            self.invalidate([ticket.id])
+
+    def get_tickets(self, ticket_ids) -> list[Optional[Ticket]]:
+        """
+        Get several open tickets by their IDs, from the cache if possible.
+
+        The tickets missing from the cache are read from the wrapped data source
+        in one call and cached.
+
+        :param ticket_ids: An iterable of ticket IDs.
+        :return: A list holding, for each ID in order, a copy of its Ticket or None.
+        """
+        ticket_ids = list(ticket_ids)
+        with self._lock:
+            cached = [self._tickets.get(("get_ticket", key)) for key in ticket_ids]
+            generation = self._generation
+        missing = [
+            ticket_id
+            for ticket_id, ticket in zip(ticket_ids, cached)
+            if ticket is _MISSING
+        ]
+        read = dict(zip(missing, self.data.get_tickets(missing))) if missing else {}
+        with self._lock:
+            if generation == self._generation:
+                for ticket_id, ticket in read.items():
+                    self._tickets.put(("get_ticket", ticket_id), _copy_result(ticket))
+        return [
+            read[ticket_id] if ticket is _MISSING else _copy_result(ticket)
+            for ticket_id, ticket in zip(ticket_ids, cached)
+        ]
+
+    def create_tickets(self, tickets) -> list[bool]:
+        """
+        Create several tickets.
+
+        :param tickets: An iterable of the Ticket objects to create.
+        :return: A list telling for each ticket if it was created, in order.
+        """
+        tickets = list(tickets)
+        try:
+            return self.data.create_tickets(tickets)
+        finally:
+            self.invalidate(ticket.id for ticket in tickets)
+
+    def update_tickets(self, tickets) -> list[bool]:
+        """
+        Update several open tickets.
+
+        :param tickets: An iterable of the Ticket objects with updated data.
+        :return: A list telling for each ticket if it was updated, in order.
+        """
+        tickets = list(tickets)
+        try:
+            return self.data.update_tickets(tickets)
+        finally:
+            self.invalidate(ticket.id for ticket in tickets)
+
+    def close_tickets(
+        self, tickets, only_responsible: Optional[Responsible] = None
+    ) -> list[bool]:
+        """
+        Close several open tickets.
+
+        :param tickets: An iterable of the Ticket objects to close.
+        :param only_responsible: If given, a ticket is only closed if it is
+            currently assigned to this responsible.
+        :return: A list telling for each ticket if it was closed, in order.
+        """
+        tickets = list(tickets)
+        try:
+            return self.data.close_tickets(tickets, only_responsible)
+        finally:
+            self.invalidate(ticket.id for ticket in tickets)
+
+    def set_ticket_state(
+        self,
+        ticket_id,
+        state: State,
+        responsible: Optional[Responsible] = None,
+        only_responsible: Optional[Responsible] = None,
+    ) -> Optional[Ticket]:
+        """
+        Change the state, and optionally the responsible, of an open ticket.
+
+        :param ticket_id: The ID of the ticket.
+        :param state: The new state of the ticket.
+        :param responsible: The new responsible of the ticket, or None to keep it.
+        :param only_responsible: If given, the ticket is only changed if it is
+            currently assigned to this responsible.
+        :return: The changed Ticket object, or None if no open ticket matched.
+        """
+        try:
+            return self.data.set_ticket_state(
+                ticket_id, state, responsible, only_responsible
+            )
+        finally:
+            self.invalidate([ticket_id])
+
+    def filter_tickets(
+        self,
+        state: Optional[State] = None,
+        responsible: Optional[Responsible] = None,
+        ticket_type: Optional[Type] = None,
+    ) -> list[Ticket]:
+        """
+        Get the open tickets matching all the given criteria from the wrapped data
+        source.
+
+        :param state: The state to filter on, or None to accept any state.
+        :param responsible: The responsible to filter on, or None to accept any.
+        :param ticket_type: The type to filter on, or None to accept any type.
+        :return: A list of Ticket objects.
+        """
+        return self.data.filter_tickets(state, responsible, ticket_type)
+
+    def get_old_new_ticket(self) -> list[Ticket]:
+        """
+        Get a list of NEW stated tickets older than 3 days from the wrapped data
+        source.
+
+        :return: A list of Ticket objects.
+        """
+        return self.data.get_old_new_ticket()
+
+    def get_old_assigned_ticket(self) -> list[Ticket]:
+        """
+        Get a list of ASSIGNED stated tickets older than 10 days from the wrapped
+        data source.
+
+        :return: A list of Ticket objects.
+        """
+        return self.data.get_old_assigned_ticket()
+
+    def get_old_ticket_list(self) -> list[Ticket]:
+        """
+        Get a list of tickets older than 20 days from the wrapped data source.
+
+        :return: A list of Ticket objects.
+        """
+        return self.data.get_old_ticket_list()
+
+    def get_tar_3(self) -> dict[str, list[Ticket]]:
+        """
+        Get the three lists of old tickets of the TAR-3 report from the wrapped
+        data source.
+
+        :return: A dictionary with the "new", "assigned" and "all" lists.
+        """
+        return self.data.get_tar_3()
+
+    def count_tar_3(self) -> dict[str, int]:
+        """
+        Count the tickets of each list of the TAR-3 report with the wrapped data
+        source.
+
+        :return: A dictionary with the number of "new", "assigned" and "all" tickets.
+        """
+        return self.data.count_tar_3()
+
+    def get_tar_3_page(
+        self, bucket, cursor=None, limit=PAGE_SIZE
+    ) -> tuple[list[Ticket], Optional[tuple]]:
+        """
+        Get one page of a list of the TAR-3 report from the wrapped data source.
+
+        :param bucket: The list to get a page of: "new", "assigned" or "all".
+        :param cursor: The cursor returned with the previous page, or None for the first page.
+        :param limit: The maximum number of tickets in the page.
+        :return: A tuple of the tickets of the page and the cursor of the next page,
+            or None if this page is the last one.
+        """
+        return self.data.get_tar_3_page(bucket, cursor, limit)
+
+    def flush(self):
+        """
+        Write the writes kept back by the wrapped data source, if any.
+        """
+        self.data.flush()
@@ -0,0 +1,558 @@
+import datetime
+import heapq
+from array import array
+from itertools import compress, repeat
+from typing import Optional
+
+from src.abstract_data import AbstractData
+from src.constants import PAGE_SIZE, State, Responsible, Type
+from src.ticket import Ticket, to_timestamp
+
+STATES = list(State)
+RESPONSIBLES = list(Responsible)
+TYPES = list(Type)
+STATE_CODES = {state: code for code, state in enumerate(STATES)}
+RESPONSIBLE_CODES = {responsible: code for code, responsible in enumerate(RESPONSIBLES)}
+TYPE_CODES = {ticket_type: code for code, ticket_type in enumerate(TYPES)}
+
+
+def code_table(codes) -> bytes:
+    """
+    Build a translation table mapping the given codes to 1 and every other byte to 0.
+
+    :param codes: The codes to select.
+    :return: A 256 bytes translation table.
+    """
+    return bytes(1 if code in codes else 0 for code in range(256))
+
+
+OPEN_TABLE = code_table(
+    {code for state, code in STATE_CODES.items() if state != State.CLOSED}
+)
+
+
+def mask_and(mask, other) -> bytes:
+    """
+    Combine two masks of the same length with a logical AND.
+
+    :param mask: A mask of 0 and 1 bytes.
+    :param other: Another mask of 0 and 1 bytes.
+    :return: The combined mask.
+    """
+    result = int.from_bytes(mask, "little") & int.from_bytes(other, "little")
+    return result.to_bytes(len(mask), "little")
+
+
+def mask_or(mask, other) -> bytes:
+    """
+    Combine two masks of the same length with a logical OR.
+
+    :param mask: A mask of 0 and 1 bytes.
+    :param other: Another mask of 0 and 1 bytes.
+    :return: The combined mask.
+    """
+    result = int.from_bytes(mask, "little") | int.from_bytes(other, "little")
+    return result.to_bytes(len(mask), "little")
+
+
+class ColumnStore(AbstractData):
+    """
+    This class represents a backlog of tickets stocked column-wise in the RAM.
+
+    Each ticket is a row: state, type and responsible are stored as one byte codes,
+    the creation date as a 64 bits timestamp and the text fields in separate lists.
+    Filters are computed as whole-column masks, using bytes translation and integer
+    bitwise operations, instead of visiting ticket objects one by one.
+    Closed tickets stay in the columns with the closed state code.
+    """
+
+    def __init__(self):
+        """
+        Initialize a new instance of the ColumnStore class.
+        """
+        self._reset()
+
+    def _reset(self):
+        """
+        Remove every row from the columns.
+        """
+        self.ids: list[str] = []
+        self.names: list[str] = []
+        self.details: list[str] = []
+        self.types = bytearray()
+        self.states = bytearray()
+        self.responsibles = bytearray()
+        self.timestamps = array("q")
+        self._rows: dict[str, int] = {}
+        self._closed_rows: list[int] = []
+        self._pending: Optional[list[Ticket]] = None
+
+    @property
+    def tickets(self) -> list[Ticket]:
+        """
+        Get the open tickets in insertion order.
+
+        :return: A list of the open tickets.
+        """
+        self._ensure_loaded()
+        return self._tickets(sorted(self._rows.values()))
+
+    @tickets.setter
+    def tickets(self, tickets):
+        """
+        Replace the open tickets. The new tickets are stored into the columns on next use.
+
+        :param tickets: An iterable of tickets.
+        """
+        deleted_tickets = self.deleted_tickets
+        self._reset()
+        for ticket in deleted_tickets:
+            self._closed_rows.append(self._append(ticket))
+        self._pending = list(tickets)
+
+    @property
+    def deleted_tickets(self) -> list[Ticket]:
+        """
+        Get the closed tickets in the order they were closed.
+
+        :return: A list of the closed tickets.
+        """
+        return self._tickets(self._closed_rows)
+
+    def _ensure_loaded(self):
+        """
+        Store the tickets given to the tickets setter into the columns.
+        """
+        if self._pending is None:
+            return
+        pending, self._pending = self._pending, None
+        for ticket in pending:
+            self._rows[ticket.id] = self._append(ticket)
+
+    def _append(self, ticket) -> int:
+        """
+        Append a ticket as a new row.
+
+        :param ticket: The ticket to append.
+        :return: The index of the new row.
+        """
+        self.ids.append(ticket.id)
+        self.names.append(ticket.name)
+        self.details.append(ticket.details)
+        self.types.append(TYPE_CODES[ticket.type])
+        self.states.append(STATE_CODES[ticket.state])
+        self.responsibles.append(RESPONSIBLE_CODES[ticket.responsible])
+        self.timestamps.append(ticket.get_timestamp())
+        return len(self.ids) - 1
+
+    def _ticket(self, row) -> Ticket:
+        """
+        Build the ticket stored in a row.
+
+        :param row: The index of the row.
+        :return: A new Ticket object.
+        """
+        return Ticket(
+            self.ids[row],
+            self.names[row],
+            self.details[row],
+            TYPES[self.types[row]],
+            STATES[self.states[row]],
+            RESPONSIBLES[self.responsibles[row]],
+            self.timestamps[row],
+        )
+
+    def _tickets(self, rows) -> list[Ticket]:
+        """
+        Build the tickets stored in the given rows.
+
+        :param rows: The indexes of the rows.
+        :return: A list of new Ticket objects.
+        """
+        return [self._ticket(row) for row in rows]
+
+    @staticmethod
+    def _rows_of(mask) -> list[int]:
+        """
+        Get the indexes of the rows selected by a mask.
+
+        :param mask: A mask of 0 and 1 bytes.
+        :return: A list of row indexes.
+        """
+        return list(compress(range(len(mask)), mask))
+
+    def _open_mask(self) -> bytes:
+        """
+        Get the mask selecting the rows of open tickets.
+
+        :return: A mask of 0 and 1 bytes.
+        """
+        return self.states.translate(OPEN_TABLE)
+
+    def _older_mask(self, days) -> bytes:
+        """
+        Get the mask selecting the rows of tickets that are at least the given age.
+
+        :param days: The minimum age of the tickets in days.
+        :return: A mask of 0 and 1 bytes.
+        """
+        cutoff = to_timestamp(datetime.datetime.now()) - days * 24 * 60 * 60
+        return bytes(map(cutoff.__ge__, self.timestamps))
+
+    def _oldest_first(self, mask) -> list[Ticket]:
+        """
+        Build the tickets selected by a mask, ordered by creation date then ID.
+
+        :param mask: A mask of 0 and 1 bytes.
+        :return: A list of new Ticket objects.
+        """
+        rows = self._rows_of(mask)
+        rows.sort(key=lambda row: (self.timestamps[row], self.ids[row]))
+        return self._tickets(rows)
+
+    def _page(self, mask, cursor, limit) -> tuple[list[Ticket], Optional[tuple]]:
+        """
+        Get one page of the rows selected by a mask, ordered by creation date then ID.
+
+        Only the tickets of the page are built. The cursor holds the timestamp and
+        ID of the last ticket of the previous page.
+
+        :param mask: A mask of 0 and 1 bytes.
+        :param cursor: The cursor returned with the previous page, or None for the first page.
+        :param limit: The maximum number of tickets in the page.
+        :return: A tuple of the tickets of the page and the cursor of the next page,
+            or None if this page is the last one.
+        """
+        keys = [
+            (self.timestamps[row], self.ids[row], row) for row in self._rows_of(mask)
+        ]
+        if cursor is not None:
+            keys = [key for key in keys if key[:2] > tuple(cursor)]
+        # One extra key tells whether another page follows.
+        keys = heapq.nsmallest(limit + 1, keys)
+        tickets = self._tickets([row for _, _, row in keys[:limit]])
+        if len(keys) <= limit:
+            return tickets, None
+        return tickets, keys[limit - 1][:2]
+
+    def _search_mask(self, keyword) -> bytes:
+        """
+        Get the mask selecting the rows of open tickets that match a keyword.
+
+        :param keyword: The keyword to search for.
+        :return: A mask of 0 and 1 bytes.
+        """
+        mask = bytes(len(self.ids))
+        for column in (self.ids, self.names, self.details):
+            mask = mask_or(mask, bytes(map(str.__contains__, column, repeat(keyword))))
+        for column, members in (
+            (self.types, TYPES),
+            (self.states, STATES),
+            (self.responsibles, RESPONSIBLES),
+        ):
+            codes = {
+                code for code, member in enumerate(members) if keyword in member.value
+            }
+            if codes:
+                mask = mask_or(mask, column.translate(code_table(codes)))
+        return mask_and(mask, self._open_mask())
+
+    def search_tickets(self, keyword):
+        """
+        Search for tickets that match the given keyword.
+
+        :param keyword: The keyword to search for.
+        :return: A list of tickets that match the keyword.
+        """
+        self._ensure_loaded()
+        return self._tickets(self._rows_of(self._search_mask(keyword)))
+
+    def search_tickets_page(
+        self, keyword, cursor=None, limit=PAGE_SIZE
+    ) -> tuple[list[Ticket], Optional[tuple]]:
+        """
+        Get one page of the tickets that match the given keyword, oldest first.
+
+        :param keyword: The keyword to search for.
+        :param cursor: The cursor returned with the previous page, or None for the first page.
+        :param limit: The maximum number of tickets in the page.
+        :return: A tuple of the tickets of the page and the cursor of the next page,
+            or None if this page is the last one.
+        """
+        self._ensure_loaded()
+        return self._page(self._search_mask(keyword), cursor, limit)
+
+    def get_ticket(self, ticket_id) -> Optional[Ticket]:
+        """
+        Get a ticket by its ID.
+
+        :param ticket_id: The ID of the ticket to get.
+        :return: A copy of the ticket with the given ID, or None if no such ticket exists.
+        """
+        self._ensure_loaded()
+        row = self._rows.get(ticket_id)
+        if row is None:
+            return None
+        return self._ticket(row)
+
+    def id_exists(self, ticket_id) -> bool:
+        """
+        Check if a ticket with the given ID exists.
+
+        :param ticket_id: The ID of the ticket to check.
+        :return: True if a ticket with the given ID exists, False otherwise.
+        """
+        self._ensure_loaded()
+        return ticket_id in self._rows
+
+    def create_ticket(self, ticket) -> Optional[Ticket]:
+        """
+        Create a new ticket.
+
+        :param ticket: The ticket to create.
+        :return: A copy of the ticket as stored, or None if its ID exists.
+        """
+        if self.id_exists(ticket.id):
+            return None
+        row = self._append(ticket)
+        self._rows[ticket.id] = row
+        return self._ticket(row)
+
+    def create_tickets(self, tickets) -> list[bool]:
+        """
+        Create several tickets, appending a row for each new one.
+
+        :param tickets: An iterable of the tickets to create.
+        :return: A list telling for each ticket if it was created, in order. A
+            ticket is not created if its ID exists or appears earlier in the batch.
+        """
+        self._ensure_loaded()
+        results = []
+        for ticket in tickets:
+            created = ticket.id not in self._rows
+            if created:
+                self._rows[ticket.id] = self._append(ticket)
+            results.append(created)
+        return results
+
+    def update_ticket(self, ticket) -> bool:
+        """
+        Update the state and responsible of a ticket.
+
+        :param ticket: The ticket to update.
+        :return: True if the ticket was updated successfully, False otherwise.
+        """
+        self._ensure_loaded()
+        row = self._rows.get(ticket.id)
+        if row is None:
+            return False
+        self.states[row] = STATE_CODES[ticket.state]
+        self.responsibles[row] = RESPONSIBLE_CODES[ticket.responsible]
+        return True
+
+    def close_ticket(self, ticket) -> bool:
+        """
+        Close a ticket.
+
+        :param ticket: The ticket to close.
+        :return: True if the ticket was closed successfully, False otherwise.
+        """
+        self._ensure_loaded()
+        row = self._rows.pop(ticket.id, None)
+        if row is None:
+            return False
+        self.states[row] = STATE_CODES[State.CLOSED]
+        self._closed_rows.append(row)
+        return True
+
+    def get_tickets(self, ticket_ids) -> list[Optional[Ticket]]:
+        """
+        Get several tickets by their IDs.
+
+        :param ticket_ids: An iterable of ticket IDs.
+        :return: A list holding, for each ID in order, a copy of its ticket or None.
+        """
+        self._ensure_loaded()
+        return [self.get_ticket(ticket_id) for ticket_id in ticket_ids]
+
+    def update_tickets(self, tickets) -> list[bool]:
+        """
+        Update the state and responsible of several tickets.
+
+        :param tickets: An iterable of the tickets to update.
+        :return: A list telling for each ticket if it was updated, in order.
+        """
+        self._ensure_loaded()
+        return [self.update_ticket(ticket) for ticket in tickets]
+
+    def close_tickets(
+        self, tickets, only_responsible: Optional[Responsible] = None
+    ) -> list[bool]:
+        """
+        Close several tickets.
+
+        :param tickets: An iterable of the tickets to close.
+        :param only_responsible: If given, a ticket is only closed if it is
+            currently assigned to this responsible.
+        :return: A list telling for each ticket if it was closed, in order.
+        """
+        self._ensure_loaded()
+        results = []
+        for ticket in tickets:
+            row = self._rows.get(ticket.id)
+            if (
+                row is not None
+                and only_responsible is not None
+                and self.responsibles[row] != RESPONSIBLE_CODES[only_responsible]
+            ):
+                results.append(False)
+            else:
+                results.append(self.close_ticket(ticket))
+        return results
+
+    def set_ticket_state(
+        self,
+        ticket_id,
+        state: State,
+        responsible: Optional[Responsible] = None,
+        only_responsible: Optional[Responsible] = None,
+    ) -> Optional[Ticket]:
+        """
+        Change the state, and optionally the responsible, of an open ticket.
+        Setting the CLOSED state closes the ticket.
+
+        :param ticket_id: The ID of the ticket.
+        :param state: The new state of the ticket.
+        :param responsible: The new responsible of the ticket, or None to keep it.
+        :param only_responsible: If given, the ticket is only changed if it is
+            currently assigned to this responsible.
+        :return: A copy of the changed ticket, or None if no open ticket matched.
+        """
+        self._ensure_loaded()
+        row = self._rows.get(ticket_id)
+        if row is None or (
+            only_responsible is not None
+            and self.responsibles[row] != RESPONSIBLE_CODES[only_responsible]
+        ):
+            return None
+        if responsible is not None:
+            self.responsibles[row] = RESPONSIBLE_CODES[responsible]
+        self.states[row] = STATE_CODES[state]
+        if state == State.CLOSED:
+            del self._rows[ticket_id]
+            self._closed_rows.append(row)
+        return self._ticket(row)
+
+    def filter_tickets(
+        self,
+        state: Optional[State] = None,
+        responsible: Optional[Responsible] = None,
+        ticket_type: Optional[Type] = None,
+    ) -> list[Ticket]:
+        """
+        Get the open tickets matching all the given criteria.
+
+        :param state: The state to filter on, or None to accept any state.
+        :param responsible: The responsible to filter on, or None to accept any.
+        :param ticket_type: The type to filter on, or None to accept any type.
+        :return: A list of the matching tickets, in insertion order.
+        """
+        self._ensure_loaded()
+        mask = self._open_mask()
+        if state is not None:
+            table = code_table({STATE_CODES[state]})
+            mask = mask_and(mask, self.states.translate(table))
+        if responsible is not None:
+            table = code_table({RESPONSIBLE_CODES[responsible]})
+            mask = mask_and(mask, self.responsibles.translate(table))
+        if ticket_type is not None:
+            table = code_table({TYPE_CODES[ticket_type]})
+            mask = mask_and(mask, self.types.translate(table))
+        return self._tickets(self._rows_of(mask))
+
+    def get_old_new_ticket(self) -> list[Ticket]:
+        """
+        Get a list of new tickets that are at least 3 days old.
+
+        :return: A list of new tickets that are at least 3 days old, oldest first.
+        """
+        self._ensure_loaded()
+        mask = self.states.translate(code_table({STATE_CODES[State.NEW]}))
+        return self._oldest_first(mask_and(mask, self._older_mask(3)))
+
+    def get_old_assigned_ticket(self) -> list[Ticket]:
+        """
+        Get a list of assigned tickets that are at least 10 days old.
+
+        :return: A list of assigned tickets that are at least 10 days old, oldest first.
+        """
+        self._ensure_loaded()
+        mask = self.states.translate(code_table({STATE_CODES[State.ASSIGNED]}))
+        return self._oldest_first(mask_and(mask, self._older_mask(10)))
+
+    def get_old_ticket_list(self) -> list[Ticket]:
+        """
+        Get a list of all tickets that are at least 20 days old.
+
+        :return: A list of all open tickets that are at least 20 days old, oldest first.
+        """
+        self._ensure_loaded()
+        return self._oldest_first(mask_and(self._open_mask(), self._older_mask(20)))
+
+    def _tar_3_mask(self, bucket) -> bytes:
+        """
+        Get the mask selecting the rows of a list of the TAR-3 report.
+
+        :param bucket: The list of the report: "new", "assigned" or "all".
+        :return: A mask of 0 and 1 bytes.
+        """
+        if bucket == "new":
+            new_mask = self.states.translate(code_table({STATE_CODES[State.NEW]}))
+            return mask_and(new_mask, self._older_mask(3))
+        if bucket == "assigned":
+            assigned_mask = self.states.translate(
+                code_table({STATE_CODES[State.ASSIGNED]})
+            )
+            return mask_and(assigned_mask, self._older_mask(10))
+        if bucket == "all":
+            return mask_and(self._open_mask(), self._older_mask(20))
+        raise KeyError(bucket)
+
+    def get_tar_3(self) -> dict[str, list[Ticket]]:
+        """
+        Get the three lists of old tickets of the TAR-3 report.
+
+        :return: A dictionary with the "new", "assigned" and "all" lists, oldest first.
+        """
+        self._ensure_loaded()
+        return {
+            bucket: self._oldest_first(self._tar_3_mask(bucket))
+            for bucket in ("new", "assigned", "all")
+        }
+
+    def count_tar_3(self) -> dict[str, int]:
+        """
+        Count the tickets of each list of the TAR-3 report without building them.
+
+        :return: A dictionary with the number of "new", "assigned" and "all" tickets.
+        """
+        self._ensure_loaded()
+        return {
+            bucket: self._tar_3_mask(bucket).count(1)
+            for bucket in ("new", "assigned", "all")
+        }
+
+    def get_tar_3_page(
+        self, bucket, cursor=None, limit=PAGE_SIZE
+    ) -> tuple[list[Ticket], Optional[tuple]]:
+        """
+        Get one page of a list of the TAR-3 report, oldest first.
+
+        :param bucket: The list to get a page of: "new", "assigned" or "all".
+        :param cursor: The cursor returned with the previous page, or None for the first page.
+        :param limit: The maximum number of tickets in the page.
+        :return: A tuple of the tickets of the page and the cursor of the next page,
+            or None if this page is the last one.
+        """
+        self._ensure_loaded()
+        return self._page(self._tar_3_mask(bucket), cursor, limit)
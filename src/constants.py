@@ -5,10 +5,18 @@ It includes the following classes:
 - State: An enumeration representing the possible states of a ticket.
 - Responsible: An enumeration representing the possible responsible levels for a ticket.
 - Type: An enumeration representing the possible types of a ticket.
+
+It also defines PAGE_SIZE, the default number of tickets fetched per page, and
+the ID_PATTERN and NAME_PATTERN regular expressions that new tickets must match.
 """
 
 from enum import Enum
 
+PAGE_SIZE = 50
+
+ID_PATTERN = r"^Case-\d\d\d$"
+NAME_PATTERN = r"^\w+$"
+
 
 class State(Enum):
     """
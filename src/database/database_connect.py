@@ -1,12 +1,61 @@
+import itertools
+import re
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+
 import psycopg2
+import psycopg2.errors
+import psycopg2.extras
+import psycopg2.pool
 import os
 
 
+def numbered_placeholders(query) -> str:
+    """
+    Replace the %s placeholders of a query by the $1, $2... placeholders of
+    server-side statements.
+
+    :param query: An SQL query with %s placeholders.
+    :return: The query with numbered placeholders.
+    """
+    numbers = itertools.count(1)
+    return re.sub("%s", lambda _: f"${next(numbers)}", query)
+
+
 class DatabaseConnect:
     """
     A class used to represent a database connection.
+
+    By default every query shares a single connection. When the
+    DATABASE_POOL_MAX environment variable is set, connections are taken from a
+    thread-safe pool instead: each call checks a connection out and gives it
+    back, so several threads can run queries at the same time. DATABASE_POOL_MIN
+    sets how many idle connections the pool keeps open. A connection left idle
+    for DATABASE_POOL_PING_IDLE_MS milliseconds (30000 by default) is checked
+    with a query before being reused, so a connection dropped by the server is
+    replaced instead of failing the next query.
+
+    Large results can be streamed with server-side cursors, which fetch
+    DATABASE_ITERSIZE rows per round trip (2000 by default). Each stream uses a
+    connection of its own, outside the pool, and at most DATABASE_STREAM_MAX
+    streams (4 by default) are open at the same time.
+
+    Writes run in autocommit mode, each in its own transaction, unless they are
+    made in a transaction block. When DATABASE_GROUP_COMMIT_SIZE is set, writes
+    are grouped instead: they share an open transaction, which is committed once
+    it holds that many writes or DATABASE_GROUP_COMMIT_DELAY_MS milliseconds
+    (5 by default) after its first write. A write reported as done may then be
+    lost if the connection fails before the commit. DATABASE_SYNCHRONOUS_COMMIT
+    sets the synchronous_commit setting of the connections.
+
+    Queries registered with prepare are run by name as server-side prepared
+    statements, parsed and planned once per connection.
     """
 
+    stream_names = itertools.count(1)
+
     def __init__(self):
         """
         Constructs all the necessary attributes for the DatabaseConnect object.
@@ -14,6 +63,44 @@ class DatabaseConnect:
         :param self: An instance of the DatabaseConnect class.
         """
         self.connection = None
+        self.pool = None
+        self.pool_slots = None
+        self.stream_slots = None
+        self.ping_idle = 30.0
+        self._connected_at = time.monotonic()
+        self._last_used = weakref.WeakKeyDictionary()
+        self.itersize = 2000
+        self.group_size = 0
+        self.group_delay = 0.005
+        self._local = threading.local()
+        self._group_lock = threading.RLock()
+        self._group_connection = None
+        self._group_pending = 0
+        self._group_timer = None
+        # The threads that wrote in the open group of writes.
+        self._group_writers = set()
+        self.statements = {}
+        self._prepared = weakref.WeakKeyDictionary()
+        self._prepared_lock = threading.Lock()
+
+    @staticmethod
+    def connection_parameters():
+        """
+        Get the connection parameters from the environment variables.
+
+        :return: A dictionary of keyword arguments for psycopg2.connect.
+        """
+        parameters = {
+            "dbname": os.getenv("DATABASE_NAME"),
+            "user": os.getenv("DATABASE_USER"),
+            "password": os.getenv("DATABASE_PASSWORD"),
+            "host": os.getenv("DATABASE_HOST"),
+            "port": os.getenv("DATABASE_PORT"),
+        }
+        synchronous_commit = os.getenv("DATABASE_SYNCHRONOUS_COMMIT")
+        if synchronous_commit:
+            parameters["options"] = f"-c synchronous_commit={synchronous_commit}"
+        return parameters
 
     def connect(self):
         """
@@ -22,14 +109,28 @@ class DatabaseConnect:
         :param self: An instance of the DatabaseConnect class.
         """
         try:
-            self.connection = psycopg2.connect(
-                dbname=os.getenv("DATABASE_NAME"),
-                user=os.getenv("DATABASE_USER"),
-                password=os.getenv("DATABASE_PASSWORD"),
-                host=os.getenv("DATABASE_HOST"),
-                port=os.getenv("DATABASE_PORT"),
+            self.itersize = int(os.getenv("DATABASE_ITERSIZE", str(self.itersize)))
+            self.group_size = int(os.getenv("DATABASE_GROUP_COMMIT_SIZE", "0"))
+            self.group_delay = (
+                int(os.getenv("DATABASE_GROUP_COMMIT_DELAY_MS", "5")) / 1000
+            )
+            self.stream_slots = threading.BoundedSemaphore(
+                int(os.getenv("DATABASE_STREAM_MAX", "4"))
             )
-            self.connection.autocommit = True
+            pool_max = int(os.getenv("DATABASE_POOL_MAX", "0"))
+            if pool_max > 0:
+                pool_min = min(int(os.getenv("DATABASE_POOL_MIN", "1")), pool_max)
+                self.ping_idle = (
+                    int(os.getenv("DATABASE_POOL_PING_IDLE_MS", "30000")) / 1000
+                )
+                self._connected_at = time.monotonic()
+                self.pool = psycopg2.pool.ThreadedConnectionPool(
+                    pool_min, pool_max, **self.connection_parameters()
+                )
+                self.pool_slots = threading.BoundedSemaphore(pool_max)
+            else:
+                self.connection = psycopg2.connect(**self.connection_parameters())
+                self.connection.autocommit = True
         except Exception as e:
             print(f"Error: {e}")
 
@@ -39,48 +140,518 @@ class DatabaseConnect:
 
         :param self: An instance of the DatabaseConnect class.
         """
-        self.connection.close()
-        self.connection = None
+        self.flush()
+        if self.pool is not None:
+            self.pool.closeall()
+            self.pool = None
+            self.pool_slots = None
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def _checkout(self):
+        """
+        Take a healthy connection from the pool, waiting for one if all are in use.
+
+        Connections found closed, with a lost server session, or not answering
+        after being idle for ping_idle seconds are discarded and replaced by new
+        ones.
+
+        :return: An open connection in autocommit mode.
+        """
+        self.pool_slots.acquire()
+        try:
+            while True:
+                connection = self.pool.getconn()
+                if self._is_alive(connection):
+                    return connection
+                self.pool.putconn(connection, close=True)
+        except Exception:
+            self.pool_slots.release()
+            raise
+
+    def _is_alive(self, connection) -> bool:
+        """
+        Check a connection taken from the pool, putting it in autocommit mode.
+
+        The client-side state of the connection is checked every time, and the
+        server is queried when the connection was idle for ping_idle seconds,
+        since a connection dropped by the server looks open until it is used.
+
+        :param connection: The connection to check.
+        :return: True if the connection can be used, False otherwise.
+        """
+        if (
+            connection.closed
+            or connection.info.transaction_status
+            == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN
+        ):
+            return False
+        try:
+            if not connection.autocommit:
+                connection.autocommit = True
+            last_used = self._last_used.get(connection, self._connected_at)
+            if time.monotonic() - last_used >= self.ping_idle:
+                cursor = connection.cursor()
+                try:
+                    cursor.execute("SELECT 1")
+                finally:
+                    cursor.close()
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            return False
+        return True
+
+    def _checkin(self, connection, broken=False):
+        """
+        Give a connection back to the pool.
+
+        :param connection: The connection to give back.
+        :param broken: True to close the connection instead of reusing it.
+        """
+        try:
+            if not broken:
+                self._last_used[connection] = time.monotonic()
+            self.pool.putconn(connection, close=broken)
+        finally:
+            self.pool_slots.release()
+
+    @contextmanager
+    def cursor(self):
+        """
+        Get a cursor on a connection for the duration of a with block.
+
+        In pooled mode, the connection is checked out for the block and checked
+        back in afterwards. A connection that failed with a connection error is
+        closed instead of being reused.
+
+        Inside a transaction block, the cursor of the transaction is used.
+
+        :return: A context manager yielding a cursor.
+        """
+        transaction_cursor = getattr(self._local, "cursor", None)
+        if transaction_cursor is not None:
+            yield transaction_cursor
+            return
+        if self.pool is None:
+            cursor = self.connection.cursor()
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+            return
+        connection = self._checkout()
+        broken = False
+        try:
+            cursor = connection.cursor()
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            broken = True
+            raise
+        finally:
+            self._checkin(connection, broken)
+
+    def _read(self, query, data, fetch):
+        """
+        Run a read query and fetch its result.
+
+        In pooled mode, a read that fails because its connection died is retried
+        once on a fresh connection.
+
+        A read does not end the open group of writes, so that interactive use,
+        where most writes are followed by a read, still groups its commits. In
+        pooled mode, reads use other connections, which only see committed
+        writes, so the group is only committed first when the reading thread
+        wrote in it. In single mode, the read runs in the transaction of the
+        group after a savepoint, so a failing read is rolled back without the
+        writes of the group.
+
+        :param query: The SQL query to run.
+        :param data: The data to use in the query.
+        :param fetch: A function taking the cursor and returning the result.
+        :return: The result of the fetch function.
+        """
+        if self.pool is None and self.group_size > 0:
+            # The read shares the connection of the groups, so no group may
+            # start while it runs.
+            with self._group_lock:
+                if self._group_connection is not None:
+                    return self._group_read(query, data, fetch)
+                with self.cursor() as cursor:
+                    self._run(cursor, query, data)
+                    return fetch(cursor)
+        if threading.get_ident() in self._group_writers:
+            # The thread reads its own writes.
+            self.flush()
+        attempts = 1 if self.pool is None else 2
+        for attempt in range(attempts):
+            try:
+                with self.cursor() as cursor:
+                    self._run(cursor, query, data)
+                    return fetch(cursor)
+            except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                if attempt == attempts - 1:
+                    raise
+
+    def _group_read(self, query, data, fetch):
+        """
+        Run a read query in the open group of writes, after a savepoint.
+
+        Must be called with the group lock held.
+
+        :param query: The SQL query to run.
+        :param data: The data to use in the query.
+        :param fetch: A function taking the cursor and returning the result.
+        :return: The result of the fetch function.
+        """
+        cursor = self._group_connection.cursor()
+        try:
+            self._run(cursor, query, data, "SAVEPOINT group_read; ")
+            return fetch(cursor)
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            self._end_group(broken=True)
+            raise
+        except psycopg2.Error:
+            cursor.execute("ROLLBACK TO SAVEPOINT group_read")
+            raise
+        finally:
+            if not cursor.closed:
+                cursor.close()
+
+    def prepare(self, name, query):
+        """
+        Register a query to run as a prepared statement.
+
+        The statement is prepared on each connection the first time it runs
+        there, and prepared again on new connections.
+
+        :param name: The name of the statement, an SQL identifier passed instead
+            of the query to execute, execute_returning, fetch and fetchone.
+        :param query: The SQL query, with %s placeholders.
+        """
+        if not re.fullmatch(r"[a-z_][a-z0-9_]*", name):
+            raise ValueError(f"Invalid statement name: {name}")
+        self.statements[name] = numbered_placeholders(query.strip().rstrip(";"))
+
+    def _prepared_names(self, connection) -> set:
+        """
+        Get the names of the statements prepared on a connection.
+
+        :param connection: An open connection.
+        :return: The set of prepared names, to update as statements are prepared.
+        """
+        with self._prepared_lock:
+            return self._prepared.setdefault(connection, set())
+
+    def _run(self, cursor, query, data, prefix=""):
+        """
+        Execute a query or a registered statement on a cursor.
+
+        A statement is prepared in a round trip of its own before its first
+        execution on a connection, and recorded as prepared as soon as that
+        succeeds: a prepared statement outlives a failed execution and the
+        rollback of its transaction. A statement whose preparation was lost on
+        the server, such as after a DISCARD ALL, is prepared again, and retried
+        when not in a transaction.
+
+        :param cursor: The cursor to execute on.
+        :param query: The SQL query, or the name of a registered statement.
+        :param data: The data to use in the query.
+        :param prefix: SQL statements to run first in the same round trip.
+        """
+        if query not in self.statements:
+            cursor.execute(prefix + query, data)
+            return
+        prepared = self._prepared_names(cursor.connection)
+        data = tuple(data or ())
+        execute = f"EXECUTE {query}"
+        if data:
+            execute += f" ({', '.join(['%s'] * len(data))})"
+        for attempt in range(2):
+            if query not in prepared:
+                try:
+                    cursor.execute(
+                        f"{prefix}PREPARE {query} AS {self.statements[query]}"
+                    )
+                except psycopg2.errors.DuplicatePreparedStatement:
+                    prepared.add(query)
+                    if not cursor.connection.autocommit:
+                        raise
+                else:
+                    prepared.add(query)
+                    prefix = ""
+            try:
+                cursor.execute(prefix + execute, data)
+            except psycopg2.errors.InvalidSqlStatementName:
+                prepared.discard(query)
+                if attempt or not cursor.connection.autocommit:
+                    raise
+            else:
+                return
+
+    @contextmanager
+    def transaction(self):
+        """
+        Run the queries of a with block in a single transaction.
+
+        The queries made through this object by the same thread inside the block
+        join the transaction, which is committed at the end of the block or
+        rolled back if it raises. Nested blocks join the outer transaction.
+
+        :return: A context manager yielding the cursor of the transaction.
+        """
+        transaction_cursor = getattr(self._local, "cursor", None)
+        if transaction_cursor is not None:
+            yield transaction_cursor
+            return
+        # Grouped writes must not be mixed with the statements of the block.
+        self.flush()
+        with self.cursor() as cursor:
+            connection = cursor.connection
+            connection.autocommit = False
+            self._local.cursor = cursor
+            try:
+                yield cursor
+                connection.commit()
+            except BaseException:
+                if not connection.closed:
+                    connection.rollback()
+                raise
+            finally:
+                self._local.cursor = None
+                if not connection.closed:
+                    connection.autocommit = True
+
+    def _write(self, query, data, fetch):
+        """
+        Run a writing query, in the current transaction, in the current group of
+        writes or in its own transaction.
+
+        :param query: The SQL query to run.
+        :param data: The data to use in the query.
+        :param fetch: True to fetch the rows returned by the query.
+        :return: The rows returned by the query if fetch is True, None otherwise.
+        """
+        if self.group_size > 0 and getattr(self._local, "cursor", None) is None:
+            return self._group_write(query, data, fetch)
+        with self.cursor() as cursor:
+            self._run(cursor, query, data)
+            if fetch:
+                return cursor.fetchall()
+        return None
+
+    def _group_write(self, query, data, fetch):
+        """
+        Run a writing query in the open group of writes, committing the group
+        when it is full and scheduling its commit when it is new.
+
+        Each write starts with a savepoint, so a failing write is rolled back
+        without the writes before it.
+
+        :param query: The SQL query to run.
+        :param data: The data to use in the query.
+        :param fetch: True to fetch the rows returned by the query.
+        :return: The rows returned by the query if fetch is True, None otherwise.
+        """
+        with self._group_lock:
+            if self._group_connection is None:
+                if self.pool is None:
+                    self._group_connection = self.connection
+                else:
+                    self._group_connection = self._checkout()
+                self._group_connection.autocommit = False
+            connection = self._group_connection
+            cursor = connection.cursor()
+            try:
+                self._run(cursor, query, data, "SAVEPOINT group_write; ")
+                result = cursor.fetchall() if fetch else None
+            except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                self._end_group(broken=True)
+                raise
+            except psycopg2.Error:
+                cursor.execute("ROLLBACK TO SAVEPOINT group_write")
+                raise
+            finally:
+                if not cursor.closed:
+                    cursor.close()
+            self._group_pending += 1
+            self._group_writers.add(threading.get_ident())
+            if self._group_pending >= self.group_size:
+                self.flush()
+            elif self._group_timer is None:
+                self._group_timer = threading.Timer(self.group_delay, self.flush)
+                self._group_timer.start()
+            return result
+
+    def flush(self):
+        """
+        Commit the open group of writes, if any.
+
+        :param self: An instance of the DatabaseConnect class.
+        """
+        with self._group_lock:
+            if self._group_connection is None:
+                return
+            broken = False
+            try:
+                self._group_connection.commit()
+            except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                broken = True
+                raise
+            finally:
+                self._end_group(broken)
+
+    def _end_group(self, broken=False):
+        """
+        Release the connection of the open group of writes.
+
+        :param broken: True if the connection failed.
+        """
+        if self._group_timer is not None:
+            self._group_timer.cancel()
+            self._group_timer = None
+        connection = self._group_connection
+        self._group_connection = None
+        self._group_pending = 0
+        self._group_writers = set()
+        if broken and not connection.closed:
+            connection.rollback()
+        if not connection.closed:
+            connection.autocommit = True
+        if self.pool is not None:
+            self._checkin(connection, broken)
 
     def execute(self, query, data=None):
         """
         Executes a query on the database.
 
         :param self: An instance of the DatabaseConnect class.
-        :param query: The SQL query to execute.
+        :param query: The SQL query to execute, or the name of a prepared statement.
         :param data: The data to use in the query.
         """
-        cursor = self.connection.cursor()
-        cursor.execute(query, data)
-        self.connection.commit()
-        cursor.close()
+        self._write(query, data, fetch=False)
+
+    def execute_returning(self, query, data=None):
+        """
+        Executes a writing query on the database and fetches the rows it returns.
+
+        :param self: An instance of the DatabaseConnect class.
+        :param query: The SQL query to execute, usually with a RETURNING clause,
+            or the name of a prepared statement.
+        :param data: The data to use in the query.
+        :return: The rows returned by the query.
+        """
+        return self._write(query, data, fetch=True)
+
+    def execute_values(self, query, rows, template=None, page_size=1000):
+        """
+        Executes a writing query on many rows at once and fetches the rows it returns.
+
+        The rows are sent with psycopg2.extras.execute_values, page_size rows per
+        statement, and every statement runs in a single transaction.
+
+        :param self: An instance of the DatabaseConnect class.
+        :param query: The SQL query to execute, with a single %s placeholder for
+            the VALUES list, usually with a RETURNING clause.
+        :param rows: A list of tuples, one per row.
+        :param template: The template of one row, or None for the default.
+        :param page_size: The maximum number of rows per statement.
+        :return: The rows returned by the query.
+        """
+        if not rows:
+            return []
+        with self.transaction() as cursor:
+            return psycopg2.extras.execute_values(
+                cursor, query, rows, template, page_size, fetch=True
+            )
 
     def fetch(self, query, data=None):
         """
         Fetches all rows from a query.
 
         :param self: An instance of the DatabaseConnect class.
-        :param query: The SQL query to fetch from.
+        :param query: The SQL query to fetch from, or the name of a prepared statement.
         :param data: The data to use in the query.
         :return: The result of the fetch operation.
         """
-        cursor = self.connection.cursor()
-        cursor.execute(query, data)
-        result = cursor.fetchall()
-        cursor.close()
-        return result
+        return self._read(query, data, lambda cursor: cursor.fetchall())
 
     def fetchone(self, query, data=None):
         """
         Fetches one row from a query.
 
         :param self: An instance of the DatabaseConnect class.
-        :param query: The SQL query to fetch from.
+        :param query: The SQL query to fetch from, or the name of a prepared statement.
         :param data: The data to use in the query.
         :return: The result of the fetch operation.
         """
-        cursor = self.connection.cursor()
-        cursor.execute(query, data)
-        result = cursor.fetchone()
-        cursor.close()
-        return result
+        return self._read(query, data, lambda cursor: cursor.fetchone())
+
+    def listen(self, *channels):
+        """
+        Open a connection of its own listening to notification channels.
+
+        The connection is in autocommit mode, so notifications are received as
+        soon as they arrive; they are read with its poll method and notifies
+        list. The caller closes it.
+
+        :param self: An instance of the DatabaseConnect class.
+        :param channels: The names of the channels to listen to.
+        :return: The listening connection.
+        """
+        for channel in channels:
+            if not re.fullmatch(r"[a-z_][a-z0-9_]*", channel):
+                raise ValueError(f"Invalid channel name: {channel}")
+        connection = psycopg2.connect(**self.connection_parameters())
+        try:
+            connection.autocommit = True
+            with connection.cursor() as cursor:
+                for channel in channels:
+                    cursor.execute(f"LISTEN {channel}")
+        except Exception:
+            connection.close()
+            raise
+        return connection
+
+    def stream(self, query, data=None, itersize=None):
+        """
+        Stream the rows of a query through a server-side cursor.
+
+        The rows are fetched itersize at a time, so memory use does not grow with
+        the size of the result. The cursor lives in a read transaction on a new
+        connection of its own, outside the pool, so queries run while the rows
+        are consumed neither end the transaction nor wait for a pooled
+        connection. The connection and its stream slot are released once the
+        rows are exhausted or the generator is closed: a stream left unfinished
+        should be closed, or it holds one of the DATABASE_STREAM_MAX slots until
+        it is garbage collected, and only other streams wait for it.
+
+        :param self: An instance of the DatabaseConnect class.
+        :param query: The SQL query to fetch from.
+        :param data: The data to use in the query.
+        :param itersize: The number of rows fetched per round trip, defaults to
+            the DATABASE_ITERSIZE environment variable.
+        :return: A generator of rows.
+        """
+        if self.stream_slots is not None:
+            self.stream_slots.acquire()
+        try:
+            connection = psycopg2.connect(**self.connection_parameters())
+            try:
+                connection.autocommit = False
+                cursor = connection.cursor(name=f"stream_{next(self.stream_names)}")
+                cursor.itersize = itersize or self.itersize
+                try:
+                    cursor.execute(query, data)
+                    yield from cursor
+                finally:
+                    if not connection.closed:
+                        cursor.close()
+                        connection.rollback()
+            finally:
+                connection.close()
+        finally:
+            if self.stream_slots is not None:
+                self.stream_slots.release()
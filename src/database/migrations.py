@@ -0,0 +1,161 @@
+from src.database.database_connect import DatabaseConnect
+
+create_table_migrations = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INTEGER PRIMARY KEY,
+    description TEXT NOT NULL,
+    applied_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+"""
+
+create_table_ticket = """
+    CREATE TABLE IF NOT EXISTS ticket (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    description TEXT NOT NULL,
+    ticket_type TEXT NOT NULL,
+    state TEXT NOT NULL,
+    responsible TEXT NOT NULL,
+    date_created TIMESTAMP NOT NULL DEFAULT NOW()
+);
+"""
+
+create_trigram_index = """
+    CREATE INDEX IF NOT EXISTS ticket_{column}_trgm_idx
+    ON ticket USING gin ({column} gin_trgm_ops)
+"""
+
+SEARCHED_COLUMNS = ["id", "name", "description", "ticket_type", "state", "responsible"]
+
+# The text search configuration of the full-text search vector, which queries
+# must use as well to match it.
+TEXT_SEARCH_CONFIG = "english"
+
+add_search_vector = f"""
+    ALTER TABLE ticket ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        to_tsvector('{TEXT_SEARCH_CONFIG}', name || ' ' || description)
+    ) STORED
+"""
+
+# The channel the ticket_notify trigger sends the ID of every written ticket on.
+TICKET_CHANNEL = "ticket_changed"
+
+create_notify_function = f"""
+    CREATE OR REPLACE FUNCTION ticket_notify() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE' AND OLD.id != NEW.id THEN
+            PERFORM pg_notify('{TICKET_CHANNEL}', OLD.id);
+        END IF;
+        PERFORM pg_notify('{TICKET_CHANNEL}', COALESCE(NEW.id, OLD.id));
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+# The schema migrations as (version, description, statements) tuples.
+# Statements must be safe to run again, since a migration is only recorded
+# once all its statements succeeded.
+MIGRATIONS = [
+    (1, "Create the ticket table", [create_table_ticket]),
+    (
+        2,
+        "Index open tickets by state and creation date",
+        [
+            """
+            CREATE INDEX IF NOT EXISTS ticket_open_state_date_created_idx
+            ON ticket (state, date_created) WHERE state != 'closed'
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS ticket_date_created_idx
+            ON ticket (date_created)
+            """,
+        ],
+    ),
+    (
+        3,
+        "Index the searched columns with trigrams",
+        ["CREATE EXTENSION IF NOT EXISTS pg_trgm"]
+        + [create_trigram_index.format(column=column) for column in SEARCHED_COLUMNS],
+    ),
+    (
+        4,
+        "Add a full-text search vector over name and description",
+        [
+            add_search_vector,
+            """
+            CREATE INDEX IF NOT EXISTS ticket_search_vector_idx
+            ON ticket USING gin (search_vector)
+            """,
+        ],
+    ),
+    (
+        5,
+        "Notify the ID of every written ticket",
+        [
+            create_notify_function,
+            "DROP TRIGGER IF EXISTS ticket_notify_trigger ON ticket",
+            """
+            CREATE TRIGGER ticket_notify_trigger
+            AFTER INSERT OR UPDATE OR DELETE ON ticket
+            FOR EACH ROW EXECUTE FUNCTION ticket_notify()
+            """,
+        ],
+    ),
+]
+
+
+class MigrationRunner:
+    """
+    This class applies the schema migrations that were not applied yet to the database.
+    The applied versions are recorded in the schema_migrations table.
+    """
+
+    def __init__(self, database_connection: DatabaseConnect, migrations=None):
+        """
+        Initialize the runner with a connected database connection.
+
+        :param database_connection: An instance of DatabaseConnect class.
+        :param migrations: The migrations to apply, defaults to MIGRATIONS.
+        """
+        self.database_connection = database_connection
+        self.migrations = MIGRATIONS if migrations is None else migrations
+
+    def applied_versions(self) -> set[int]:
+        """
+        Get the versions of the migrations already applied.
+
+        :return: A set of migration versions.
+        """
+        self.database_connection.execute(create_table_migrations)
+        result = self.database_connection.fetch("SELECT version FROM schema_migrations")
+        return {row[0] for row in result}
+
+    def pending(self) -> list:
+        """
+        Get the migrations not applied yet, in version order.
+
+        :return: A list of (version, description, statements) tuples.
+        """
+        applied = self.applied_versions()
+        return sorted(
+            (migration for migration in self.migrations if migration[0] not in applied),
+            key=lambda migration: migration[0],
+        )
+
+    def run(self) -> list[int]:
+        """
+        Apply the pending migrations.
+
+        :return: The versions of the migrations applied by this run.
+        """
+        applied = []
+        for version, description, statements in self.pending():
+            for statement in statements:
+                self.database_connection.execute(statement)
+            self.database_connection.execute(
+                "INSERT INTO schema_migrations (version, description) VALUES (%s, %s)",
+                (version, description),
+            )
+            applied.append(version)
+        return applied
@@ -0,0 +1,253 @@
+import csv
+import io
+import json
+
+from src.constants import ID_PATTERN, NAME_PATTERN, State, Responsible, Type
+from src.database.database_connect import DatabaseConnect
+
+# The columns of an imported ticket, in the order of the CSV file columns.
+IMPORT_COLUMNS = ["id", "name", "description", "ticket_type"]
+
+create_staging_table = """
+    CREATE TEMPORARY TABLE ticket_import (
+    line BIGSERIAL,
+    id TEXT,
+    name TEXT,
+    description TEXT,
+    ticket_type TEXT,
+    reason TEXT
+) ON COMMIT DROP
+"""
+
+# The rows written by the readers below, each starting with its line number.
+copy_rows = """
+    COPY ticket_import (line, id, name, description, ticket_type)
+    FROM STDIN WITH (FORMAT csv)
+"""
+
+# The checks of TMS.create_ticket, in the same order, applied to every row at once.
+validate_rows = """
+    UPDATE ticket_import SET reason = CASE
+        WHEN id IS NULL OR id !~ %s THEN 'invalid id'
+        WHEN description IS NULL OR description = '' THEN 'invalid details'
+        WHEN name IS NULL OR name !~ %s THEN 'invalid name'
+        WHEN ticket_type IS NULL OR ticket_type != ALL(%s) THEN 'invalid type'
+    END
+"""
+
+reject_duplicates = """
+    UPDATE ticket_import i SET reason = 'duplicate id'
+    FROM (
+        SELECT line, row_number() OVER (PARTITION BY id ORDER BY line) AS rank
+        FROM ticket_import
+        WHERE reason IS NULL
+    ) d
+    WHERE i.line = d.line AND d.rank > 1
+"""
+
+reject_existing = """
+    UPDATE ticket_import i SET reason = 'id already exists'
+    FROM ticket t
+    WHERE i.reason IS NULL AND t.id = i.id
+"""
+
+merge_rows = """
+    INSERT INTO ticket (id, name, description, ticket_type, state, responsible)
+    SELECT id, name, description, ticket_type, %s, %s
+    FROM ticket_import
+    WHERE reason IS NULL
+    ORDER BY line
+    ON CONFLICT (id) DO NOTHING
+"""
+
+select_rejected = """
+    SELECT line, id, reason FROM ticket_import WHERE reason IS NOT NULL ORDER BY line
+"""
+
+
+class RowsReader:
+    """
+    A file-like object reading the tickets of a file as the CSV rows of
+    copy_rows.
+
+    Each row starts with the line number of its ticket. Subclasses parse the
+    file with _values, leaving out and recording as rejected the lines that
+    cannot be parsed, so they never abort the COPY.
+    """
+
+    def __init__(self, lines, rejected: list):
+        """
+        Initialize the reader.
+
+        :param lines: An iterable of the lines of the file, such as a text file.
+        :param rejected: The list the (line, id, reason) tuples of the rejected
+            lines are appended to.
+        """
+        self._rows = self._csv_rows(self._values(lines, rejected))
+        self._buffer = ""
+
+    def _values(self, lines, rejected):
+        """
+        Parse the tickets of a file.
+
+        :param lines: An iterable of the lines of the file.
+        :param rejected: The list the rejected lines are appended to.
+        :return: A generator of (line, values) tuples, the values being in the
+            order of IMPORT_COLUMNS.
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def _csv_rows(values):
+        """
+        Convert the parsed tickets to CSV rows.
+
+        :param values: An iterable of (line, values) tuples.
+        :return: A generator of CSV rows.
+        """
+        output = io.StringIO()
+        writer = csv.writer(output, lineterminator="\n")
+        for number, row in values:
+            writer.writerow(
+                [number] + [None if value is None else str(value) for value in row]
+            )
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate()
+
+    def read(self, size=-1) -> str:
+        """
+        Read CSV text.
+
+        :param size: The maximum number of characters to read, or -1 for all.
+        :return: The text read, empty at the end of the rows.
+        """
+        while size < 0 or len(self._buffer) < size:
+            row = next(self._rows, None)
+            if row is None:
+                break
+            self._buffer += row
+        if size < 0:
+            size = len(self._buffer)
+        text, self._buffer = self._buffer[:size], self._buffer[size:]
+        return text
+
+
+class JsonLinesReader(RowsReader):
+    """
+    A reader of JSON lines files, with one object per line.
+
+    Lines that are not a JSON object are rejected as "invalid json".
+    """
+
+    def _values(self, lines, rejected):
+        """
+        Parse the JSON objects of a file.
+
+        :param lines: An iterable of JSON lines.
+        :param rejected: The list the rejected lines are appended to.
+        :return: A generator of (line, values) tuples.
+        """
+        for number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                document = json.loads(line)
+            except ValueError:
+                document = None
+            if not isinstance(document, dict):
+                rejected.append((number, None, "invalid json"))
+                continue
+            yield number, [document.get(column) for column in IMPORT_COLUMNS]
+
+
+class CsvReader(RowsReader):
+    """
+    A reader of CSV files, with a header line followed by the columns of
+    IMPORT_COLUMNS.
+
+    Rows are numbered from the first data row. Rows that cannot be parsed or do
+    not have exactly these columns are rejected as "invalid csv". Empty fields
+    are imported as NULL.
+    """
+
+    def _values(self, lines, rejected):
+        """
+        Parse the rows of a CSV file.
+
+        :param lines: An iterable of CSV lines.
+        :param rejected: The list the rejected rows are appended to.
+        :return: A generator of (line, values) tuples.
+        """
+        reader = csv.reader(lines, strict=True)
+        number = -1
+        while True:
+            number += 1
+            try:
+                row = next(reader)
+            except StopIteration:
+                return
+            except csv.Error:
+                if number > 0:
+                    rejected.append((number, None, "invalid csv"))
+                continue
+            if number == 0:
+                continue
+            if len(row) != len(IMPORT_COLUMNS):
+                rejected.append((number, row[0] if row else None, "invalid csv"))
+                continue
+            yield number, [value if value else None for value in row]
+
+
+class TicketImporter:
+    """
+    This class imports tickets in bulk from CSV or JSON lines files.
+
+    The rows are streamed with COPY into a temporary staging table, validated
+    with the rules of TMS.create_ticket by a few statements over the whole table,
+    and the valid rows are merged into the ticket table as new L1 tickets. The
+    import runs in a single transaction.
+    """
+
+    def __init__(self, database_connection: DatabaseConnect):
+        """
+        Initialize the importer with a connected database connection.
+
+        :param database_connection: An instance of DatabaseConnect class.
+        """
+        self.database_connection = database_connection
+
+    def import_tickets(self, file, file_format="csv") -> dict:
+        """
+        Import the tickets of a file.
+
+        A CSV file has a header line followed by the id, name, description and
+        ticket_type columns. A JSON lines file has one object per line with these
+        keys. The lines that cannot be parsed are rejected like invalid tickets.
+
+        :param file: The text file to import.
+        :param file_format: The format of the file: "csv" or "jsonl".
+        :return: A dictionary with the number of "imported" tickets and the
+            "rejected" rows as (line, id, reason) tuples, in file order. Lines are
+            counted from the first data row for CSV files.
+        """
+        rejected = []
+        with self.database_connection.transaction() as cursor:
+            cursor.execute(create_staging_table)
+            if file_format == "jsonl":
+                reader = JsonLinesReader(file, rejected)
+            else:
+                reader = CsvReader(file, rejected)
+            cursor.copy_expert(copy_rows, reader)
+            cursor.execute(
+                validate_rows,
+                (ID_PATTERN, NAME_PATTERN, [member.value for member in Type]),
+            )
+            cursor.execute(reject_duplicates)
+            cursor.execute(reject_existing)
+            cursor.execute(merge_rows, (State.NEW.value, Responsible.L1.value))
+            imported = cursor.rowcount
+            cursor.execute(select_rejected)
+            rejected.extend(cursor.fetchall())
+        rejected.sort(key=lambda row: row[0])
+        return {"imported": imported, "rejected": rejected}
@@ -0,0 +1,108 @@
+import select
+import threading
+from typing import Callable, Optional
+
+import psycopg2
+
+from src.database.database_connect import DatabaseConnect
+from src.database.migrations import TICKET_CHANNEL
+
+
+class TicketListener:
+    """
+    This class listens to the ticket IDs notified by the ticket_notify trigger,
+    so a process learns about the writes of the other processes sharing the
+    database.
+
+    The IDs are passed to a callback, a batch at a time, from a background thread.
+    When the listening connection is lost, notifications may have been missed, so
+    the callback is called with None once listening again.
+    """
+
+    def __init__(
+        self,
+        database_connection: DatabaseConnect,
+        on_change: Callable[[Optional[list[str]]], None],
+        timeout: float = 1.0,
+    ):
+        """
+        Initialize the listener without listening yet.
+
+        :param database_connection: An instance of DatabaseConnect class, used to
+            open the listening connection.
+        :param on_change: A function taking the list of the changed ticket IDs, or
+            None when any ticket may have changed.
+        :param timeout: The number of seconds to wait for notifications at a time,
+            which bounds how long stopping takes.
+        """
+        self.database_connection = database_connection
+        self.on_change = on_change
+        self.timeout = timeout
+        self.connection = None
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def connect(self):
+        """
+        Open the listening connection.
+        """
+        self.connection = self.database_connection.listen(TICKET_CHANNEL)
+
+    def poll(self) -> list[str]:
+        """
+        Wait for notifications and pass the changed ticket IDs to the callback.
+
+        :return: The changed ticket IDs, without duplicates, in the order they
+            were notified. Empty if nothing was notified before the timeout.
+        """
+        if select.select([self.connection], [], [], self.timeout) == ([], [], []):
+            return []
+        self.connection.poll()
+        ticket_ids = {}
+        while self.connection.notifies:
+            ticket_ids[self.connection.notifies.pop(0).payload] = None
+        ticket_ids = list(ticket_ids)
+        if ticket_ids:
+            self.on_change(ticket_ids)
+        return ticket_ids
+
+    def start(self):
+        """
+        Start listening in a background thread.
+        """
+        self.connect()
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop listening and close the listening connection.
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._close()
+
+    def _close(self):
+        """
+        Close the listening connection, if open.
+        """
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def _run(self):
+        """
+        Poll until stopped, listening again after a connection error.
+        """
+        while not self._stopped.is_set():
+            try:
+                if self.connection is None:
+                    self.connect()
+                    self.on_change(None)
+                self.poll()
+            except (psycopg2.OperationalError, psycopg2.InterfaceError, OSError):
+                self._close()
+                self._stopped.wait(self.timeout)
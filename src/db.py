@@ -1,9 +1,232 @@
 from src.abstract_data import AbstractData
 from src.database.database_connect import DatabaseConnect
+from src.database.migrations import TEXT_SEARCH_CONFIG
 from src.ticket import Ticket
-from src.constants import State, Responsible, Type
+from src.constants import PAGE_SIZE, State, Responsible, Type
 
-from typing import Optional
+import re
+from typing import Iterator, Optional
+
+# The condition selecting each list of the TAR-3 report, with its parameters.
+TAR_3_CONDITIONS = {
+    "new": (
+        "t.state = %s AND t.date_created < NOW() - '3 days'::interval",
+        (State.NEW.value,),
+    ),
+    "assigned": (
+        "t.state = %s AND t.date_created < NOW() - '10 days'::interval",
+        (State.ASSIGNED.value,),
+    ),
+    "all": ("t.date_created < NOW() - '20 days'::interval", ()),
+}
+
+# Keywords searched by substring even in full-text mode: single words holding a
+# digit or a dash, such as ticket IDs, and words too short to be meaningful.
+SUBSTRING_KEYWORD = re.compile(r"\S*[\d-]\S*|\S{1,2}")
+
+# The relevance of a ticket to the full-text query q of a search.
+RANK = "ts_rank(t.search_vector, q)"
+
+# The queries run on every ticket read or write, registered by name as prepared
+# statements so the server parses and plans them once per connection.
+PREPARED_STATEMENTS = {
+    "get_ticket": """
+        SELECT t.id,t.name,t.description,t.ticket_type,t.state,t.responsible,t.date_created 
+        FROM  ticket t 
+        WHERE t.id = %s AND t.state != %s 
+    """,
+    "id_exists": "SELECT * FROM ticket WHERE id = %s AND state != %s",
+    "create_ticket": """
+        INSERT INTO ticket (id, name, description, ticket_type, state, responsible)
+        VALUES (%s, %s, %s, %s, %s, %s)
+        RETURNING id,name,description,ticket_type,state,responsible,date_created
+    """,
+    "update_ticket": """
+        UPDATE ticket 
+        SET name = %s, description = %s, ticket_type = %s, state = %s, responsible = %s
+        WHERE id = %s AND state != %s
+        RETURNING id
+    """,
+    "close_ticket": """
+        UPDATE ticket 
+        SET state = %s
+        WHERE id = %s AND state != %s
+        RETURNING id
+    """,
+    "get_tickets": """
+        SELECT t.id,t.name,t.description,t.ticket_type,t.state,t.responsible,t.date_created 
+        FROM  ticket t 
+        WHERE t.id = ANY(%s) AND t.state != %s 
+    """,
+    "close_tickets": """
+        UPDATE ticket 
+        SET state = %s
+        WHERE id = ANY(%s) AND state != %s
+        RETURNING id
+    """,
+    "close_tickets_only_responsible": """
+        UPDATE ticket 
+        SET state = %s
+        WHERE id = ANY(%s) AND state != %s AND responsible = %s
+        RETURNING id
+    """,
+}
+
+
+def data_to_ticket(data) -> Ticket:
+    """
+    Convert a row of ticket fields to a Ticket object.
+
+    :param data: A tuple of the id, name, description, type, state, responsible
+        and creation date of the ticket.
+    :return: A Ticket object.
+    """
+    return Ticket(
+        data[0],
+        data[1],
+        data[2],
+        Type(data[3]),
+        State(data[4]),
+        Responsible(data[5]),
+        data[6],
+    )
+
+
+def uses_full_text(keyword, full_text_search) -> bool:
+    """
+    Check if a keyword is searched with the full-text search vector.
+
+    :param keyword: A string to search in the database.
+    :param full_text_search: True in full-text mode.
+    :return: True in full-text mode unless the keyword looks like an ID.
+    """
+    return full_text_search and not SUBSTRING_KEYWORD.fullmatch(keyword.strip())
+
+
+def search_query(keyword, full_text) -> tuple[str, tuple]:
+    """
+    Build the query matching the open tickets against a keyword.
+
+    In full-text mode, the name and description are matched with the search
+    vector and the other fields must equal the keyword, and the relevance of
+    each ticket is selected after its fields.
+
+    :param keyword: A string to search in the database.
+    :param full_text: True to match the keyword with the search vector, as told
+        by uses_full_text.
+    :return: A tuple of the query and its data.
+    """
+    if full_text:
+        query = f"""
+            SELECT t.id,t.name,t.description,t.ticket_type,t.state,t.responsible,t.date_created,{RANK}
+            FROM ticket t, websearch_to_tsquery('{TEXT_SEARCH_CONFIG}', %s) q 
+            WHERE t.state != %s 
+            AND(t.search_vector @@ q 
+            OR t.id = %s 
+            OR t.ticket_type = %s
+            OR t.state = %s
+            OR t.responsible = %s)
+        """
+        data = (keyword, State.CLOSED.value, keyword, keyword, keyword, keyword)
+        return query, data
+    query = """
+            SELECT t.id,t.name,t.description,t.ticket_type,t.state,t.responsible,t.date_created 
+            FROM ticket t 
+            WHERE t.state != %s 
+            AND(t.id LIKE %s  
+            OR t.name LIKE %s
+            OR t.description LIKE %s
+            OR t.ticket_type LIKE %s
+            OR t.state LIKE %s
+            OR t.responsible LIKE %s)
+        """
+    data = (
+        State.CLOSED.value,
+        f"%{keyword}%",
+        f"%{keyword}%",
+        f"%{keyword}%",
+        f"%{keyword}%",
+        f"%{keyword}%",
+        f"%{keyword}%",
+    )
+    return query, data
+
+
+def ranked_search_query(keyword, full_text) -> tuple[str, tuple]:
+    """
+    Build the search query, ordered by relevance in full-text mode.
+
+    :param keyword: A string to search in the database.
+    :param full_text: True to match the keyword with the search vector.
+    :return: A tuple of the query and its data.
+    """
+    query, data = search_query(keyword, full_text)
+    if full_text:
+        query += f" ORDER BY {RANK} DESC, t.date_created, t.id"
+    return query, data
+
+
+def set_state_statement(responsible: bool, only_responsible: bool) -> tuple[str, str]:
+    """
+    Build a variant of the conditional UPDATE of set_ticket_state, returning
+    the changed row.
+
+    :param responsible: True if the variant also sets the responsible.
+    :param only_responsible: True if the variant only changes a ticket assigned
+        to a given responsible.
+    :return: A tuple of the name and the query of the variant.
+    """
+    name = "set_ticket_state"
+    query = """
+            UPDATE ticket t 
+            SET state = %s"""
+    if responsible:
+        name += "_responsible"
+        query += ", responsible = %s"
+    query += """
+            WHERE t.id = %s AND t.state != %s"""
+    if only_responsible:
+        name += "_only_responsible"
+        query += " AND t.responsible = %s"
+    query += """
+            RETURNING t.id,t.name,t.description,t.ticket_type,t.state,t.responsible,t.date_created
+        """
+    return name, query
+
+
+# set_ticket_state is the most frequent write, so its four variants are
+# prepared too.
+PREPARED_STATEMENTS.update(
+    set_state_statement(responsible, only_responsible)
+    for responsible in (False, True)
+    for only_responsible in (False, True)
+)
+
+
+def set_state_query(
+    ticket_id,
+    state: State,
+    responsible: Optional[Responsible] = None,
+    only_responsible: Optional[Responsible] = None,
+) -> tuple[str, tuple]:
+    """
+    Select the prepared variant of set_ticket_state and build its data.
+
+    :param ticket_id: The ID of the ticket.
+    :param state: The new state of the ticket.
+    :param responsible: The new responsible of the ticket, or None to keep it.
+    :param only_responsible: If given, the ticket is only changed if it is
+        currently assigned to this responsible.
+    :return: A tuple of the name of the prepared statement and its data.
+    """
+    name, _ = set_state_statement(responsible is not None, only_responsible is not None)
+    data = [state.value]
+    if responsible is not None:
+        data.append(responsible.value)
+    data += [ticket_id, State.CLOSED.value]
+    if only_responsible is not None:
+        data.append(only_responsible.value)
+    return name, tuple(data)
 
 
 class DB(AbstractData):
@@ -12,13 +235,20 @@ class DB(AbstractData):
     It provides methods to create, update, close, and search tickets in the database.
     """
 
-    def __init__(self, database_connection: DatabaseConnect):
+    def __init__(
+        self, database_connection: DatabaseConnect, full_text_search: bool = False
+    ):
         """
         Initialize the DB class with a database connection.
 
         :param database_connection: An instance of DatabaseConnect class.
+        :param full_text_search: True to search the name and description with the
+            full-text search vector instead of substrings.
         """
         self.database_connection = database_connection
+        self.full_text_search = full_text_search
+        for name, query in PREPARED_STATEMENTS.items():
+            self.database_connection.prepare(name, query)
         self.database_connection.connect()
 
     @staticmethod
@@ -29,15 +259,7 @@ class DB(AbstractData):
         :param data: A tuple containing ticket data.
         :return: A Ticket object.
         """
-        return Ticket(
-            data[0],
-            data[1],
-            data[2],
-            Type(data[3]),
-            State(data[4]),
-            Responsible(data[5]),
-            data[6],
-        )
+        return data_to_ticket(data)
 
     def data_to_tickets(self, data):
         """
@@ -48,6 +270,60 @@ class DB(AbstractData):
         """
         return [self.data_to_ticket(ticket) for ticket in data]
 
+    def uses_full_text(self, keyword) -> bool:
+        """
+        Check if a keyword is searched with the full-text search vector.
+
+        :param keyword: A string to search in the database.
+        :return: True in full-text mode unless the keyword looks like an ID.
+        """
+        return uses_full_text(keyword, self.full_text_search)
+
+    def _page(
+        self, query, data, cursor, limit, ranked=False
+    ) -> tuple[list[Ticket], Optional[tuple]]:
+        """
+        Fetch one page of the rows of a query, ordered by creation date then id,
+        or by decreasing relevance first if ranked.
+
+        The cursor holds the creation date and id of the last ticket of the previous
+        page, preceded by its relevance if ranked, so each page starts where the
+        previous one ended instead of skipping rows.
+
+        :param query: The query selecting the tickets, ending with its WHERE clause.
+            If ranked, it selects the relevance after the fields of the tickets.
+        :param data: The data to use in the query.
+        :param cursor: The cursor returned with the previous page, or None for the first page.
+        :param limit: The maximum number of tickets in the page.
+        :param ranked: True to order the tickets by relevance first.
+        :return: A tuple of the tickets of the page and the cursor of the next page,
+            or None if this page is the last one.
+        """
+        data = list(data)
+        if ranked:
+            if cursor is not None:
+                # ts_rank returns a real, compared with the cursor as a real too.
+                query += f""" AND ({RANK} < %s::real
+                    OR ({RANK} = %s::real AND (t.date_created, t.id) > (%s, %s)))"""
+                rank, date_created, ticket_id = cursor
+                data.extend((rank, rank, date_created, ticket_id))
+            query += f" ORDER BY {RANK} DESC, t.date_created, t.id LIMIT %s"
+        else:
+            if cursor is not None:
+                query += " AND (t.date_created, t.id) > (%s, %s)"
+                data.extend(cursor)
+            query += " ORDER BY t.date_created, t.id LIMIT %s"
+        # One extra row tells whether another page follows.
+        data.append(limit + 1)
+        result = self.database_connection.fetch(query, tuple(data))
+        if len(result) <= limit:
+            return self.data_to_tickets(result), None
+        last = result[limit - 1]
+        next_cursor = (last[6], last[0])
+        if ranked:
+            next_cursor = (last[7],) + next_cursor
+        return self.data_to_tickets(result[:limit]), next_cursor
+
     def search_tickets(self, keyword):
         """
         Search tickets in the database using a keyword.
@@ -55,30 +331,41 @@ class DB(AbstractData):
         :param keyword: A string to search in the database.
         :return: A list of Ticket objects that match the keyword.
         """
-        query = """
-            SELECT t.id,t.name,t.description,t.ticket_type,t.state,t.responsible,t.date_created 
-            FROM ticket t 
-            WHERE t.state != %s 
-            AND(t.id LIKE %s  
-            OR t.name LIKE %s
-            OR t.description LIKE %s
-            OR t.ticket_type LIKE %s
-            OR t.state LIKE %s
-            OR t.responsible LIKE %s)
-        """
-        data = (
-            State.CLOSED.value,
-            f"%{keyword}%",
-            f"%{keyword}%",
-            f"%{keyword}%",
-            f"%{keyword}%",
-            f"%{keyword}%",
-            f"%{keyword}%",
+        result = self.database_connection.fetch(
+            *ranked_search_query(keyword, self.uses_full_text(keyword))
         )
-        result = self.database_connection.fetch(query, data)
         result = self.data_to_tickets(result)
         return result
 
+    def search_tickets_page(
+        self, keyword, cursor=None, limit=PAGE_SIZE
+    ) -> tuple[list[Ticket], Optional[tuple]]:
+        """
+        Get one page of the tickets that match a keyword, ordered by creation date
+        then id, or by relevance first in full-text mode.
+
+        :param keyword: A string to search in the database.
+        :param cursor: The cursor returned with the previous page, or None for the first page.
+        :param limit: The maximum number of tickets in the page.
+        :return: A tuple of the tickets of the page and the cursor of the next page,
+            or None if this page is the last one.
+        """
+        full_text = self.uses_full_text(keyword)
+        query, data = search_query(keyword, full_text)
+        return self._page(query, data, cursor, limit, full_text)
+
+    def stream_search_tickets(self, keyword, itersize=None) -> Iterator[Ticket]:
+        """
+        Search tickets in the database using a keyword, streaming the results.
+
+        :param keyword: A string to search in the database.
+        :param itersize: The number of rows fetched per round trip, or None for the default.
+        :return: A generator of Ticket objects that match the keyword.
+        """
+        query, data = ranked_search_query(keyword, self.uses_full_text(keyword))
+        for row in self.database_connection.stream(query, data, itersize):
+            yield self.data_to_ticket(row)
+
     def get_ticket(self, ticket_id) -> Optional[Ticket]:
         """
         Get a ticket from the database using its ID.
@@ -86,13 +373,8 @@ class DB(AbstractData):
         :param ticket_id: The ID of the ticket.
         :return: A Ticket object if found, None otherwise.
         """
-        query = """
-            SELECT t.id,t.name,t.description,t.ticket_type,t.state,t.responsible,t.date_created 
-            FROM  ticket t 
-            WHERE t.id = %s AND t.state != %s 
-        """
         data = (ticket_id, State.CLOSED.value)
-        result = self.database_connection.fetchone(query, data)
+        result = self.database_connection.fetchone("get_ticket", data)
         if result:
             return self.data_to_ticket(result)
         return None
@@ -104,20 +386,17 @@ class DB(AbstractData):
         :param ticket_id: The ID of the ticket.
         :return: True if the ticket ID exists, False otherwise.
         """
-        query = "SELECT * FROM ticket WHERE id = %s AND state != %s"
         data = (ticket_id, State.CLOSED.value)
-        result = self.database_connection.fetchone(query, data)
+        result = self.database_connection.fetchone("id_exists", data)
         return result is not None
 
-    def create_ticket(self, ticket):
+    def create_ticket(self, ticket) -> Ticket:
         """
         Create a new ticket in the database.
 
         :param ticket: A Ticket object to be created in the database.
-        """
-        query = """
-            INSERT INTO ticket (id, name, description, ticket_type, state, responsible)
-            VALUES (%s, %s, %s, %s, %s, %s);
+        :return: The created Ticket object as stored, with the creation date set
+            by the database.
         """
         data = (
             ticket.id,
@@ -127,22 +406,18 @@ class DB(AbstractData):
             ticket.state.value,
             ticket.responsible.value,
         )
-        self.database_connection.execute(query, data)
+        result = self.database_connection.execute_returning("create_ticket", data)
+        return self.data_to_ticket(result[0])
 
     def update_ticket(self, ticket):
         """
         Update an existing ticket in the database.
 
+        The existence check and the update run as a single conditional statement.
+
         :param ticket: A Ticket object with updated data.
         :return: True if the ticket was updated, False otherwise.
         """
-        if not self.id_exists(ticket.id):
-            return False
-        query = """
-            UPDATE ticket 
-            SET name = %s, description = %s, ticket_type = %s, state = %s, responsible = %s
-            WHERE id = %s
-        """
         data = (
             ticket.name,
             ticket.details,
@@ -150,28 +425,238 @@ class DB(AbstractData):
             ticket.state.value,
             ticket.responsible.value,
             ticket.id,
+            State.CLOSED.value,
         )
-        self.database_connection.execute(query, data)
-        return True
+        result = self.database_connection.execute_returning("update_ticket", data)
+        return len(result) > 0
 
     def close_ticket(self, ticket) -> bool:
         """
         Close an existing ticket in the database.
 
+        The existence check and the update run as a single conditional statement.
+
         :param ticket: A Ticket object to be closed.
         :return: True if the ticket was closed, False otherwise.
         """
-        if not self.id_exists(ticket.id):
-            return False
+        data = (State.CLOSED.value, ticket.id, State.CLOSED.value)
+        result = self.database_connection.execute_returning("close_ticket", data)
+        return len(result) > 0
+
+    def get_tickets(self, ticket_ids) -> list[Optional[Ticket]]:
+        """
+        Get several open tickets from the database with a single query.
+
+        :param ticket_ids: An iterable of ticket IDs.
+        :return: A list holding, for each ID in order, its Ticket or None.
+        """
+        ticket_ids = list(ticket_ids)
+        if not ticket_ids:
+            return []
+        data = (ticket_ids, State.CLOSED.value)
+        result = self.database_connection.fetch("get_tickets", data)
+        tickets = {row[0]: self.data_to_ticket(row) for row in result}
+        return [tickets.get(ticket_id) for ticket_id in ticket_ids]
+
+    def create_tickets(self, tickets) -> list[bool]:
+        """
+        Create several tickets in the database in a single transaction.
+
+        :param tickets: An iterable of the Ticket objects to create.
+        :return: A list telling for each ticket if it was created, in order.
+        """
+        tickets = list(tickets)
+        rows = {}
+        for ticket in tickets:
+            rows.setdefault(
+                ticket.id,
+                (
+                    ticket.id,
+                    ticket.name,
+                    ticket.details,
+                    ticket.type.value,
+                    ticket.state.value,
+                    ticket.responsible.value,
+                ),
+            )
         query = """
-            UPDATE ticket 
-            SET state = %s
-            WHERE id = %s
+            INSERT INTO ticket (id, name, description, ticket_type, state, responsible)
+            VALUES %s
+            ON CONFLICT (id) DO NOTHING
+            RETURNING id
+        """
+        result = self.database_connection.execute_values(query, list(rows.values()))
+        return self._first_occurrences(tickets, {row[0] for row in result})
+
+    def update_tickets(self, tickets) -> list[bool]:
+        """
+        Update several open tickets in the database in a single transaction.
+
+        :param tickets: An iterable of the Ticket objects with updated data.
+        :return: A list telling for each ticket if it was updated, in order. A
+            ticket appearing twice is only updated by its first occurrence.
+        """
+        tickets = list(tickets)
+        rows = {}
+        for ticket in tickets:
+            rows.setdefault(
+                ticket.id,
+                (
+                    ticket.id,
+                    ticket.name,
+                    ticket.details,
+                    ticket.type.value,
+                    ticket.state.value,
+                    ticket.responsible.value,
+                    State.CLOSED.value,
+                ),
+            )
+        query = """
+            UPDATE ticket t
+            SET name = v.name, description = v.description, ticket_type = v.ticket_type,
+            state = v.state, responsible = v.responsible
+            FROM (VALUES %s)
+            AS v (id, name, description, ticket_type, state, responsible, closed)
+            WHERE t.id = v.id AND t.state != v.closed
+            RETURNING t.id
+        """
+        result = self.database_connection.execute_values(query, list(rows.values()))
+        return self._first_occurrences(tickets, {row[0] for row in result})
+
+    def close_tickets(
+        self, tickets, only_responsible: Optional[Responsible] = None
+    ) -> list[bool]:
+        """
+        Close several open tickets in the database with a single conditional statement.
+
+        :param tickets: An iterable of the Ticket objects to close.
+        :param only_responsible: If given, a ticket is only closed if it is
+            currently assigned to this responsible.
+        :return: A list telling for each ticket if it was closed, in order.
+        """
+        tickets = list(tickets)
+        if not tickets:
+            return []
+        data = (
+            State.CLOSED.value,
+            list({ticket.id: None for ticket in tickets}),
+            State.CLOSED.value,
+        )
+        name = "close_tickets"
+        if only_responsible is not None:
+            name = "close_tickets_only_responsible"
+            data += (only_responsible.value,)
+        result = self.database_connection.execute_returning(name, data)
+        return self._first_occurrences(tickets, {row[0] for row in result})
+
+    @staticmethod
+    def _first_occurrences(tickets, ticket_ids) -> list[bool]:
+        """
+        Tell for each ticket if its ID is in a set and appears for the first time.
+
+        :param tickets: A list of tickets.
+        :param ticket_ids: A set of ticket IDs.
+        :return: A list of booleans, one per ticket.
+        """
+        seen = set()
+        results = []
+        for ticket in tickets:
+            results.append(ticket.id in ticket_ids and ticket.id not in seen)
+            seen.add(ticket.id)
+        return results
+
+    def set_ticket_state(
+        self,
+        ticket_id,
+        state: State,
+        responsible: Optional[Responsible] = None,
+        only_responsible: Optional[Responsible] = None,
+    ) -> Optional[Ticket]:
+        """
+        Change the state, and optionally the responsible, of an open ticket
+        with a single conditional UPDATE returning the changed row.
+
+        :param ticket_id: The ID of the ticket.
+        :param state: The new state of the ticket.
+        :param responsible: The new responsible of the ticket, or None to keep it.
+        :param only_responsible: If given, the ticket is only changed if it is
+            currently assigned to this responsible.
+        :return: The changed Ticket object, or None if no open ticket matched.
+        """
+        name, data = set_state_query(ticket_id, state, responsible, only_responsible)
+        result = self.database_connection.execute_returning(name, data)
+        if result:
+            return self.data_to_ticket(result[0])
+        return None
+
+    @staticmethod
+    def _filter_query(
+        state: Optional[State] = None,
+        responsible: Optional[Responsible] = None,
+        ticket_type: Optional[Type] = None,
+    ) -> tuple[str, tuple]:
+        """
+        Build the query selecting the open tickets matching all the given criteria.
+
+        :param state: The state to filter on, or None to accept any state.
+        :param responsible: The responsible to filter on, or None to accept any.
+        :param ticket_type: The type to filter on, or None to accept any type.
+        :return: A tuple of the query and its data.
+        """
+        query = """
+            SELECT t.id,t.name,t.description,t.ticket_type,t.state,t.responsible,t.date_created 
+            FROM ticket t 
+            WHERE t.state != %s"""
+        data = [State.CLOSED.value]
+        if state is not None:
+            query += " AND t.state = %s"
+            data.append(state.value)
+        if responsible is not None:
+            query += " AND t.responsible = %s"
+            data.append(responsible.value)
+        if ticket_type is not None:
+            query += " AND t.ticket_type = %s"
+            data.append(ticket_type.value)
+        return query, tuple(data)
+
+    def filter_tickets(
+        self,
+        state: Optional[State] = None,
+        responsible: Optional[Responsible] = None,
+        ticket_type: Optional[Type] = None,
+    ) -> list[Ticket]:
+        """
+        Get the open tickets matching all the given criteria.
+
+        :param state: The state to filter on, or None to accept any state.
+        :param responsible: The responsible to filter on, or None to accept any.
+        :param ticket_type: The type to filter on, or None to accept any type.
+        :return: A list of Ticket objects.
         """
-        data = (State.CLOSED.value, ticket.id)
-        self.database_connection.execute(query, data)
+        query, data = self._filter_query(state, responsible, ticket_type)
+        result = self.database_connection.fetch(query, data)
+        result = self.data_to_tickets(result)
+        return result
 
-        return True
+    def stream_filter_tickets(
+        self,
+        state: Optional[State] = None,
+        responsible: Optional[Responsible] = None,
+        ticket_type: Optional[Type] = None,
+        itersize=None,
+    ) -> Iterator[Ticket]:
+        """
+        Get the open tickets matching all the given criteria, streaming the results.
+
+        :param state: The state to filter on, or None to accept any state.
+        :param responsible: The responsible to filter on, or None to accept any.
+        :param ticket_type: The type to filter on, or None to accept any type.
+        :param itersize: The number of rows fetched per round trip, or None for the default.
+        :return: A generator of Ticket objects.
+        """
+        query, data = self._filter_query(state, responsible, ticket_type)
+        for row in self.database_connection.stream(query, data, itersize):
+            yield self.data_to_ticket(row)
 
     def get_old_new_ticket(self) -> list[Ticket]:
         """
@@ -219,3 +704,106 @@ class DB(AbstractData):
         result = self.database_connection.fetch(query)
         result = self.data_to_tickets(result)
         return result
+
+    def get_tar_3(self) -> dict[str, list[Ticket]]:
+        """
+        Get the three lists of old tickets of the TAR-3 report with a single query.
+
+        Each returned row carries one flag per list it belongs to, so the table is
+        scanned once instead of once per list.
+
+        :return: A dictionary with the "new", "assigned" and "all" lists, oldest first.
+        """
+        query = """
+            SELECT t.id,t.name,t.description,t.ticket_type,t.state,t.responsible,t.date_created,
+                (t.state = %s AND t.date_created < NOW() - '3 days'::interval),
+                (t.state = %s AND t.date_created < NOW() - '10 days'::interval),
+                (t.date_created < NOW() - '20 days'::interval)
+            FROM ticket t 
+            WHERE (t.state = %s AND t.date_created < NOW() - '3 days'::interval)
+            OR (t.state = %s AND t.date_created < NOW() - '10 days'::interval)
+            OR t.date_created < NOW() - '20 days'::interval
+            ORDER BY t.date_created, t.id
+        """
+        data = (
+            State.NEW.value,
+            State.ASSIGNED.value,
+            State.NEW.value,
+            State.ASSIGNED.value,
+        )
+        tar_3 = {"new": [], "assigned": [], "all": []}
+        for row in self.database_connection.fetch(query, data):
+            ticket = self.data_to_ticket(row)
+            for bucket, flag in zip(("new", "assigned", "all"), row[7:]):
+                if flag:
+                    tar_3[bucket].append(ticket)
+        return tar_3
+
+    def stream_tar_3(self, bucket, itersize=None) -> Iterator[Ticket]:
+        """
+        Stream a list of the TAR-3 report, ordered by creation date then id.
+
+        This is the streaming variant of get_old_new_ticket ("new"),
+        get_old_assigned_ticket ("assigned") and get_old_ticket_list ("all").
+
+        :param bucket: The list to stream: "new", "assigned" or "all".
+        :param itersize: The number of rows fetched per round trip, or None for the default.
+        :return: A generator of Ticket objects.
+        """
+        condition, data = TAR_3_CONDITIONS[bucket]
+        query = f"""
+            SELECT t.id,t.name,t.description,t.ticket_type,t.state,t.responsible,t.date_created 
+            FROM ticket t 
+            WHERE {condition}
+            ORDER BY t.date_created, t.id
+        """
+        for row in self.database_connection.stream(query, data, itersize):
+            yield self.data_to_ticket(row)
+
+    def count_tar_3(self) -> dict[str, int]:
+        """
+        Count the tickets of each list of the TAR-3 report with a single aggregate query.
+
+        :return: A dictionary with the number of "new", "assigned" and "all" tickets.
+        """
+        counts = ",".join(
+            f"count(*) FILTER (WHERE {condition})"
+            for condition, _ in TAR_3_CONDITIONS.values()
+        )
+        # Every list only holds tickets at least 3 days old.
+        query = f"""
+            SELECT {counts}
+            FROM ticket t 
+            WHERE t.date_created < NOW() - '3 days'::interval
+        """
+        data = tuple(
+            value for _, values in TAR_3_CONDITIONS.values() for value in values
+        )
+        result = self.database_connection.fetchone(query, data)
+        return dict(zip(TAR_3_CONDITIONS, result))
+
+    def get_tar_3_page(
+        self, bucket, cursor=None, limit=PAGE_SIZE
+    ) -> tuple[list[Ticket], Optional[tuple]]:
+        """
+        Get one page of a list of the TAR-3 report, ordered by creation date then id.
+
+        :param bucket: The list to get a page of: "new", "assigned" or "all".
+        :param cursor: The cursor returned with the previous page, or None for the first page.
+        :param limit: The maximum number of tickets in the page.
+        :return: A tuple of the tickets of the page and the cursor of the next page,
+            or None if this page is the last one.
+        """
+        condition, data = TAR_3_CONDITIONS[bucket]
+        query = f"""
+            SELECT t.id,t.name,t.description,t.ticket_type,t.state,t.responsible,t.date_created 
+            FROM ticket t 
+            WHERE {condition}
+        """
+        return self._page(query, data, cursor, limit)
+
+    def flush(self):
+        """
+        Commit the writes grouped by the database connection, if any.
+        """
+        self.database_connection.flush()
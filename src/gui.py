@@ -469,11 +469,22 @@ class GUI(AbstractInterface):
     @staticmethod
     def print_ticket_list(tickets, keyword=None):
         """
-        Display a list of tickets.
+        Display a list of tickets, one at a time.
+
+        The tickets are only read by position, so a list fetched page by page only
+        fetches the pages the user navigates to.
 
         :param tickets: The tickets to be displayed.
         :param keyword: The keyword used to search the tickets (optional).
         """
+
+        def has_ticket(index):
+            try:
+                tickets[index]
+            except IndexError:
+                return False
+            return True
+
         current_ticket = 0
         layout = [
             [sg.Text("Ticket Management System", size=(30, 1), font=("Helvetica", 25))],
@@ -484,21 +495,34 @@ class GUI(AbstractInterface):
                     font=("Helvetica", 20),
                 )
             ],
-            [sg.Text("Ticket-ID: "), sg.Text(tickets[current_ticket].id)],
-            [sg.Text("Customer name: "), sg.Text(tickets[current_ticket].name)],
-            [sg.Text("Case description: "), sg.Text(tickets[current_ticket].details)],
-            [sg.Text("Case type: "), sg.Text(tickets[current_ticket].type.value)],
-            [sg.Text("State: "), sg.Text(tickets[current_ticket].state.value)],
+            [sg.Text("Ticket-ID: "), sg.Text(tickets[current_ticket].id, key="id")],
+            [
+                sg.Text("Customer name: "),
+                sg.Text(tickets[current_ticket].name, key="name"),
+            ],
+            [
+                sg.Text("Case description: "),
+                sg.Text(tickets[current_ticket].details, key="details"),
+            ],
+            [
+                sg.Text("Case type: "),
+                sg.Text(tickets[current_ticket].type.value, key="type"),
+            ],
+            [
+                sg.Text("State: "),
+                sg.Text(tickets[current_ticket].state.value, key="state"),
+            ],
             [
                 sg.Text("Responsible: "),
-                sg.Text(tickets[current_ticket].responsible.value),
+                sg.Text(tickets[current_ticket].responsible.value, key="responsible"),
             ],
-            [sg.Text("Date created: "), sg.Text(tickets[current_ticket].date)],
             [
-                sg.Button("Previous", key="previous", disabled=current_ticket == 0),
-                sg.Button(
-                    "Next", key="next", disabled=current_ticket == len(tickets) - 1
-                ),
+                sg.Text("Date created: "),
+                sg.Text(tickets[current_ticket].date, key="date"),
+            ],
+            [
+                sg.Button("Previous", key="previous", disabled=True),
+                sg.Button("Next", key="next", disabled=not has_ticket(1)),
             ],
             [sg.Button("Close", key="close")],
         ]
@@ -509,12 +533,23 @@ class GUI(AbstractInterface):
             event, values = window.read()
             if event in (sg.WIN_CLOSED, "close"):
                 running = False
+                continue
             elif event == "previous":
                 if current_ticket > 0:
                     current_ticket -= 1
             elif event == "next":
-                if current_ticket < len(tickets) - 1:
+                if has_ticket(current_ticket + 1):
                     current_ticket += 1
+            ticket = tickets[current_ticket]
+            window["id"].update(ticket.id)
+            window["name"].update(ticket.name)
+            window["details"].update(ticket.details)
+            window["type"].update(ticket.type.value)
+            window["state"].update(ticket.state.value)
+            window["responsible"].update(ticket.responsible.value)
+            window["date"].update(ticket.date)
+            window["previous"].update(disabled=current_ticket == 0)
+            window["next"].update(disabled=not has_ticket(current_ticket + 1))
 
         window.close()
 
@@ -0,0 +1,401 @@
+import threading
+from typing import Optional
+
+from src.abstract_data import AbstractData
+from src.backlog import Backlog
+from src.constants import PAGE_SIZE, State, Responsible, Type
+from src.ticket import Ticket
+
+
+class HybridData(AbstractData):
+    """
+    A data source keeping every open ticket of a durable data source in an
+    in-memory Backlog.
+
+    The open tickets are loaded once, then every read is answered by the Backlog
+    and its indexes. Every write goes to the durable data source first and is
+    applied to the Backlog only once accepted there, so the tickets in memory
+    never hold a write the durable data source rejected. get_ticket and
+    get_tickets return copies, since callers change the tickets they read before
+    writing them.
+
+    The writes of other processes are applied with refresh, which can be given to
+    a TicketListener.
+    """
+
+    def __init__(self, durable: AbstractData, hot: Optional[Backlog] = None):
+        """
+        Load the open tickets of a durable data source in memory.
+
+        :param durable: The data source every write goes to, such as DB.
+        :param hot: The empty Backlog to keep the open tickets in, or None for a
+            new one.
+        """
+        self.durable = durable
+        self.hot = Backlog() if hot is None else hot
+        # Held while writing, so a refresh is not applied between a write to the
+        # durable data source and its application in memory.
+        self._lock = threading.RLock()
+        self.load()
+
+    def load(self):
+        """
+        Replace the tickets in memory with the open tickets of the durable data
+        source.
+        """
+        with self._lock:
+            self.hot.tickets = self.durable.filter_tickets()
+
+    def refresh(self, ticket_ids=None):
+        """
+        Read some tickets again from the durable data source.
+
+        :param ticket_ids: An iterable of the IDs of the tickets, or None to load
+            every open ticket again.
+        """
+        if ticket_ids is None:
+            self.load()
+            return
+        ticket_ids = list(ticket_ids)
+        with self._lock:
+            tickets = self.durable.get_tickets(ticket_ids)
+            self._discard(
+                ticket_id
+                for ticket_id, ticket in zip(ticket_ids, tickets)
+                if ticket is None
+            )
+            self._apply(ticket for ticket in tickets if ticket is not None)
+
+    def _apply(self, tickets):
+        """
+        Apply tickets accepted by the durable data source to the tickets in memory.
+
+        Must be called with the lock held.
+
+        :param tickets: An iterable of the tickets as written, copied. The closed
+            ones are removed from memory.
+        """
+        closed, created, replaced, changed = [], [], [], []
+        for ticket in tickets:
+            if ticket.state == State.CLOSED:
+                closed.append(ticket.id)
+                continue
+            ticket = ticket.copy()
+            stored = self.hot.get_ticket(ticket.id)
+            if stored is None:
+                created.append(ticket)
+            elif (stored.name, stored.details, stored.type, stored.timestamp) != (
+                ticket.name,
+                ticket.details,
+                ticket.type,
+                ticket.timestamp,
+            ):
+                # The Backlog only updates the state and the responsible.
+                replaced.append(ticket)
+            elif (stored.state, stored.responsible) != (
+                ticket.state,
+                ticket.responsible,
+            ):
+                changed.append(ticket)
+        self._discard(closed)
+        self.hot.replace_tickets(replaced)
+        self.hot.create_tickets(created)
+        self.hot.update_tickets(changed)
+
+    def _discard(self, ticket_ids):
+        """
+        Remove tickets from memory.
+
+        Must be called with the lock held.
+
+        :param ticket_ids: An iterable of the IDs of the tickets.
+        """
+        tickets = [
+            ticket for ticket in self.hot.get_tickets(ticket_ids) if ticket is not None
+        ]
+        for ticket in tickets:
+            ticket.state = State.CLOSED
+        self.hot.close_tickets(tickets)
+
+    def search_tickets(self, keyword) -> list[Ticket]:
+        """
+        Search for tickets in memory using a keyword.
+
+        :param keyword: The keyword to search for.
+        :return: A list of Ticket objects that match the keyword.
+        """
+        with self._lock:
+            return self.hot.search_tickets(keyword)
+
+    def search_tickets_page(
+        self, keyword, cursor=None, limit=PAGE_SIZE
+    ) -> tuple[list[Ticket], Optional[tuple]]:
+        """
+        Get one page of the open tickets in memory matching a keyword.
+
+        :param keyword: The keyword to search for.
+        :param cursor: The cursor returned with the previous page, or None for the first page.
+        :param limit: The maximum number of tickets in the page.
+        :return: A tuple of the tickets of the page and the cursor of the next page,
+            or None if this page is the last one.
+        """
+        with self._lock:
+            return self.hot.search_tickets_page(keyword, cursor, limit)
+
+    def get_ticket(self, ticket_id) -> Optional[Ticket]:
+        """
+        Get a copy of a ticket in memory by its ID.
+
+        :param ticket_id: The ID of the ticket.
+        :return: The Ticket object with the given ID, or None if no such ticket exists.
+        """
+        with self._lock:
+            ticket = self.hot.get_ticket(ticket_id)
+            return None if ticket is None else ticket.copy()
+
+    def id_exists(self, ticket_id) -> bool:
+        """
+        Check if a ticket ID exists in memory.
+
+        :param ticket_id: The ID of the ticket.
+        :return: True if the ticket ID exists, False otherwise.
+        """
+        with self._lock:
+            return self.hot.id_exists(ticket_id)
+
+    def create_ticket(self, ticket) -> Optional[Ticket]:
+        """
+        Create a new ticket in the durable data source, then in memory.
+
+        The ticket kept in memory is the one returned by the durable data source,
+        so it has the creation date of the durable data source.
+
+        :param ticket: The Ticket object to create.
+        :return: The ticket as stored by the durable data source, or None if an
+            open ticket has the same ID or the durable data source rejected it.
+        """
+        with self._lock:
+            if self.hot.id_exists(ticket.id):
+                return None
+            created = self.durable.create_ticket(ticket)
+            if not created:
+                return None
+            self._apply([created])
+            return created
+
+    def update_ticket(self, ticket) -> bool:
+        """
+        Update an open ticket in the durable data source, then in memory.
+
+        :param ticket: The Ticket object with updated data.
+        :return: True if the ticket was updated, False otherwise.
+        """
+        with self._lock:
+            if self.durable.update_ticket(ticket):
+                self._apply([ticket])
+                return True
+            # The ticket was closed by another process.
+            self._discard([ticket.id])
+            return False
+
+    def close_ticket(self, ticket) -> bool:
+        """
+        Close an open ticket in the durable data source, then in memory.
+
+        :param ticket: The Ticket object to close.
+        :return: True if the ticket was closed, False otherwise.
+        """
+        with self._lock:
+            closed = self.durable.close_ticket(ticket)
+            self._discard([ticket.id])
+            return closed
+
+    def get_tickets(self, ticket_ids) -> list[Optional[Ticket]]:
+        """
+        Get copies of several tickets in memory by their IDs.
+
+        :param ticket_ids: An iterable of ticket IDs.
+        :return: A list holding, for each ID in order, its Ticket or None.
+        """
+        with self._lock:
+            return [
+                None if ticket is None else ticket.copy()
+                for ticket in self.hot.get_tickets(ticket_ids)
+            ]
+
+    def create_tickets(self, tickets) -> list[bool]:
+        """
+        Create several tickets in the durable data source, then in memory.
+
+        :param tickets: An iterable of the Ticket objects to create.
+        :return: A list telling for each ticket if it was created, in order.
+        """
+        tickets = list(tickets)
+        with self._lock:
+            results = self.durable.create_tickets(tickets)
+            created = [ticket.id for ticket, result in zip(tickets, results) if result]
+            if created:
+                # Read back, so the tickets in memory have the creation dates of
+                # the durable data source.
+                self._apply(
+                    ticket
+                    for ticket in self.durable.get_tickets(created)
+                    if ticket is not None
+                )
+            return results
+
+    def update_tickets(self, tickets) -> list[bool]:
+        """
+        Update several open tickets in the durable data source, then in memory.
+
+        The tickets the durable data source did not find open are removed from
+        memory, since they were closed by another process.
+
+        :param tickets: An iterable of the Ticket objects with updated data.
+        :return: A list telling for each ticket if it was updated, in order.
+        """
+        tickets = list(tickets)
+        with self._lock:
+            results = self.durable.update_tickets(tickets)
+            self._apply(ticket for ticket, updated in zip(tickets, results) if updated)
+            self._discard(
+                ticket.id for ticket, updated in zip(tickets, results) if not updated
+            )
+            return results
+
+    def close_tickets(
+        self, tickets, only_responsible: Optional[Responsible] = None
+    ) -> list[bool]:
+        """
+        Close several open tickets in the durable data source, then in memory.
+
+        The tickets the durable data source did not close are read again, since
+        another process closed or reassigned them.
+
+        :param tickets: An iterable of the Ticket objects to close.
+        :param only_responsible: If given, a ticket is only closed if it is
+            currently assigned to this responsible.
+        :return: A list telling for each ticket if it was closed, in order.
+        """
+        tickets = list(tickets)
+        with self._lock:
+            results = self.durable.close_tickets(tickets, only_responsible)
+            self._discard(
+                ticket.id for ticket, closed in zip(tickets, results) if closed
+            )
+            kept = [ticket.id for ticket, closed in zip(tickets, results) if not closed]
+            if kept:
+                self.refresh(kept)
+            return results
+
+    def set_ticket_state(
+        self,
+        ticket_id,
+        state: State,
+        responsible: Optional[Responsible] = None,
+        only_responsible: Optional[Responsible] = None,
+    ) -> Optional[Ticket]:
+        """
+        Change the state, and optionally the responsible, of an open ticket in the
+        durable data source, then in memory.
+
+        :param ticket_id: The ID of the ticket.
+        :param state: The new state of the ticket.
+        :param responsible: The new responsible of the ticket, or None to keep it.
+        :param only_responsible: If given, the ticket is only changed if it is
+            currently assigned to this responsible.
+        :return: The changed Ticket object, or None if no open ticket matched.
+        """
+        with self._lock:
+            ticket = self.durable.set_ticket_state(
+                ticket_id, state, responsible, only_responsible
+            )
+            if ticket is None:
+                # The ticket may have been changed by another process.
+                self.refresh([ticket_id])
+            else:
+                self._apply([ticket])
+            return ticket
+
+    def filter_tickets(
+        self,
+        state: Optional[State] = None,
+        responsible: Optional[Responsible] = None,
+        ticket_type: Optional[Type] = None,
+    ) -> list[Ticket]:
+        """
+        Get the open tickets in memory matching all the given criteria.
+
+        :param state: The state to filter on, or None to accept any state.
+        :param responsible: The responsible to filter on, or None to accept any.
+        :param ticket_type: The type to filter on, or None to accept any type.
+        :return: A list of Ticket objects.
+        """
+        with self._lock:
+            return self.hot.filter_tickets(state, responsible, ticket_type)
+
+    def get_old_new_ticket(self) -> list[Ticket]:
+        """
+        Get a list of NEW stated tickets in memory older than 3 days.
+
+        :return: A list of Ticket objects.
+        """
+        with self._lock:
+            return self.hot.get_old_new_ticket()
+
+    def get_old_assigned_ticket(self) -> list[Ticket]:
+        """
+        Get a list of ASSIGNED stated tickets in memory older than 10 days.
+
+        :return: A list of Ticket objects.
+        """
+        with self._lock:
+            return self.hot.get_old_assigned_ticket()
+
+    def get_old_ticket_list(self) -> list[Ticket]:
+        """
+        Get a list of tickets in memory older than 20 days.
+
+        :return: A list of Ticket objects.
+        """
+        with self._lock:
+            return self.hot.get_old_ticket_list()
+
+    def get_tar_3(self) -> dict[str, list[Ticket]]:
+        """
+        Get the three lists of old tickets of the TAR-3 report from memory.
+
+        :return: A dictionary with the "new", "assigned" and "all" lists.
+        """
+        with self._lock:
+            return self.hot.get_tar_3()
+
+    def count_tar_3(self) -> dict[str, int]:
+        """
+        Count the tickets in memory of each list of the TAR-3 report.
+
+        :return: A dictionary with the number of "new", "assigned" and "all" tickets.
+        """
+        with self._lock:
+            return self.hot.count_tar_3()
+
+    def get_tar_3_page(
+        self, bucket, cursor=None, limit=PAGE_SIZE
+    ) -> tuple[list[Ticket], Optional[tuple]]:
+        """
+        Get one page of a list of the TAR-3 report from memory.
+
+        :param bucket: The list to get a page of: "new", "assigned" or "all".
+        :param cursor: The cursor returned with the previous page, or None for the first page.
+        :param limit: The maximum number of tickets in the page.
+        :return: A tuple of the tickets of the page and the cursor of the next page,
+            or None if this page is the last one.
+        """
+        with self._lock:
+            return self.hot.get_tar_3_page(bucket, cursor, limit)
+
+    def flush(self):
+        """
+        Write the writes kept back by the durable data source, if any.
+        """
+        self.durable.flush()
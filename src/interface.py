@@ -232,8 +232,10 @@ class Interface(AbstractInterface):
         :param tickets: The tickets that match the keyword.
         """
         print("Searched keyword: ", keyword)
+        total = 0
         for ticket in tickets:
             self.print_one_ticket(ticket)
             print("-----------------------")
-        print("Total tickets: ", len(tickets))
+            total += 1
+        print("Total tickets: ", total)
         print("=======================")
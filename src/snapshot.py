@@ -0,0 +1,255 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+from typing import Iterator, Optional
+
+from src.column_store import (
+    STATES,
+    RESPONSIBLES,
+    TYPES,
+    STATE_CODES,
+    RESPONSIBLE_CODES,
+    TYPE_CODES,
+)
+from src.constants import State
+from src.ticket import Ticket
+
+MAGIC = b"TMSSNAP1"
+# The magic, the byte order of the columns, padded, and the number of rows.
+HEADER = struct.Struct("<8s8sQ")
+CLOSED_CODE = STATE_CODES[State.CLOSED]
+
+
+def write_snapshot(path, tickets):
+    """
+    Write tickets to a snapshot file, replacing it at once.
+
+    After the header come the columns: the 64 bits creation timestamps, the 64
+    bits offsets of the ID, name and details of each row in the string heap, the
+    rows ordered by ID, and the one byte type, state and responsible codes. The
+    UTF-8 string heap ends the file.
+
+    :param path: The path of the snapshot file.
+    :param tickets: An iterable of tickets, stored as rows in order.
+    """
+    tickets = list(tickets)
+    timestamps = array("q")
+    offsets = array("Q", [0])
+    heap = bytearray()
+    types = bytearray()
+    states = bytearray()
+    responsibles = bytearray()
+    for ticket in tickets:
+        timestamps.append(ticket.get_timestamp())
+        for text in (ticket.id, ticket.name, ticket.details):
+            heap += text.encode()
+            offsets.append(len(heap))
+        types.append(TYPE_CODES[ticket.type])
+        states.append(STATE_CODES[ticket.state])
+        responsibles.append(RESPONSIBLE_CODES[ticket.responsible])
+    # UTF-8 keeps the order of the strings, so the rows can be searched by the
+    # bytes of their ID. An open ticket comes before the closed ones with its ID.
+    order = array(
+        "Q",
+        sorted(
+            range(len(tickets)),
+            key=lambda row: (tickets[row].id, tickets[row].state == State.CLOSED),
+        ),
+    )
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, sys.byteorder.encode(), len(tickets)))
+        for column in (timestamps, offsets, order, types, states, responsibles, heap):
+            file.write(column)
+    os.replace(temporary_path, path)
+
+
+class Snapshot(Sequence):
+    """
+    A read-only sequence of the tickets of a snapshot file, mapped in memory.
+
+    Opening a snapshot only reads its header: the columns are views of the mapped
+    file, and a ticket is decoded when it is accessed, so a large snapshot opens
+    at once. Tickets are found by ID with a binary search in the rows ordered by
+    ID.
+    """
+
+    def __init__(self, path):
+        """
+        Map a snapshot file in memory.
+
+        :param path: The path of the snapshot file, written by write_snapshot.
+        :raises ValueError: If the file is not a snapshot, is truncated, or was
+            written with another byte order.
+        """
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views = []
+        try:
+            magic, byteorder, count = HEADER.unpack_from(self._mmap)
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a ticket snapshot")
+            if byteorder.rstrip(b"\0") != sys.byteorder.encode():
+                raise ValueError(f"{path} was written with another byte order")
+            # The columns before the string heap take 43 bytes per row, plus the
+            # last offset.
+            if len(self._mmap) < HEADER.size + count * 43 + 8:
+                raise ValueError(f"{path} is truncated")
+        except (ValueError, struct.error):
+            self._mmap.close()
+            raise
+        self._count = count
+        self._position = HEADER.size
+        self._timestamps = self._column(count * 8, "q")
+        self._offsets = self._column((3 * count + 1) * 8, "Q")
+        self._order = self._column(count * 8, "Q")
+        self._types = self._column(count)
+        self._states = self._column(count)
+        self._responsibles = self._column(count)
+        self._heap = self._column(len(self._mmap) - self._position)
+        if self._offsets[-1] > len(self._heap):
+            self.close()
+            raise ValueError(f"{path} is truncated")
+
+    def _column(self, size, format=None) -> memoryview:
+        """
+        Get a view of the next column of the file.
+
+        :param size: The size of the column in bytes.
+        :param format: The format of the items of the column, or None for bytes.
+        :return: A view of the column.
+        """
+        view = memoryview(self._mmap)[self._position : self._position + size]
+        self._views.append(view)
+        self._position += size
+        if format is not None:
+            view = view.cast(format)
+            self._views.append(view)
+        return view
+
+    def close(self):
+        """
+        Unmap the file. The tickets already decoded stay valid.
+        """
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._mmap.close()
+
+    def __enter__(self):
+        """
+        Use the snapshot as a context manager closing it on exit.
+
+        :return: The snapshot.
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Close the snapshot.
+        """
+        self.close()
+
+    def __len__(self):
+        """
+        Get the number of rows, open and closed tickets.
+
+        :return: The number of rows.
+        """
+        return self._count
+
+    def _text(self, index) -> str:
+        """
+        Decode a string of the heap.
+
+        :param index: The index of the string: 3 times the row, plus 0 for the ID,
+            1 for the name or 2 for the details.
+        :return: The string.
+        """
+        return str(self._heap[self._offsets[index] : self._offsets[index + 1]], "utf-8")
+
+    def __getitem__(self, row) -> Ticket:
+        """
+        Decode the ticket of a row.
+
+        :param row: The index of the row, negative to count from the end.
+        :return: A new Ticket object.
+        :raises IndexError: If there is no such row.
+        """
+        if row < 0:
+            row += self._count
+        if not 0 <= row < self._count:
+            raise IndexError(row)
+        return Ticket(
+            self._text(3 * row),
+            self._text(3 * row + 1),
+            self._text(3 * row + 2),
+            TYPES[self._types[row]],
+            STATES[self._states[row]],
+            RESPONSIBLES[self._responsibles[row]],
+            self._timestamps[row],
+        )
+
+    def __iter__(self) -> Iterator[Ticket]:
+        """
+        Decode the tickets of every row in order.
+
+        The columns are copied at once, which is faster than decoding the rows
+        one by one from the mapped file.
+
+        :return: An iterator of new Ticket objects.
+        """
+        heap = bytes(self._heap)
+        offsets = self._offsets.tolist()
+        for row, (ticket_type, state, responsible, timestamp) in enumerate(
+            zip(
+                bytes(self._types),
+                bytes(self._states),
+                bytes(self._responsibles),
+                self._timestamps.tolist(),
+            )
+        ):
+            start, name, details, end = offsets[3 * row : 3 * row + 4]
+            yield Ticket(
+                heap[start:name].decode(),
+                heap[name:details].decode(),
+                heap[details:end].decode(),
+                TYPES[ticket_type],
+                STATES[state],
+                RESPONSIBLES[responsible],
+                timestamp,
+            )
+
+    def _id(self, row) -> bytes:
+        """
+        Get the ID of a row without decoding it.
+
+        :param row: The index of the row.
+        :return: The UTF-8 bytes of the ID.
+        """
+        return bytes(self._heap[self._offsets[3 * row] : self._offsets[3 * row + 1]])
+
+    def get(self, ticket_id) -> Optional[Ticket]:
+        """
+        Find an open ticket by its ID.
+
+        :param ticket_id: The ID of the ticket.
+        :return: A new Ticket object, or None if no open ticket has this ID.
+        """
+        key = ticket_id.encode()
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._id(self._order[middle]) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low == self._count:
+            return None
+        row = self._order[low]
+        if self._id(row) != key or self._states[row] == CLOSED_CODE:
+            return None
+        return self[row]
@@ -1,11 +1,51 @@
 import datetime
 
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+EPOCH = datetime.datetime(1970, 1, 1)
+SECOND = datetime.timedelta(seconds=1)
+
+
+def to_timestamp(date):
+    """
+    Convert a date to a timestamp.
+
+    Timestamps are whole seconds counted from 1970-01-01 on the same naive local
+    clock as the date, so differences between timestamps match date differences.
+
+    :param date: The datetime to convert.
+    :return: The timestamp of the date.
+    """
+    return (date - EPOCH) // SECOND
+
+
+def from_timestamp(timestamp):
+    """
+    Convert a timestamp back to a date.
+
+    :param timestamp: The timestamp to convert.
+    :return: The datetime of the timestamp.
+    """
+    return EPOCH + datetime.timedelta(seconds=timestamp)
+
 
 class Ticket:
     """
     A class to represent a Ticket.
+
+    Tickets use slots instead of a per-instance dictionary to keep large
+    in-memory backlogs compact.
     """
 
+    __slots__ = (
+        "id",
+        "name",
+        "details",
+        "timestamp",
+        "type",
+        "state",
+        "responsible",
+    )
+
     def __init__(self, id, name, details, ticket_type, state, responsible, date=None):
         """
         Construct a new Ticket object.
@@ -16,15 +56,17 @@ class Ticket:
         :param ticket_type: The type of the ticket.
         :param state: The state of the ticket.
         :param responsible: The responsible person for the ticket.
-        :param date: The date the ticket was created.
+        :param date: The date the ticket was created, as a datetime or a timestamp.
         """
         self.id = id
         self.name = name
         self.details = details
-        if date:
-            self.date = date.strftime("%Y-%m-%d %H:%M:%S")
+        if date is None:
+            self.timestamp = to_timestamp(datetime.datetime.now())
+        elif isinstance(date, datetime.datetime):
+            self.timestamp = to_timestamp(date)
         else:
-            self.date = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            self.timestamp = int(date)
         self.type = ticket_type
         self.state = state
         self.responsible = responsible
@@ -35,8 +77,58 @@ class Ticket:
 
         :return: The age of the ticket in timestamp.
         """
-        return datetime.datetime.now() - datetime.datetime.strptime(
-            self.date, "%Y-%m-%d %H:%M:%S"
+        return datetime.datetime.now() - self.get_datetime()
+
+    def get_timestamp(self):
+        """
+        Get the creation date of the ticket as a timestamp.
+
+        :return: The creation date of the ticket in seconds, see to_timestamp.
+        """
+        return self.timestamp
+
+    def get_datetime(self):
+        """
+        Get the creation date of the ticket as a datetime.
+
+        :return: The creation date of the ticket.
+        """
+        return from_timestamp(self.timestamp)
+
+    @property
+    def date(self):
+        """
+        Get the creation date of the ticket formatted for display.
+
+        :return: The creation date of the ticket as a string.
+        """
+        return self.get_datetime().strftime(DATE_FORMAT)
+
+    @date.setter
+    def date(self, date):
+        """
+        Set the creation date of the ticket.
+
+        :param date: The new creation date, as a formatted string or a datetime.
+        """
+        if isinstance(date, str):
+            date = datetime.datetime.strptime(date, DATE_FORMAT)
+        self.timestamp = to_timestamp(date)
+
+    def copy(self):
+        """
+        Copy the ticket.
+
+        :return: A new Ticket object with the same fields.
+        """
+        return Ticket(
+            self.id,
+            self.name,
+            self.details,
+            self.type,
+            self.state,
+            self.responsible,
+            self.timestamp,
         )
 
     def __eq__(self, other):
@@ -50,7 +142,7 @@ class Ticket:
             self.id == other.id
             and self.name == other.name
             and self.details == other.details
-            and self.date == other.date
+            and self.timestamp == other.timestamp
             and self.type == other.type
             and self.state == other.state
             and self.responsible == other.responsible
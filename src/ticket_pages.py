@@ -0,0 +1,109 @@
+from collections.abc import Sequence
+from typing import Callable, Iterator, Optional
+
+from src.ticket import Ticket
+
+
+class TicketPages(Sequence):
+    """
+    A read-only sequence of tickets whose pages are fetched only when they are accessed.
+
+    The pages are fetched in order with a page function taking the cursor returned
+    with the previous page. Tickets read by position are kept, so going back to a
+    ticket does not fetch its page again, while iterating past them fetches the
+    remaining pages without keeping them.
+    """
+
+    def __init__(
+        self,
+        fetch_page: Callable[[Optional[tuple]], tuple[list[Ticket], Optional[tuple]]],
+        count: Optional[int] = None,
+        first_page: Optional[tuple[list[Ticket], Optional[tuple]]] = None,
+    ):
+        """
+        Initialize the sequence without fetching any page.
+
+        :param fetch_page: A function taking a cursor, None for the first page, and
+            returning the tickets of the page and the cursor of the next page,
+            or None after the last page.
+        :param count: The number of tickets if it was counted beforehand, or None.
+        :param first_page: The first page if it was already fetched, or None.
+        """
+        self._fetch_page = fetch_page
+        self._count = count
+        self._tickets: list[Ticket] = []
+        self._cursor = None
+        self._exhausted = count == 0
+        if first_page is not None:
+            self._add_page(*first_page)
+
+    def __len__(self):
+        """
+        Get the number of tickets.
+
+        If the tickets were not counted beforehand, every remaining page is fetched.
+
+        :return: The number of tickets.
+        """
+        if self._count is None:
+            while not self._exhausted:
+                self._fetch_next_page()
+        return self._count
+
+    def __getitem__(self, index):
+        """
+        Get a ticket by its position, fetching the pages up to it if needed.
+
+        :param index: The position of the ticket, or a slice.
+        :return: The ticket at the given position, or a list for a slice.
+        """
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if index < 0:
+            raise IndexError("ticket index out of range")
+        while index >= len(self._tickets) and not self._exhausted:
+            self._fetch_next_page()
+        return self._tickets[index]
+
+    def __iter__(self) -> Iterator[Ticket]:
+        """
+        Iterate over the tickets, fetching the pages not fetched yet one at a time.
+
+        :return: An iterator of tickets.
+        """
+        yield from self._tickets[:]
+        cursor, exhausted = self._cursor, self._exhausted
+        while not exhausted:
+            tickets, cursor = self._fetch_page(cursor)
+            yield from tickets
+            exhausted = cursor is None or not tickets
+
+    def _fetch_next_page(self):
+        """
+        Fetch the page following the last fetched one.
+        """
+        self._add_page(*self._fetch_page(self._cursor))
+
+    def _add_page(self, tickets, cursor):
+        """
+        Keep the tickets of a fetched page.
+
+        :param tickets: The tickets of the page.
+        :param cursor: The cursor of the next page, or None after the last page.
+        """
+        self._tickets.extend(tickets)
+        self._cursor = cursor
+        if cursor is None or not tickets:
+            self._exhausted = True
+            self._count = len(self._tickets)
+
+    @property
+    def fetched(self) -> int:
+        """
+        Get the number of tickets kept so far.
+
+        :return: The number of kept tickets.
+        """
+        return len(self._tickets)
@@ -1,9 +1,12 @@
 import re
+from functools import partial
+from typing import Optional
 
 from src.abstract_interface import AbstractInterface
 from src.abstract_data import AbstractData
 from src.ticket import Ticket
-from src.constants import State, Responsible, Type
+from src.ticket_pages import TicketPages
+from src.constants import ID_PATTERN, NAME_PATTERN, State, Responsible, Type
 
 
 class TMS:
@@ -32,16 +35,55 @@ class TMS:
         :return: True if the ticket was closed successfully, False otherwise.
         """
         self.interface.print_close_ticket(case_id)
-        ticket = self.data.get_ticket(case_id)
-        if ticket is None:
+        ticket = self.data.set_ticket_state(
+            case_id, State.CLOSED, only_responsible=Responsible.L1
+        )
+        if ticket is not None:
+            return True
+        if self.data.get_ticket(case_id) is None:
             self.interface.print_ticket_invalid_id(case_id)
-            return False
-        if ticket.responsible != Responsible.L1:
+        else:
             self.interface.print_l1_close_ticket()
-            return False
-        ticket.state = State.CLOSED
-        self.data.close_ticket(ticket)
-        return True
+        return False
+
+    @staticmethod
+    def new_ticket_error(id, name, description, ticket_type) -> Optional[str]:
+        """
+        Check the details of a new ticket.
+
+        :param id: The ID of the ticket.
+        :param name: The name of the customer.
+        :param description: The description of the ticket.
+        :param ticket_type: The type of the ticket.
+        :return: The first error found: "invalid id", "invalid details",
+            "invalid name" or "invalid type", or None if the details are valid.
+        """
+        if not re.match(ID_PATTERN, id):
+            return "invalid id"
+        if len(description) == 0:
+            return "invalid details"
+        if not re.match(NAME_PATTERN, name):
+            return "invalid name"
+        if Type.get_enum(ticket_type) is None:
+            return "invalid type"
+        return None
+
+    @staticmethod
+    def print_new_ticket_error(interface: AbstractInterface, error):
+        """
+        Print an error found by new_ticket_error.
+
+        :param interface: The interface to print the error with.
+        :param error: The error returned by new_ticket_error.
+        """
+        if error == "invalid id":
+            interface.print_invalid_id()
+        elif error == "invalid details":
+            interface.print_invalid_details()
+        elif error == "invalid name":
+            interface.print_invalid_name()
+        elif error == "invalid type":
+            interface.print_invalid_type()
 
     def create_ticket(self, id, name, description, ticket_type):
         """
@@ -53,19 +95,11 @@ class TMS:
         :param ticket_type: The type of the ticket.
         :return: True if the ticket was created successfully, False otherwise.
         """
-        if not re.match("^Case-\d\d\d$", id):
-            self.interface.print_invalid_id()
-            return False
-        if len(description) == 0:
-            self.interface.print_invalid_details()
-            return False
-        if not re.match("^\w+$", name):
-            self.interface.print_invalid_name()
+        error = self.new_ticket_error(id, name, description, ticket_type)
+        if error is not None:
+            self.print_new_ticket_error(self.interface, error)
             return False
         ticket_type_enum = Type.get_enum(ticket_type)
-        if ticket_type_enum is None:
-            self.interface.print_invalid_type()
-            return False
         if self.data.id_exists(id):
             self.interface.print_id_already_exists()
             return False
@@ -94,19 +128,43 @@ class TMS:
         """
         Search for tickets using a keyword.
 
+        Only the first page of results is fetched here. The following pages are
+        fetched as the interface reads them.
+
         :param keyword: The keyword to search for.
         :return: True if any tickets were found, False otherwise.
         """
         found = False
         self.interface.print_searched_keyword(keyword)
-        tickets = self.data.search_tickets(keyword)
-        if len(tickets) > 0:
+        first_page = self.data.search_tickets_page(keyword)
+        if len(first_page[0]) > 0:
             found = True
+            tickets = TicketPages(
+                partial(self.data.search_tickets_page, keyword), first_page=first_page
+            )
             self.interface.print_search(keyword, tickets)
         else:
             self.interface.print_keyword_not_found(keyword)
         return found
 
+    @staticmethod
+    def update_state(new_state) -> Optional[State]:
+        """
+        Get the state a ticket can be updated to.
+
+        :param new_state: The name of the new state.
+        :return: The state, or None if tickets cannot be updated to it.
+        """
+        new_state_enum = State.get_enum(new_state)
+        if new_state_enum not in (
+            State.ANALYSIS,
+            State.SOLVED,
+            State.IN_DELIVERY,
+            State.ASSIGNED,
+        ):
+            return None
+        return new_state_enum
+
     def update_ticket(self, case_id, new_state, new_assign):
         """
         Update the state and responsible for a ticket.
@@ -116,13 +174,8 @@ class TMS:
         :param new_assign: The new assignee of the ticket.
         :return: True if the ticket was updated successfully, False otherwise.
         """
-        new_state_enum = State.get_enum(new_state)
-        if new_state_enum is None or (
-            new_state_enum != State.ANALYSIS
-            and new_state_enum != State.SOLVED
-            and new_state_enum != State.IN_DELIVERY
-            and new_state_enum != State.ASSIGNED
-        ):
+        new_state_enum = self.update_state(new_state)
+        if new_state_enum is None:
             self.interface.print_invalid_state(new_state)
             return False
         new_assign_enum = Responsible.get_enum(new_assign)
@@ -130,32 +183,145 @@ class TMS:
             self.interface.print_invalid_responsible(new_assign)
             return False
         self.interface.print_updated_ticket(case_id, new_assign, new_state)
-        ticket = self.data.get_ticket(case_id)
+        ticket = self.data.set_ticket_state(case_id, new_state_enum, new_assign_enum)
         if ticket is None:
             self.interface.print_ticket_invalid_id(case_id)
             return False
-        ticket.state = new_state_enum
-        ticket.responsible = new_assign_enum
-        self.data.update_ticket(ticket)
         return True
 
+    def create_tickets(self, rows) -> list[Optional[str]]:
+        """
+        Create several tickets with a single data operation.
+
+        Each row is checked like in create_ticket, and the valid ones are created
+        together. Nothing is printed, the results tell the outcome of each row.
+
+        :param rows: An iterable of (id, name, description, ticket_type) tuples.
+        :return: A list holding, for each row in order, None if its ticket was
+            created, or the error: "invalid id", "invalid details", "invalid name",
+            "invalid type" or "id already exists".
+        """
+        results = []
+        tickets = []
+        positions = []
+        for id, name, description, ticket_type in rows:
+            error = self.new_ticket_error(id, name, description, ticket_type)
+            results.append(error)
+            if error is None:
+                positions.append(len(results) - 1)
+                tickets.append(
+                    Ticket(
+                        id,
+                        name,
+                        description,
+                        Type.get_enum(ticket_type),
+                        State.NEW,
+                        Responsible.L1,
+                    )
+                )
+        if tickets:
+            for position, created in zip(positions, self.data.create_tickets(tickets)):
+                if not created:
+                    results[position] = "id already exists"
+        return results
+
+    def update_tickets(self, case_ids, new_state, new_assign) -> list[Optional[str]]:
+        """
+        Update the state and responsible of several tickets with one read and one
+        write data operation.
+
+        The state and responsible are checked once for the whole batch. Nothing is
+        printed, the results tell the outcome of each ticket.
+
+        :param case_ids: An iterable of the IDs of the tickets to update.
+        :param new_state: The new state of the tickets.
+        :param new_assign: The new assignee of the tickets.
+        :return: A list holding, for each ID in order, None if its ticket was
+            updated, or the error: "invalid state", "invalid responsible" or
+            "invalid id".
+        """
+        case_ids = list(case_ids)
+        new_state_enum = self.update_state(new_state)
+        if new_state_enum is None:
+            return ["invalid state"] * len(case_ids)
+        new_assign_enum = Responsible.get_enum(new_assign)
+        if new_assign_enum is None:
+            return ["invalid responsible"] * len(case_ids)
+        results = ["invalid id"] * len(case_ids)
+        tickets = []
+        positions = []
+        for position, ticket in enumerate(self.data.get_tickets(case_ids)):
+            if ticket is not None:
+                ticket.state = new_state_enum
+                ticket.responsible = new_assign_enum
+                tickets.append(ticket)
+                positions.append(position)
+        if tickets:
+            for position, updated in zip(positions, self.data.update_tickets(tickets)):
+                if updated:
+                    results[position] = None
+        return results
+
+    def close_tickets(self, case_ids) -> list[Optional[str]]:
+        """
+        Close several tickets with one read and one write data operation.
+
+        Like close_ticket, only the tickets assigned to L1 are closed. Nothing is
+        printed, the results tell the outcome of each ticket.
+
+        :param case_ids: An iterable of the IDs of the tickets to close.
+        :return: A list holding, for each ID in order, None if its ticket was
+            closed, or the error: "invalid id" or "not assigned to L1".
+        """
+        case_ids = list(case_ids)
+        results = ["invalid id"] * len(case_ids)
+        tickets = []
+        positions = []
+        for position, ticket in enumerate(self.data.get_tickets(case_ids)):
+            if ticket is None:
+                continue
+            if ticket.responsible != Responsible.L1:
+                results[position] = "not assigned to L1"
+                continue
+            ticket.state = State.CLOSED
+            tickets.append(ticket)
+            positions.append(position)
+        if not tickets:
+            return results
+        # The responsible is checked again by the write, since the ticket may be
+        # reassigned after it was read.
+        closed = self.data.close_tickets(tickets, only_responsible=Responsible.L1)
+        failed = []
+        for position, result in zip(positions, closed):
+            if result:
+                results[position] = None
+            else:
+                failed.append(position)
+        if failed:
+            current = self.data.get_tickets([case_ids[position] for position in failed])
+            for position, ticket in zip(failed, current):
+                if ticket is not None:
+                    results[position] = "not assigned to L1"
+        return results
+
     def get_tar_3(self):
         """
         Get the old tickets for the TAR-3 report.
 
+        Only the counts are fetched here. The tickets of a list are fetched a page
+        at a time when the list is first read.
+
         :return: A dictionary containing the old tickets.
         """
-        tickets_new_tar_3 = self.data.get_old_new_ticket()
-        tickets_assigned_tar_3 = self.data.get_old_assigned_ticket()
-        tickets_tar_3 = self.data.get_old_ticket_list()
-
+        counts = self.data.count_tar_3()
         return {
-            "new": {"tickets": tickets_new_tar_3, "count": len(tickets_new_tar_3)},
-            "assigned": {
-                "tickets": tickets_assigned_tar_3,
-                "count": len(tickets_assigned_tar_3),
-            },
-            "all": {"tickets": tickets_tar_3, "count": len(tickets_tar_3)},
+            bucket: {
+                "tickets": TicketPages(
+                    partial(self.data.get_tar_3_page, bucket), count
+                ),
+                "count": count,
+            }
+            for bucket, count in counts.items()
         }
 
     def main(self):
@@ -191,6 +357,7 @@ class TMS:
                 tickets = self.get_tar_3()
                 self.interface.print_tar_3_tickets(tickets)
             elif val == "7":  # Sortie
+                self.data.flush()
                 break
             else:
                 self.interface.print_invalid_selection()
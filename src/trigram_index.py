@@ -0,0 +1,176 @@
+from typing import Callable, Hashable, Iterable, Optional
+
+GRAM_SIZE = 3
+
+
+class TrigramIndex:
+    """
+    An inverted index mapping the trigrams of indexed texts to the keys holding them.
+    It is used to find candidates for substring searches without scanning every entry.
+
+    Texts shorter than a trigram are indexed as a single gram, so every
+    non-empty text contributes at least one gram.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty index.
+        """
+        self.postings: dict[str, set] = {}
+        self._texts: dict[Hashable, tuple[str, ...]] = {}
+        self._sequence: dict[Hashable, int] = {}
+        self._counter = 0
+
+    def __len__(self):
+        """
+        Get the number of indexed keys.
+
+        :return: The number of indexed keys.
+        """
+        return len(self._texts)
+
+    @staticmethod
+    def grams_of(texts: Iterable[str]) -> set[str]:
+        """
+        Get the grams of the given texts.
+
+        :param texts: The texts to split into grams.
+        :return: A set containing the grams of all the texts.
+        """
+        grams = set()
+        for text in texts:
+            if len(text) < GRAM_SIZE:
+                if text:
+                    grams.add(text)
+                continue
+            for i in range(len(text) - GRAM_SIZE + 1):
+                grams.add(text[i : i + GRAM_SIZE])
+        return grams
+
+    def add(self, key, texts: Iterable[str]):
+        """
+        Index the texts of a new key.
+
+        :param key: The key the texts belong to.
+        :param texts: The texts to index.
+        """
+        texts = tuple(texts)
+        self._texts[key] = texts
+        self._sequence[key] = self._counter
+        self._counter += 1
+        for gram in self.grams_of(texts):
+            self.postings.setdefault(gram, set()).add(key)
+
+    def remove(self, key) -> bool:
+        """
+        Remove a key and its texts from the index.
+
+        :param key: The key to remove.
+        :return: True if the key was indexed, False otherwise.
+        """
+        texts = self._texts.pop(key, None)
+        if texts is None:
+            return False
+        del self._sequence[key]
+        self._discard(key, self.grams_of(texts))
+        return True
+
+    def update(self, key, texts: Iterable[str]) -> bool:
+        """
+        Replace the indexed texts of a key, keeping its insertion position.
+
+        Only the postings of the grams that appeared or disappeared are touched.
+
+        :param key: The key to update.
+        :param texts: The new texts of the key.
+        :return: True if the key was indexed, False otherwise.
+        """
+        old_texts = self._texts.get(key)
+        if old_texts is None:
+            return False
+        texts = tuple(texts)
+        if texts == old_texts:
+            return True
+        self._texts[key] = texts
+        old_grams = self.grams_of(old_texts)
+        new_grams = self.grams_of(texts)
+        self._discard(key, old_grams - new_grams)
+        for gram in new_grams - old_grams:
+            self.postings.setdefault(gram, set()).add(key)
+        return True
+
+    def clear(self):
+        """
+        Remove every key from the index.
+        """
+        self.postings.clear()
+        self._texts.clear()
+        self._sequence.clear()
+        self._counter = 0
+
+    def candidates(self, keyword) -> set:
+        """
+        Get the keys that may contain the keyword in one of their texts.
+
+        The result is a superset of the matching keys: callers still have to check
+        each candidate, since trigrams may all be present without being contiguous.
+
+        :param keyword: The keyword to look for.
+        :return: A set of candidate keys.
+        """
+        if not keyword:
+            return set(self._texts)
+        if len(keyword) < GRAM_SIZE:
+            result = set()
+            for gram, keys in self.postings.items():
+                if keyword in gram:
+                    result |= keys
+            return result
+        postings = []
+        for gram in self.grams_of((keyword,)):
+            keys = self.postings.get(gram)
+            if not keys:
+                return set()
+            postings.append(keys)
+        postings.sort(key=len)
+        result = set(postings[0])
+        for keys in postings[1:]:
+            result &= keys
+            if not result:
+                break
+        return result
+
+    def search(
+        self, keyword, matches: Optional[Callable[[Hashable], bool]] = None
+    ) -> list:
+        """
+        Get the keys whose texts contain the keyword, in insertion order.
+
+        :param keyword: The keyword to look for.
+        :param matches: An optional predicate used to verify each candidate key.
+            Defaults to a substring test on the indexed texts.
+        :return: A list of matching keys.
+        """
+        if matches is None:
+
+            def matches(key):
+                return any(keyword in text for text in self._texts[key])
+
+        found = [key for key in self.candidates(keyword) if matches(key)]
+        found.sort(key=self._sequence.__getitem__)
+        return found
+
+    def _discard(self, key, grams):
+        """
+        Remove a key from the postings of the given grams, dropping empty postings.
+
+        :param key: The key to remove.
+        :param grams: The grams whose postings contain the key.
+        """
+        for gram in grams:
+            keys = self.postings.get(gram)
+            if keys is None:
+                continue
+            keys.discard(key)
+            if not keys:
+                del self.postings[gram]
@@ -0,0 +1,507 @@
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+
+from src.abstract_data import AbstractData
+from src.constants import PAGE_SIZE, State, Responsible, Type
+from src.ticket import Ticket
+
+
+class WriteBehindData(AbstractData):
+    """
+    A data source wrapping another one, writing to it in the background.
+
+    Writes return once they are recorded in memory. The last state of each
+    written ticket is kept until a background worker writes it with one
+    create_tickets and one update_tickets call per batch, which the DB backend
+    runs as multi-row statements. Several writes of a ticket before a flush are
+    written once.
+
+    Written tickets are read from memory until they are flushed, so get_ticket,
+    id_exists and get_tickets see them right away. The other reads flush first.
+    At most max_pending tickets wait: a write finding the buffer full flushes it
+    itself. The checks of a write are made on the tickets as seen by this
+    process, so a write may still be rejected by the wrapped data source when
+    flushed, for instance when another process closed the ticket meanwhile, or
+    when a ticket is created with the ID of a closed ticket; such writes are
+    counted as rejected and their IDs reported by stats.
+
+    A batch that fails is put back and written again with the next one. The
+    tickets of a batch that failed max_retries times in a row are given up,
+    counted as failed and reported by stats, so a batch the wrapped data source
+    keeps refusing does not hold back the later writes forever.
+    """
+
+    def __init__(
+        self,
+        data: AbstractData,
+        max_pending: int = 1000,
+        flush_interval: float = 0.05,
+        clock: Callable[[], float] = time.monotonic,
+        max_retries: int = 3,
+    ):
+        """
+        Initialize the buffer in front of a data source and start its worker.
+
+        :param data: The data source to wrap.
+        :param max_pending: The maximum number of tickets waiting to be written.
+        :param flush_interval: The number of seconds between two flushes of the worker.
+        :param clock: A function returning the current time in seconds.
+        :param max_retries: The number of times a failed write is written again
+            before it is given up.
+        """
+        self.data = data
+        self.max_pending = max_pending
+        self.flush_interval = flush_interval
+        self.clock = clock
+        self.max_retries = max_retries
+        # The tickets waiting to be written, by ID, with True for the tickets to
+        # create, and the tickets being written.
+        self._pending: dict[str, tuple[Ticket, bool]] = {}
+        self._in_flight: dict[str, tuple[Ticket, bool]] = {}
+        # The number of failed flushes of the tickets waiting to be written again.
+        self._failures: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._stopped = False
+        self.flushes = 0
+        self.flushed = 0
+        self.rejected = 0
+        self.rejected_ids = deque(maxlen=max_pending)
+        self.errors = 0
+        self.last_error = None
+        # The last state of the tickets given up after max_retries failures.
+        self.failed: dict[str, Ticket] = {}
+        self.last_flush_latency = 0.0
+        self.max_flush_latency = 0.0
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stats(self) -> dict:
+        """
+        Get the metrics of the buffer.
+
+        :return: A dictionary with the "queue_depth", the number of tickets
+            waiting, "in_flight", the number being written, the number of
+            "flushes", of "flushed" and "rejected" tickets, the "rejected_ids" of
+            the last rejected tickets, the number of flush "errors" and the
+            "last_error", the number of "failed" tickets given up and their
+            "failed_ids", and the "last_flush_latency" and "max_flush_latency" in
+            seconds.
+        """
+        with self._lock:
+            return {
+                "queue_depth": len(self._pending),
+                "in_flight": len(self._in_flight),
+                "flushes": self.flushes,
+                "flushed": self.flushed,
+                "rejected": self.rejected,
+                "rejected_ids": list(self.rejected_ids),
+                "errors": self.errors,
+                "last_error": self.last_error,
+                "failed": len(self.failed),
+                "failed_ids": list(self.failed),
+                "last_flush_latency": self.last_flush_latency,
+                "max_flush_latency": self.max_flush_latency,
+            }
+
+    def _run(self):
+        """
+        Flush the buffer every flush_interval seconds until closed.
+        """
+        while True:
+            with self._wake:
+                self._wake.wait(self.flush_interval)
+                if self._stopped:
+                    return
+            try:
+                self.flush()
+            except Exception:
+                # The error is reported by stats and the batch written again
+                # with the next one, up to max_retries times.
+                pass
+
+    def close(self):
+        """
+        Stop the worker and flush the buffer.
+        """
+        with self._wake:
+            self._stopped = True
+            self._wake.notify()
+        self._thread.join()
+        self.flush()
+
+    def flush(self):
+        """
+        Write the waiting tickets to the wrapped data source.
+
+        If the writes fail, the error is raised and the tickets are put back to
+        be written again, unless they already failed max_retries times.
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                self._in_flight = batch
+            if not batch:
+                return
+            start = self.clock()
+            created = [ticket for ticket, new in batch.values() if new]
+            updated = [ticket for ticket, new in batch.values() if not new]
+            try:
+                results = self.data.create_tickets(created) if created else []
+                if updated:
+                    results += self.data.update_tickets(updated)
+            except Exception as e:
+                with self._lock:
+                    self.errors += 1
+                    self.last_error = e
+                    for ticket_id, (ticket, new) in batch.items():
+                        failures = self._failures.pop(ticket_id, 0) + 1
+                        if failures > self.max_retries:
+                            self.failed[ticket_id] = ticket
+                            continue
+                        self._failures[ticket_id] = failures
+                        if ticket_id not in self._pending:
+                            self._pending[ticket_id] = (ticket, new)
+                        elif new:
+                            # The ticket must still be created before its later writes.
+                            self._pending[ticket_id] = (
+                                self._pending[ticket_id][0],
+                                True,
+                            )
+                    self._in_flight = {}
+                raise
+            latency = self.clock() - start
+            with self._lock:
+                self._in_flight = {}
+                self.flushes += 1
+                self.flushed += results.count(True)
+                self.rejected += results.count(False)
+                for ticket, written in zip(created + updated, results):
+                    self._failures.pop(ticket.id, None)
+                    if not written:
+                        self.rejected_ids.append(ticket.id)
+                self.last_flush_latency = latency
+                self.max_flush_latency = max(self.max_flush_latency, latency)
+            self.data.flush()
+
+    def _buffered(self, ticket_id) -> Optional[tuple[Ticket, bool]]:
+        """
+        Get the last written state of a ticket not flushed yet.
+
+        Must be called with the lock held.
+
+        :param ticket_id: The ID of the ticket.
+        :return: The ticket and True if it is to be created, or None if the ticket
+            has no write waiting.
+        """
+        entry = self._pending.get(ticket_id)
+        if entry is None:
+            entry = self._in_flight.get(ticket_id)
+            if entry is not None:
+                # The ticket is created by the flush in progress.
+                entry = (entry[0], False)
+        return entry
+
+    def _write(self, ticket: Ticket, create: bool = False):
+        """
+        Record the new state of a ticket, flushing first if the buffer is full.
+
+        :param ticket: The ticket to write, copied.
+        :param create: True if the ticket is created.
+        """
+        with self._lock:
+            full = (
+                ticket.id not in self._pending
+                and len(self._pending) >= self.max_pending
+            )
+        if full:
+            self.flush()
+        with self._lock:
+            entry = self._pending.get(ticket.id)
+            create = create or (entry is not None and entry[1])
+            self._pending[ticket.id] = (ticket.copy(), create)
+
+    def _current(self, ticket_id) -> Optional[Ticket]:
+        """
+        Get an open ticket as seen by this process.
+
+        :param ticket_id: The ID of the ticket.
+        :return: A copy of the ticket, or None if no open ticket has this ID.
+        """
+        with self._lock:
+            entry = self._buffered(ticket_id)
+        if entry is None:
+            ticket = self.data.get_ticket(ticket_id)
+        elif entry[0].state == State.CLOSED:
+            ticket = None
+        else:
+            ticket = entry[0]
+        # The data source may return the ticket it stores, which must not be
+        # changed before the write is flushed.
+        return None if ticket is None else ticket.copy()
+
+    def search_tickets(self, keyword) -> list[Ticket]:
+        """
+        Search for tickets using a keyword, after a flush.
+
+        :param keyword: The keyword to search for.
+        :return: A list of Ticket objects that match the keyword.
+        """
+        self.flush()
+        return self.data.search_tickets(keyword)
+
+    def search_tickets_page(
+        self, keyword, cursor=None, limit=PAGE_SIZE
+    ) -> tuple[list[Ticket], Optional[tuple]]:
+        """
+        Get one page of the open tickets matching a keyword, after a flush.
+
+        :param keyword: The keyword to search for.
+        :param cursor: The cursor returned with the previous page, or None for the first page.
+        :param limit: The maximum number of tickets in the page.
+        :return: A tuple of the tickets of the page and the cursor of the next page,
+            or None if this page is the last one.
+        """
+        self.flush()
+        return self.data.search_tickets_page(keyword, cursor, limit)
+
+    def get_ticket(self, ticket_id) -> Optional[Ticket]:
+        """
+        Get a ticket by its ID, from memory if it has writes waiting.
+
+        :param ticket_id: The ID of the ticket.
+        :return: The Ticket object with the given ID, or None if no such ticket exists.
+        """
+        return self._current(ticket_id)
+
+    def id_exists(self, ticket_id) -> bool:
+        """
+        Check if a ticket ID exists, from memory if it has writes waiting.
+
+        :param ticket_id: The ID of the ticket.
+        :return: True if the ticket ID exists, False otherwise.
+        """
+        with self._lock:
+            entry = self._buffered(ticket_id)
+        if entry is None:
+            return self.data.id_exists(ticket_id)
+        return entry[0].state != State.CLOSED
+
+    def create_ticket(self, ticket) -> Optional[Ticket]:
+        """
+        Record a new ticket to create.
+
+        :param ticket: The Ticket object to create.
+        :return: A copy of the ticket, or None if an open ticket with the same ID
+            exists, as seen by this process.
+        """
+        with self._lock:
+            entry = self._buffered(ticket.id)
+        if entry is not None and entry[0].state == State.CLOSED and not entry[1]:
+            # The close of the stored ticket must be written before the new
+            # ticket replaces its entry.
+            self.flush()
+            with self._lock:
+                entry = self._buffered(ticket.id)
+        if entry is None:
+            if self.data.id_exists(ticket.id):
+                return None
+        elif entry[0].state != State.CLOSED:
+            return None
+        self._write(ticket, create=True)
+        return ticket.copy()
+
+    def update_ticket(self, ticket) -> bool:
+        """
+        Record the update of an open ticket.
+
+        :param ticket: The Ticket object with updated data.
+        :return: True if the ticket will be updated, False if it is not open.
+        """
+        if self._current(ticket.id) is None:
+            return False
+        self._write(ticket)
+        return True
+
+    def close_ticket(self, ticket) -> bool:
+        """
+        Record the closing of an open ticket.
+
+        :param ticket: The Ticket object to close.
+        :return: True if the ticket will be closed, False if it is not open.
+        """
+        current = self._current(ticket.id)
+        if current is None:
+            return False
+        current.state = State.CLOSED
+        self._write(current)
+        return True
+
+    def get_tickets(self, ticket_ids) -> list[Optional[Ticket]]:
+        """
+        Get several open tickets by their IDs, from memory for the tickets with
+        writes waiting and with one read of the wrapped data source for the others.
+
+        :param ticket_ids: An iterable of ticket IDs.
+        :return: A list holding, for each ID in order, its Ticket or None.
+        """
+        ticket_ids = list(ticket_ids)
+        with self._lock:
+            entries = [self._buffered(ticket_id) for ticket_id in ticket_ids]
+        unbuffered = [
+            ticket_id for ticket_id, entry in zip(ticket_ids, entries) if entry is None
+        ]
+        read = iter(self.data.get_tickets(unbuffered) if unbuffered else [])
+        tickets = []
+        for entry in entries:
+            if entry is None:
+                tickets.append(next(read))
+            elif entry[0].state == State.CLOSED:
+                tickets.append(None)
+            else:
+                tickets.append(entry[0].copy())
+        return tickets
+
+    def create_tickets(self, tickets) -> list[bool]:
+        """
+        Record several new tickets to create.
+
+        :param tickets: An iterable of the Ticket objects to create.
+        :return: A list telling for each ticket if it will be created, in order.
+        """
+        return [self.create_ticket(ticket) is not None for ticket in tickets]
+
+    def update_tickets(self, tickets) -> list[bool]:
+        """
+        Record the update of several open tickets.
+
+        :param tickets: An iterable of the Ticket objects with updated data.
+        :return: A list telling for each ticket if it will be updated, in order.
+        """
+        return [self.update_ticket(ticket) for ticket in tickets]
+
+    def close_tickets(
+        self, tickets, only_responsible: Optional[Responsible] = None
+    ) -> list[bool]:
+        """
+        Record the closing of several open tickets.
+
+        :param tickets: An iterable of the Ticket objects to close.
+        :param only_responsible: If given, a ticket is only closed if it is
+            currently assigned to this responsible.
+        :return: A list telling for each ticket if it will be closed, in order.
+        """
+        return [
+            self.set_ticket_state(ticket.id, State.CLOSED, None, only_responsible)
+            is not None
+            for ticket in tickets
+        ]
+
+    def set_ticket_state(
+        self,
+        ticket_id,
+        state: State,
+        responsible: Optional[Responsible] = None,
+        only_responsible: Optional[Responsible] = None,
+    ) -> Optional[Ticket]:
+        """
+        Record the change of the state, and optionally the responsible, of an
+        open ticket.
+
+        :param ticket_id: The ID of the ticket.
+        :param state: The new state of the ticket.
+        :param responsible: The new responsible of the ticket, or None to keep it.
+        :param only_responsible: If given, the ticket is only changed if it is
+            currently assigned to this responsible.
+        :return: The changed Ticket object, or None if no open ticket matched.
+        """
+        ticket = self._current(ticket_id)
+        if ticket is None or (
+            only_responsible is not None and ticket.responsible != only_responsible
+        ):
+            return None
+        ticket.state = state
+        if responsible is not None:
+            ticket.responsible = responsible
+        self._write(ticket)
+        return ticket
+
+    def filter_tickets(
+        self,
+        state: Optional[State] = None,
+        responsible: Optional[Responsible] = None,
+        ticket_type: Optional[Type] = None,
+    ) -> list[Ticket]:
+        """
+        Get the open tickets matching all the given criteria, after a flush.
+
+        :param state: The state to filter on, or None to accept any state.
+        :param responsible: The responsible to filter on, or None to accept any.
+        :param ticket_type: The type to filter on, or None to accept any type.
+        :return: A list of Ticket objects.
+        """
+        self.flush()
+        return self.data.filter_tickets(state, responsible, ticket_type)
+
+    def get_old_new_ticket(self) -> list[Ticket]:
+        """
+        Get a list of NEW stated tickets older than 3 days, after a flush.
+
+        :return: A list of Ticket objects.
+        """
+        self.flush()
+        return self.data.get_old_new_ticket()
+
+    def get_old_assigned_ticket(self) -> list[Ticket]:
+        """
+        Get a list of ASSIGNED stated tickets older than 10 days, after a flush.
+
+        :return: A list of Ticket objects.
+        """
+        self.flush()
+        return self.data.get_old_assigned_ticket()
+
+    def get_old_ticket_list(self) -> list[Ticket]:
+        """
+        Get a list of tickets older than 20 days, after a flush.
+
+        :return: A list of Ticket objects.
+        """
+        self.flush()
+        return self.data.get_old_ticket_list()
+
+    def get_tar_3(self) -> dict[str, list[Ticket]]:
+        """
+        Get the three lists of old tickets of the TAR-3 report, after a flush.
+
+        :return: A dictionary with the "new", "assigned" and "all" lists.
+        """
+        self.flush()
+        return self.data.get_tar_3()
+
+    def count_tar_3(self) -> dict[str, int]:
+        """
+        Count the tickets of each list of the TAR-3 report, after a flush.
+
+        :return: A dictionary with the number of "new", "assigned" and "all" tickets.
+        """
+        self.flush()
+        return self.data.count_tar_3()
+
+    def get_tar_3_page(
+        self, bucket, cursor=None, limit=PAGE_SIZE
+    ) -> tuple[list[Ticket], Optional[tuple]]:
+        """
+        Get one page of a list of the TAR-3 report, after a flush.
+
+        :param bucket: The list to get a page of: "new", "assigned" or "all".
+        :param cursor: The cursor returned with the previous page, or None for the first page.
+        :param limit: The maximum number of tickets in the page.
+        :return: A tuple of the tickets of the page and the cursor of the next page,
+            or None if this page is the last one.
+        """
+        self.flush()
+        return self.data.get_tar_3_page(bucket, cursor, limit)
@@ -0,0 +1,75 @@
+import unittest
+from src.aging_index import AgingIndex
+
+
+class AgingIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.index = AgingIndex()
+        self.index.add(30, "Case-003")
+        self.index.add(10, "Case-001")
+        self.index.add(20, "Case-004")
+        self.index.add(20, "Case-002")
+
+    def test_add_keeps_order(self):
+        self.assertEqual(self.index.timestamps, [10, 20, 20, 30])
+        self.assertEqual(
+            self.index.keys, ["Case-001", "Case-002", "Case-004", "Case-003"]
+        )
+
+    def test_created_before(self):
+        self.assertEqual(self.index.created_before(5), [])
+        self.assertEqual(
+            self.index.created_before(20), ["Case-001", "Case-002", "Case-004"]
+        )
+        self.assertEqual(self.index.count_created_before(20), 3)
+        self.assertEqual(self.index.count_created_before(100), 4)
+
+    def test_page_created_before(self):
+        self.assertEqual(
+            self.index.page_created_before(20, limit=2), ["Case-001", "Case-002"]
+        )
+        self.assertEqual(
+            self.index.page_created_before(100, (20, "Case-002"), 5),
+            ["Case-004", "Case-003"],
+        )
+        self.assertEqual(
+            self.index.page_created_before(100, (20, "Case-003")),
+            ["Case-004", "Case-003"],
+        )
+        self.assertEqual(self.index.page_created_before(20, (20, "Case-004")), [])
+
+    def test_add_many(self):
+        self.index.add_many([(25, "Case-006"), (5, "Case-005"), (20, "Case-000")])
+        self.assertEqual(self.index.timestamps, [5, 10, 20, 20, 20, 25, 30])
+        self.assertEqual(
+            self.index.keys,
+            [
+                "Case-005",
+                "Case-001",
+                "Case-000",
+                "Case-002",
+                "Case-004",
+                "Case-006",
+                "Case-003",
+            ],
+        )
+        self.index.add_many([(40, "Case-007")])
+        self.assertEqual(self.index.keys[-1], "Case-007")
+
+    def test_remove_many(self):
+        self.index.remove_many([(20, "Case-004"), (10, "Case-001"), (10, "Case-003")])
+        self.assertEqual(self.index.keys, ["Case-002", "Case-003"])
+        self.assertEqual(self.index.timestamps, [20, 30])
+        self.index.remove_many([(30, "Case-003")])
+        self.assertEqual(self.index.keys, ["Case-002"])
+
+    def test_remove(self):
+        self.assertTrue(self.index.remove(20, "Case-004"))
+        self.assertFalse(self.index.remove(20, "Case-004"))
+        self.assertFalse(self.index.remove(10, "Case-003"))
+        self.assertEqual(self.index.keys, ["Case-001", "Case-002", "Case-003"])
+        self.assertEqual(len(self.index), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
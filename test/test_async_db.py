@@ -0,0 +1,103 @@
+import datetime
+import os
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from src import async_db
+from src.async_db import AsyncDB
+from src.constants import State, Responsible, Type
+from src.ticket import Ticket
+
+
+class AsyncDBTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.pool = AsyncMock()
+        self.db = AsyncDB(pool=self.pool)
+        self.data = (
+            "Case-011",
+            "name",
+            "details",
+            Type.PR.value,
+            State.ANALYSIS.value,
+            Responsible.L2.value,
+            datetime.datetime(2024, 2, 5, 20, 5, 59, 375458),
+        )
+        self.ticket = Ticket(
+            "Case-011",
+            "name",
+            "details",
+            Type.PR,
+            State.ANALYSIS,
+            Responsible.L2,
+            datetime.datetime(2024, 2, 5, 20, 5, 59, 375458),
+        )
+
+    async def test_get_ticket(self):
+        self.pool.fetchrow.return_value = self.data
+        result = await self.db.get_ticket("Case-011")
+        self.assertEqual(result, self.ticket)
+        query, *data = self.pool.fetchrow.call_args.args
+        self.assertIn("WHERE t.id = $1 AND t.state != $2", query)
+        self.assertEqual(data, ["Case-011", State.CLOSED.value])
+
+    async def test_id_exists(self):
+        self.pool.fetchrow.return_value = None
+        self.assertFalse(await self.db.id_exists("Case-011"))
+
+    async def test_create_ticket(self):
+        await self.db.create_ticket(self.ticket)
+        query, *data = self.pool.execute.call_args.args
+        self.assertIn("VALUES ($1, $2, $3, $4, $5, $6)", query)
+        self.assertEqual(data[0], "Case-011")
+
+    async def test_search_tickets(self):
+        self.pool.fetch.return_value = [self.data]
+        result = await self.db.search_tickets("name")
+        self.assertEqual(result, [self.ticket])
+        query, *data = self.pool.fetch.call_args.args
+        self.assertIn("t.responsible LIKE $7", query)
+        self.assertEqual(data[1], "%name%")
+
+    async def test_set_ticket_state(self):
+        self.pool.fetchrow.return_value = None
+        result = await self.db.set_ticket_state(
+            "Case-011", State.CLOSED, only_responsible=Responsible.L1
+        )
+        self.assertIsNone(result)
+        query, *data = self.pool.fetchrow.call_args.args
+        self.assertIn("AND t.responsible = $4", query)
+        self.assertEqual(data, ["closed", "Case-011", "closed", "L1"])
+
+    async def test_get_old_new_ticket(self):
+        self.pool.fetch.return_value = [self.data]
+        result = await self.db.get_old_new_ticket()
+        self.assertEqual(result, [self.ticket])
+        query, *data = self.pool.fetch.call_args.args
+        self.assertIn("'3 days'", query)
+        self.assertEqual(data, [State.NEW.value])
+
+    async def test_connect_and_disconnect(self):
+        async with self.db as db:
+            self.assertIs(db.pool, self.pool)
+        self.pool.close.assert_awaited_once()
+        self.assertIsNone(self.db.pool)
+
+    async def test_connect_without_asyncpg(self):
+        with patch.object(async_db, "asyncpg", None):
+            with self.assertRaises(RuntimeError):
+                await AsyncDB().connect()
+
+    @patch.dict(
+        os.environ,
+        {"DATABASE_NAME": "tms", "DATABASE_PORT": "5432", "DATABASE_POOL_MAX": "4"},
+    )
+    def test_pool_parameters(self):
+        os.environ.pop("DATABASE_POOL_MIN", None)
+        parameters = AsyncDB.pool_parameters()
+        self.assertEqual(parameters["database"], "tms")
+        self.assertEqual(parameters["port"], 5432)
+        self.assertEqual((parameters["min_size"], parameters["max_size"]), (1, 4))
+
+
+if __name__ == "__main__":
+    unittest.main()
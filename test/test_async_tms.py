@@ -0,0 +1,125 @@
+import asyncio
+import unittest
+from unittest.mock import MagicMock
+
+from src.abstract_async_data import AbstractAsyncData
+from src.async_tms import AsyncTMS
+from src.ticket import Ticket
+from src.constants import State, Responsible, Type
+from src.interface import Interface
+
+
+class AsyncTMSTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.interface_mock = MagicMock(spec=Interface)
+        self.data_mock = MagicMock(spec=AbstractAsyncData)
+        self.tms = AsyncTMS(self.interface_mock, self.data_mock)
+        self.ticket = Ticket(
+            "Case-001",
+            "IUT",
+            "IUT is not working",
+            Type.PR,
+            State.NEW,
+            Responsible.L1,
+        )
+
+    async def test_create_ticket(self):
+        self.data_mock.id_exists.return_value = False
+        success = await self.tms.create_ticket(
+            "Case-001", "IUT", "IUT is not working", "PR"
+        )
+        self.assertTrue(success)
+        self.data_mock.create_ticket.assert_awaited_once_with(self.ticket)
+        self.interface_mock.print_created_ticket.assert_called_once_with(self.ticket)
+
+    async def test_create_ticket_invalid(self):
+        success = await self.tms.create_ticket("Case-001", "I U T", "details", "PR")
+        self.assertFalse(success)
+        self.interface_mock.print_invalid_name.assert_called_once()
+        self.data_mock.id_exists.return_value = True
+        success = await self.tms.create_ticket("Case-001", "IUT", "details", "PR")
+        self.assertFalse(success)
+        self.interface_mock.print_id_already_exists.assert_called_once()
+        self.data_mock.create_ticket.assert_not_awaited()
+
+    async def test_update_ticket(self):
+        self.data_mock.set_ticket_state.return_value = self.ticket
+        success = await self.tms.update_ticket("Case-001", "analysis", "L2")
+        self.assertTrue(success)
+        self.data_mock.set_ticket_state.assert_awaited_once_with(
+            "Case-001", State.ANALYSIS, Responsible.L2
+        )
+        success = await self.tms.update_ticket("Case-001", "closed", "L2")
+        self.assertFalse(success)
+        self.interface_mock.print_invalid_state.assert_called_once_with("closed")
+
+    async def test_close_ticket(self):
+        self.data_mock.set_ticket_state.return_value = None
+        self.data_mock.get_ticket.return_value = self.ticket
+        success = await self.tms.close_ticket("Case-001")
+        self.assertFalse(success)
+        self.interface_mock.print_l1_close_ticket.assert_called_once()
+        self.data_mock.get_ticket.return_value = None
+        await self.tms.close_ticket("Case-002")
+        self.interface_mock.print_ticket_invalid_id.assert_called_once_with("Case-002")
+
+    async def test_search_tickets(self):
+        self.data_mock.search_tickets.return_value = [self.ticket]
+        self.assertTrue(await self.tms.search_tickets("IUT"))
+        self.interface_mock.print_search.assert_called_once_with("IUT", [self.ticket])
+        self.data_mock.search_tickets.return_value = []
+        self.assertFalse(await self.tms.search_tickets("none"))
+        self.interface_mock.print_keyword_not_found.assert_called_once_with("none")
+
+    async def test_print_one_ticket(self):
+        self.data_mock.get_ticket.return_value = self.ticket
+        self.assertTrue(await self.tms.print_one_ticket("Case-001"))
+        self.interface_mock.print_searched_ticket.assert_called_once_with(self.ticket)
+
+    async def test_get_tar_3_runs_queries_concurrently(self):
+        started = []
+        release = asyncio.Event()
+
+        def old_tickets(bucket, tickets):
+            async def query():
+                started.append(bucket)
+                if len(started) == 3:
+                    release.set()
+                # Only returns once the three queries are running.
+                await release.wait()
+                return tickets
+
+            return query
+
+        self.data_mock.get_old_new_ticket.side_effect = old_tickets(
+            "new", [self.ticket]
+        )
+        self.data_mock.get_old_assigned_ticket.side_effect = old_tickets("assigned", [])
+        self.data_mock.get_old_ticket_list.side_effect = old_tickets(
+            "all", [self.ticket]
+        )
+        tar_3 = await asyncio.wait_for(self.tms.get_tar_3(), 1)
+        self.assertEqual(
+            tar_3,
+            {
+                "new": {"tickets": [self.ticket], "count": 1},
+                "assigned": {"tickets": [], "count": 0},
+                "all": {"tickets": [self.ticket], "count": 1},
+            },
+        )
+
+    async def test_main(self):
+        self.interface_mock.print_main_form.side_effect = ["5", "6", "8", "7"]
+        self.interface_mock.print_one_form_ticket.return_value = "Case-001"
+        self.data_mock.get_ticket.return_value = self.ticket
+        self.data_mock.get_old_new_ticket.return_value = []
+        self.data_mock.get_old_assigned_ticket.return_value = []
+        self.data_mock.get_old_ticket_list.return_value = []
+        await self.tms.main()
+        self.interface_mock.print_searched_ticket.assert_called_once_with(self.ticket)
+        self.interface_mock.print_tar_3_tickets.assert_called_once()
+        self.interface_mock.print_invalid_selection.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
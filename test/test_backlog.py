@@ -6,8 +6,10 @@ from src.constants import State, Responsible, Type
 
 
 class BacklogTest(unittest.TestCase):
+    data_class = Backlog
+
     def setUp(self):
-        self.backlog = Backlog()
+        self.backlog = self.data_class()
         self.tickets = [
             Ticket(
                 "Case-001",
@@ -28,14 +30,13 @@ class BacklogTest(unittest.TestCase):
         ]
 
     def test_create_ticket(self):
-        success = self.backlog.create_ticket(self.tickets[0])
+        created = self.backlog.create_ticket(self.tickets[0])
         self.assertEqual(self.backlog.tickets, [self.tickets[0]])
-        self.assertTrue(success)
+        self.assertEqual(created, self.tickets[0])
 
     def test_create_ticket_id_exists(self):
         self.backlog.tickets = [self.tickets[0]]
-        success = self.backlog.create_ticket(self.tickets[0])
-        self.assertFalse(success)
+        self.assertIsNone(self.backlog.create_ticket(self.tickets[0]))
 
     def test_get_ticket(self):
         self.backlog.tickets = self.tickets
@@ -104,6 +105,94 @@ class BacklogTest(unittest.TestCase):
         success = self.backlog.close_ticket(ticket)
         self.assertFalse(success)
 
+    def test_set_ticket_state(self):
+        self.backlog.tickets = self.tickets
+        ticket = self.backlog.set_ticket_state(
+            "Case-001", State.ANALYSIS, Responsible.L2
+        )
+        self.assertEqual(ticket.state, State.ANALYSIS)
+        self.assertEqual(ticket.responsible, Responsible.L2)
+        self.assertEqual(self.backlog.get_ticket("Case-001"), ticket)
+        self.assertEqual(self.backlog.filter_tickets(state=State.ANALYSIS), [ticket])
+        self.assertIsNone(self.backlog.set_ticket_state("Case-003", State.SOLVED))
+
+    def test_set_ticket_state_close(self):
+        self.backlog.tickets = self.tickets
+        ticket = self.backlog.set_ticket_state(
+            "Case-002", State.CLOSED, only_responsible=Responsible.L1
+        )
+        self.assertIsNone(ticket)
+        self.assertTrue(self.backlog.id_exists("Case-002"))
+        ticket = self.backlog.set_ticket_state(
+            "Case-001", State.CLOSED, only_responsible=Responsible.L1
+        )
+        self.assertEqual(ticket.state, State.CLOSED)
+        self.assertFalse(self.backlog.id_exists("Case-001"))
+        self.assertEqual(self.backlog.deleted_tickets, [ticket])
+
+    def test_search_tickets(self):
+        for ticket in self.tickets:
+            self.backlog.create_ticket(ticket)
+        self.assertEqual(self.backlog.search_tickets("Case-00"), self.tickets)
+        self.assertEqual(self.backlog.search_tickets("IUT"), [self.tickets[0]])
+        self.assertEqual(self.backlog.search_tickets("L2"), [self.tickets[1]])
+        self.assertEqual(self.backlog.search_tickets("e"), self.tickets)
+        self.assertEqual(self.backlog.search_tickets("unknown"), [])
+
+    def test_search_tickets_after_update(self):
+        for ticket in self.tickets:
+            self.backlog.create_ticket(ticket)
+        ticket = self.backlog.get_ticket("Case-001")
+        ticket.state = State.ANALYSIS
+        self.backlog.update_ticket(ticket)
+        self.assertEqual(self.backlog.search_tickets("analysis"), [ticket])
+        self.assertEqual(self.backlog.search_tickets("new"), [self.tickets[1]])
+
+    def test_search_tickets_after_close(self):
+        for ticket in self.tickets:
+            self.backlog.create_ticket(ticket)
+        self.backlog.close_ticket(self.tickets[0])
+        self.assertEqual(self.backlog.search_tickets("working"), [self.tickets[1]])
+
+    def test_filter_tickets(self):
+        for ticket in self.tickets:
+            self.backlog.create_ticket(ticket)
+        self.assertEqual(self.backlog.filter_tickets(), self.tickets)
+        self.assertEqual(self.backlog.filter_tickets(state=State.NEW), self.tickets)
+        self.assertEqual(
+            self.backlog.filter_tickets(responsible=Responsible.L2), [self.tickets[1]]
+        )
+        self.assertEqual(
+            self.backlog.filter_tickets(state=State.NEW, ticket_type=Type.PR),
+            [self.tickets[0]],
+        )
+        self.assertEqual(self.backlog.filter_tickets(state=State.ANALYSIS), [])
+
+    def test_filter_tickets_after_update(self):
+        for ticket in self.tickets:
+            self.backlog.create_ticket(ticket)
+        ticket = self.backlog.get_ticket("Case-001")
+        ticket.state = State.ANALYSIS
+        ticket.responsible = Responsible.L2
+        self.backlog.update_ticket(ticket)
+        self.assertEqual(
+            self.backlog.filter_tickets(State.ANALYSIS, Responsible.L2), [ticket]
+        )
+        self.assertEqual(
+            self.backlog.filter_tickets(state=State.NEW), [self.tickets[1]]
+        )
+        self.assertEqual(self.backlog.filter_tickets(responsible=Responsible.L1), [])
+
+    def test_filter_tickets_after_close(self):
+        for ticket in self.tickets:
+            self.backlog.create_ticket(ticket)
+        self.tickets[0].state = State.CLOSED
+        self.backlog.close_ticket(self.tickets[0])
+        self.assertEqual(
+            self.backlog.filter_tickets(state=State.NEW), [self.tickets[1]]
+        )
+        self.assertEqual(self.backlog.filter_tickets(state=State.CLOSED), [])
+
     def test_get_old_new_ticket(self):
         current_datetime = datetime.datetime.now()
         three_days_ago = current_datetime - datetime.timedelta(days=4)
@@ -129,6 +218,135 @@ class BacklogTest(unittest.TestCase):
         tickets = self.backlog.get_old_assigned_ticket()
         self.assertEqual(tickets, [self.tickets[0]])
 
+    def test_get_old_tickets_after_update(self):
+        old_date = datetime.datetime.now() - datetime.timedelta(days=25)
+        self.tickets[0].date = old_date.strftime("%Y-%m-%d %H:%M:%S")
+        for ticket in self.tickets:
+            self.backlog.create_ticket(ticket)
+        ticket = self.backlog.get_ticket("Case-001")
+        ticket.state = State.ASSIGNED
+        self.backlog.update_ticket(ticket)
+        self.assertEqual(self.backlog.get_old_new_ticket(), [])
+        self.assertEqual(self.backlog.get_old_assigned_ticket(), [ticket])
+        self.assertEqual(self.backlog.get_old_ticket_list(), [ticket])
+        ticket.state = State.CLOSED
+        self.backlog.close_ticket(ticket)
+        self.assertEqual(self.backlog.get_old_assigned_ticket(), [])
+        self.assertEqual(self.backlog.get_old_ticket_list(), [])
+
+    def test_get_tar_3(self):
+        old_date = datetime.datetime.now() - datetime.timedelta(days=25)
+        self.tickets[0].date = old_date.strftime("%Y-%m-%d %H:%M:%S")
+        self.tickets[1].date = old_date.strftime("%Y-%m-%d %H:%M:%S")
+        self.tickets[1].state = State.ASSIGNED
+        self.backlog.tickets = self.tickets
+        self.assertEqual(
+            self.backlog.get_tar_3(),
+            {
+                "new": [self.tickets[0]],
+                "assigned": [self.tickets[1]],
+                "all": self.tickets,
+            },
+        )
+
+    def test_create_tickets(self):
+        self.backlog.create_ticket(self.tickets[0])
+        duplicate = Ticket("Case-002", "Dup", "Dup", Type.PR, State.NEW, Responsible.L1)
+        results = self.backlog.create_tickets(
+            [self.tickets[0], self.tickets[1], duplicate]
+        )
+        self.assertEqual(results, [False, True, False])
+        self.assertEqual(self.backlog.tickets, self.tickets)
+        self.assertEqual(self.backlog.search_tickets("Test"), [self.tickets[1]])
+        self.assertEqual(
+            self.backlog.filter_tickets(responsible=Responsible.L2), [self.tickets[1]]
+        )
+
+    def test_get_tickets(self):
+        self.backlog.tickets = self.tickets
+        tickets = self.backlog.get_tickets(["Case-002", "Case-009", "Case-001"])
+        self.assertEqual(tickets, [self.tickets[1], None, self.tickets[0]])
+
+    def test_update_tickets(self):
+        old_date = datetime.datetime.now() - datetime.timedelta(days=25)
+        self.tickets[0].date = old_date.strftime("%Y-%m-%d %H:%M:%S")
+        self.backlog.create_tickets(self.tickets)
+        updated = [
+            Ticket("Case-001", "IUT", "", Type.PR, State.ASSIGNED, Responsible.L2),
+            Ticket("Case-009", "IUT", "", Type.PR, State.ASSIGNED, Responsible.L2),
+            Ticket("Case-002", "IUT", "", Type.PR, State.ANALYSIS, Responsible.L3),
+        ]
+        self.assertEqual(self.backlog.update_tickets(updated), [True, False, True])
+        self.assertEqual(
+            [t.id for t in self.backlog.filter_tickets(responsible=Responsible.L2)],
+            ["Case-001"],
+        )
+        self.assertEqual(
+            [t.id for t in self.backlog.filter_tickets(State.ANALYSIS)], ["Case-002"]
+        )
+        self.assertEqual(self.backlog.get_old_new_ticket(), [])
+        self.assertEqual(
+            [t.id for t in self.backlog.get_old_assigned_ticket()], ["Case-001"]
+        )
+
+    def test_close_tickets(self):
+        old_date = datetime.datetime.now() - datetime.timedelta(days=25)
+        self.tickets[0].date = old_date.strftime("%Y-%m-%d %H:%M:%S")
+        self.backlog.create_tickets(self.tickets)
+        closed = Ticket(
+            "Case-001", "IUT", "", Type.PR, State.CLOSED, Responsible.L1, old_date
+        )
+        results = self.backlog.close_tickets([closed, closed])
+        self.assertEqual(results, [True, False])
+        self.assertEqual([t.id for t in self.backlog.tickets], ["Case-002"])
+        self.assertEqual(self.backlog.get_old_ticket_list(), [])
+        self.assertEqual(self.backlog.search_tickets("IUT"), [])
+        self.assertEqual(self.backlog.deleted_tickets[0].state, State.CLOSED)
+
+    def test_close_tickets_only_responsible(self):
+        self.backlog.create_tickets(self.tickets)
+        closed = [
+            Ticket("Case-001", "IUT", "", Type.PR, State.CLOSED, Responsible.L1),
+            Ticket("Case-002", "IUT", "", Type.PR, State.CLOSED, Responsible.L1),
+        ]
+        results = self.backlog.close_tickets(closed, Responsible.L1)
+        self.assertEqual(results, [True, False])
+        self.assertEqual([t.id for t in self.backlog.tickets], ["Case-002"])
+
+    def test_search_tickets_page(self):
+        old_date = datetime.datetime.now() - datetime.timedelta(days=5)
+        self.tickets[1].date = old_date.strftime("%Y-%m-%d %H:%M:%S")
+        self.backlog.tickets = self.tickets
+        tickets, cursor = self.backlog.search_tickets_page("Case", limit=1)
+        self.assertEqual(tickets, [self.tickets[1]])
+        tickets, cursor = self.backlog.search_tickets_page("Case", cursor, limit=1)
+        self.assertEqual(tickets, [self.tickets[0]])
+        self.assertIsNone(cursor)
+        self.assertEqual(self.backlog.search_tickets_page("nothing"), ([], None))
+
+    def test_count_tar_3(self):
+        old_date = datetime.datetime.now() - datetime.timedelta(days=25)
+        self.tickets[0].date = old_date.strftime("%Y-%m-%d %H:%M:%S")
+        self.tickets[1].date = old_date.strftime("%Y-%m-%d %H:%M:%S")
+        self.tickets[1].state = State.ASSIGNED
+        self.backlog.tickets = self.tickets
+        self.assertEqual(
+            self.backlog.count_tar_3(), {"new": 1, "assigned": 1, "all": 2}
+        )
+
+    def test_get_tar_3_page(self):
+        old_date = datetime.datetime.now() - datetime.timedelta(days=25)
+        for ticket in self.tickets:
+            ticket.date = old_date.strftime("%Y-%m-%d %H:%M:%S")
+        self.backlog.tickets = self.tickets
+        tickets, cursor = self.backlog.get_tar_3_page("all", limit=1)
+        self.assertEqual(tickets, [self.tickets[0]])
+        self.assertIsNotNone(cursor)
+        tickets, cursor = self.backlog.get_tar_3_page("all", cursor, limit=1)
+        self.assertEqual(tickets, [self.tickets[1]])
+        self.assertIsNone(cursor)
+        self.assertEqual(self.backlog.get_tar_3_page("assigned"), ([], None))
+
     def get_old_ticket_list(self):
         current_datetime = datetime.datetime.now()
         twenty_days_ago = current_datetime - datetime.timedelta(days=21)
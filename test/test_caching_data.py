@@ -0,0 +1,181 @@
+import unittest
+from unittest.mock import MagicMock
+
+from src.abstract_data import AbstractData
+from src.caching_data import CachingData, LRUCache
+from src.ticket import Ticket
+from src.constants import State, Responsible, Type
+
+
+class LRUCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.cache = LRUCache(2, 10.0, lambda: self.now)
+
+    def test_eviction(self):
+        self.cache.put("a", 1)
+        self.cache.put("b", 2)
+        self.assertEqual(self.cache.get("a"), 1)
+        self.cache.put("c", 3)
+        self.assertEqual(self.cache.get("a"), 1)
+        self.assertIsNot(self.cache.get("b"), 2)
+        self.assertEqual(self.cache.evictions, 1)
+        self.assertEqual((self.cache.hits, self.cache.misses), (2, 1))
+
+    def test_expiry(self):
+        self.cache.put("a", None)
+        self.now = 9.9
+        self.assertIsNone(self.cache.get("a"))
+        self.now = 10.0
+        self.assertIsNot(self.cache.get("a"), None)
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.misses, 1)
+
+
+class CachingDataTest(unittest.TestCase):
+    def setUp(self):
+        self.data_mock = MagicMock(spec=AbstractData)
+        self.now = 0.0
+        self.data = CachingData(self.data_mock, 10, 60.0, lambda: self.now)
+        self.ticket = Ticket(
+            "Case-001",
+            "IUT",
+            "IUT is not working",
+            Type.PR,
+            State.NEW,
+            Responsible.L1,
+        )
+
+    def test_get_ticket_is_cached(self):
+        self.data_mock.get_ticket.return_value = self.ticket
+        self.assertEqual(self.data.get_ticket("Case-001"), self.ticket)
+        self.assertEqual(self.data.get_ticket("Case-001"), self.ticket)
+        self.data_mock.get_ticket.assert_called_once_with("Case-001")
+        self.assertEqual(
+            self.data.stats(),
+            {"hits": 1, "misses": 1, "evictions": 0, "tickets": 1, "searches": 0},
+        )
+        self.now = 61.0
+        self.data.get_ticket("Case-001")
+        self.assertEqual(self.data_mock.get_ticket.call_count, 2)
+
+    def test_missing_ticket_is_cached(self):
+        self.data_mock.get_ticket.return_value = None
+        self.data_mock.id_exists.return_value = False
+        self.assertIsNone(self.data.get_ticket("Case-002"))
+        self.assertIsNone(self.data.get_ticket("Case-002"))
+        self.assertFalse(self.data.id_exists("Case-002"))
+        self.assertFalse(self.data.id_exists("Case-002"))
+        self.data_mock.get_ticket.assert_called_once()
+        self.data_mock.id_exists.assert_called_once()
+
+    def test_writes_invalidate_the_ticket(self):
+        self.data_mock.get_ticket.return_value = self.ticket
+        self.data_mock.id_exists.return_value = True
+        self.data.get_ticket("Case-001")
+        self.data.id_exists("Case-001")
+        self.data.get_ticket("Case-002")
+        writes = [
+            lambda: self.data.create_ticket(self.ticket),
+            lambda: self.data.update_ticket(self.ticket),
+            lambda: self.data.close_ticket(self.ticket),
+            lambda: self.data.set_ticket_state("Case-001", State.ANALYSIS),
+            lambda: self.data.update_tickets([self.ticket]),
+            lambda: self.data.close_tickets([self.ticket]),
+            lambda: self.data.create_tickets([self.ticket]),
+        ]
+        for count, write in enumerate(writes, start=2):
+            write()
+            self.data.get_ticket("Case-001")
+            self.data.id_exists("Case-001")
+            self.data.get_ticket("Case-002")
+            self.assertEqual(self.data_mock.get_ticket.call_count, count + 1)
+            self.assertEqual(self.data_mock.id_exists.call_count, count)
+
+    def test_writes_invalidate_searches(self):
+        self.data_mock.search_tickets.return_value = [self.ticket]
+        self.data_mock.search_tickets_page.return_value = ([self.ticket], None)
+        self.assertEqual(self.data.search_tickets("IUT"), [self.ticket])
+        self.data.search_tickets("IUT")
+        self.assertEqual(self.data.search_tickets_page("IUT"), ([self.ticket], None))
+        self.data.search_tickets_page("IUT")
+        self.data_mock.search_tickets.assert_called_once()
+        self.data_mock.search_tickets_page.assert_called_once_with("IUT", None, 50)
+        self.data.create_ticket(self.ticket)
+        self.data.search_tickets("IUT")
+        self.data.search_tickets_page("IUT")
+        self.assertEqual(self.data_mock.search_tickets.call_count, 2)
+        self.assertEqual(self.data_mock.search_tickets_page.call_count, 2)
+
+    def test_failed_write_invalidates(self):
+        self.data_mock.get_ticket.return_value = self.ticket
+        self.data.get_ticket("Case-001")
+        self.data_mock.update_ticket.side_effect = RuntimeError
+        with self.assertRaises(RuntimeError):
+            self.data.update_ticket(self.ticket)
+        self.data.get_ticket("Case-001")
+        self.assertEqual(self.data_mock.get_ticket.call_count, 2)
+
+    def test_read_overlapping_a_write_is_not_cached(self):
+        def read_during_write(ticket_id):
+            self.data.update_ticket(self.ticket)
+            return self.ticket
+
+        self.data_mock.get_ticket.side_effect = read_during_write
+        self.data.get_ticket("Case-001")
+        self.assertEqual(self.data.stats()["tickets"], 0)
+
+    def test_invalidate_everything(self):
+        self.data_mock.get_ticket.return_value = self.ticket
+        self.data.get_ticket("Case-001")
+        self.data.invalidate(["Case-002"])
+        self.data.get_ticket("Case-001")
+        self.data.invalidate(None)
+        self.data.get_ticket("Case-001")
+        self.assertEqual(self.data_mock.get_ticket.call_count, 2)
+
+    def test_cached_tickets_are_copies(self):
+        self.data_mock.get_ticket.return_value = self.ticket
+        self.data_mock.search_tickets.return_value = [self.ticket]
+        self.data_mock.search_tickets_page.return_value = ([self.ticket], None)
+        self.data.get_ticket("Case-001")
+        self.data.search_tickets("IUT")
+        self.data.search_tickets_page("IUT")
+        self.ticket.state = State.ANALYSIS
+        self.data.get_ticket("Case-001").state = State.ASSIGNED
+        self.data.search_tickets("IUT")[0].state = State.ASSIGNED
+        self.data.search_tickets_page("IUT")[0][0].state = State.ASSIGNED
+        self.assertEqual(self.data.get_ticket("Case-001").state, State.NEW)
+        self.assertEqual(self.data.search_tickets("IUT")[0].state, State.NEW)
+        self.assertEqual(self.data.search_tickets_page("IUT")[0][0].state, State.NEW)
+        self.data_mock.get_ticket.assert_called_once()
+
+    def test_get_tickets_is_cached(self):
+        self.data_mock.get_ticket.return_value = self.ticket
+        self.data.get_ticket("Case-001")
+        self.data_mock.get_tickets.return_value = [None]
+        tickets = self.data.get_tickets(["Case-001", "Case-002"])
+        self.assertEqual(tickets, [self.ticket, None])
+        self.data_mock.get_tickets.assert_called_once_with(["Case-002"])
+        tickets[0].state = State.CLOSED
+        self.assertEqual(
+            self.data.get_tickets(["Case-001", "Case-002"]), [self.ticket, None]
+        )
+        self.data_mock.get_tickets.assert_called_once()
+
+    def test_eviction(self):
+        self.data_mock.get_ticket.return_value = None
+        for number in range(12):
+            self.data.get_ticket(f"Case-{number:03}")
+        self.assertEqual(self.data.stats()["evictions"], 2)
+        self.assertEqual(self.data.stats()["tickets"], 10)
+
+    def test_other_reads_are_delegated(self):
+        self.data_mock.count_tar_3.return_value = {"new": 1}
+        self.assertEqual(self.data.count_tar_3(), {"new": 1})
+        self.data.get_tar_3_page("new")
+        self.data_mock.get_tar_3_page.assert_called_once_with("new", None, 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
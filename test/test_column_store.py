@@ -0,0 +1,55 @@
+import unittest
+from src.column_store import ColumnStore, mask_and, mask_or
+from src.ticket import Ticket
+from src.constants import State, Responsible, Type
+from test import test_backlog
+
+
+class ColumnStoreBacklogTest(test_backlog.BacklogTest):
+    data_class = ColumnStore
+
+
+class ColumnStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.store = ColumnStore()
+        self.ticket = Ticket(
+            "Case-001",
+            "IUT",
+            "IUT is not working",
+            Type.PR,
+            State.NEW,
+            Responsible.L1,
+        )
+        self.store.create_ticket(self.ticket)
+
+    def test_masks(self):
+        self.assertEqual(mask_and(b"\x01\x01\x00", b"\x01\x00\x00"), b"\x01\x00\x00")
+        self.assertEqual(mask_or(b"\x01\x00\x00", b"\x00\x00\x01"), b"\x01\x00\x01")
+
+    def test_columns(self):
+        self.assertEqual(self.store.ids, ["Case-001"])
+        self.assertEqual(list(self.store.timestamps), [self.ticket.get_timestamp()])
+        self.assertEqual(len(self.store.states), 1)
+
+    def test_get_ticket_returns_copy(self):
+        ticket = self.store.get_ticket("Case-001")
+        self.assertEqual(ticket, self.ticket)
+        ticket.state = State.ANALYSIS
+        self.assertEqual(self.store.get_ticket("Case-001").state, State.NEW)
+
+    def test_recreate_closed_ticket(self):
+        self.store.close_ticket(self.ticket)
+        self.assertFalse(self.store.id_exists("Case-001"))
+        self.assertTrue(self.store.create_ticket(self.ticket))
+        self.assertEqual(self.store.tickets, [self.ticket])
+        self.assertEqual(self.store.deleted_tickets[0].state, State.CLOSED)
+
+    def test_replace_tickets_keeps_closed_tickets(self):
+        self.store.close_ticket(self.ticket)
+        self.store.tickets = []
+        self.assertEqual(len(self.store.deleted_tickets), 1)
+        self.assertEqual(self.store.tickets, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
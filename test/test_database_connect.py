@@ -0,0 +1,404 @@
+import os
+import threading
+import unittest
+from unittest.mock import MagicMock, call, patch
+
+import psycopg2
+import psycopg2.errors
+
+from src.database.database_connect import DatabaseConnect
+
+
+class DatabaseConnectTest(unittest.TestCase):
+    @patch.dict(os.environ)
+    @patch("src.database.database_connect.psycopg2.connect")
+    def test_connect_single(self, connect_mock):
+        os.environ.pop("DATABASE_POOL_MAX", None)
+        database_connection = DatabaseConnect()
+        database_connection.connect()
+        self.assertIsNone(database_connection.pool)
+        self.assertTrue(connect_mock.return_value.autocommit)
+        cursor = connect_mock.return_value.cursor.return_value
+        cursor.fetchall.return_value = [("Case-001",)]
+        result = database_connection.fetch("SELECT id FROM ticket")
+        self.assertEqual(result, [("Case-001",)])
+        cursor.execute.assert_called_once_with("SELECT id FROM ticket", None)
+        cursor.close.assert_called_once()
+
+    @patch.dict(os.environ, {"DATABASE_ITERSIZE": "100"})
+    @patch("src.database.database_connect.psycopg2.connect")
+    def test_stream_single(self, connect_mock):
+        os.environ.pop("DATABASE_POOL_MAX", None)
+        shared_connection = MagicMock()
+        stream_connection = MagicMock()
+        stream_connection.closed = 0
+        connect_mock.side_effect = [shared_connection, stream_connection]
+        database_connection = DatabaseConnect()
+        database_connection.connect()
+        cursor = stream_connection.cursor.return_value
+        cursor.__iter__.return_value = iter([("Case-001",), ("Case-002",)])
+        rows = database_connection.stream("SELECT id FROM ticket")
+        self.assertEqual(next(rows), ("Case-001",))
+        self.assertFalse(stream_connection.autocommit)
+        self.assertIsNotNone(stream_connection.cursor.call_args.kwargs["name"])
+        self.assertEqual(cursor.itersize, 100)
+        rows.close()
+        cursor.close.assert_called_once()
+        stream_connection.rollback.assert_called_once()
+        stream_connection.close.assert_called_once()
+        shared_connection.cursor.assert_not_called()
+
+    @patch.dict(os.environ, {"DATABASE_GROUP_COMMIT_SIZE": "10"})
+    @patch("src.database.database_connect.psycopg2.connect")
+    def test_group_commit_single_read_keeps_group(self, connect_mock):
+        os.environ.pop("DATABASE_POOL_MAX", None)
+        connection = connect_mock.return_value
+        connection.closed = 0
+        database_connection = DatabaseConnect()
+        database_connection.connect()
+        database_connection.group_delay = 60
+        database_connection.execute("UPDATE ticket SET state = 'new'")
+        cursor = connection.cursor.return_value
+        cursor.closed = False
+        cursor.fetchall.return_value = [("Case-001",)]
+        result = database_connection.fetch("SELECT id FROM ticket")
+        self.assertEqual(result, [("Case-001",)])
+        cursor.execute.assert_called_with(
+            "SAVEPOINT group_read; SELECT id FROM ticket", None
+        )
+        cursor.execute.side_effect = [psycopg2.errors.UndefinedColumn, None]
+        with self.assertRaises(psycopg2.errors.UndefinedColumn):
+            database_connection.fetch("SELECT missing FROM ticket")
+        cursor.execute.assert_called_with("ROLLBACK TO SAVEPOINT group_read")
+        connection.commit.assert_not_called()
+        connection.rollback.assert_not_called()
+        self.assertIs(database_connection._group_connection, connection)
+        database_connection.flush()
+        connection.commit.assert_called_once()
+        self.assertTrue(connection.autocommit)
+
+    @patch("src.database.database_connect.psycopg2.connect")
+    def test_prepared_statement(self, connect_mock):
+        first_connection, second_connection = MagicMock(), MagicMock()
+        connect_mock.side_effect = [first_connection, second_connection]
+        database_connection = DatabaseConnect()
+        database_connection.prepare(
+            "get_ticket", "SELECT * FROM ticket WHERE id = %s AND state != %s;"
+        )
+        with self.assertRaises(ValueError):
+            database_connection.prepare("get ticket", "SELECT 1")
+        database_connection.connect()
+        cursor = first_connection.cursor.return_value
+        cursor.connection = first_connection
+        database_connection.fetchone("get_ticket", ("Case-001", "closed"))
+        self.assertEqual(
+            cursor.execute.call_args_list,
+            [
+                call(
+                    "PREPARE get_ticket AS"
+                    " SELECT * FROM ticket WHERE id = $1 AND state != $2"
+                ),
+                call("EXECUTE get_ticket (%s, %s)", ("Case-001", "closed")),
+            ],
+        )
+        database_connection.fetchone("get_ticket", ("Case-002", "closed"))
+        cursor.execute.assert_called_with(
+            "EXECUTE get_ticket (%s, %s)", ("Case-002", "closed")
+        )
+        database_connection.disconnect()
+        database_connection.connect()
+        cursor = second_connection.cursor.return_value
+        cursor.connection = second_connection
+        database_connection.fetchone("get_ticket", ("Case-003", "closed"))
+        self.assertTrue(cursor.execute.call_args_list[0].args[0].startswith("PREPARE"))
+
+    @patch("src.database.database_connect.psycopg2.connect")
+    def test_lost_prepared_statement_is_prepared_again(self, connect_mock):
+        connection = connect_mock.return_value
+        connection.autocommit = True
+        cursor = connection.cursor.return_value
+        cursor.connection = connection
+        database_connection = DatabaseConnect()
+        database_connection.prepare("get_ticket", "SELECT * FROM ticket")
+        database_connection.connect()
+        database_connection.fetch("get_ticket")
+        cursor.execute.side_effect = [
+            psycopg2.errors.InvalidSqlStatementName,
+            None,
+            None,
+        ]
+        database_connection.fetch("get_ticket")
+        self.assertEqual(
+            cursor.execute.call_args_list[2:],
+            [
+                call("EXECUTE get_ticket", ()),
+                call("PREPARE get_ticket AS SELECT * FROM ticket"),
+                call("EXECUTE get_ticket", ()),
+            ],
+        )
+
+    @patch("src.database.database_connect.psycopg2.connect")
+    def test_failed_execution_keeps_statement_prepared(self, connect_mock):
+        connection = connect_mock.return_value
+        connection.closed = 0
+        cursor = connection.cursor.return_value
+        cursor.connection = connection
+        database_connection = DatabaseConnect()
+        database_connection.prepare("close_ticket", "UPDATE ticket SET state = %s")
+        database_connection.connect()
+        cursor.execute.side_effect = [None, psycopg2.errors.CheckViolation]
+        with self.assertRaises(psycopg2.errors.CheckViolation):
+            with database_connection.transaction():
+                database_connection.execute("close_ticket", ("closed",))
+        connection.rollback.assert_called_once()
+        cursor.execute.side_effect = None
+        cursor.execute.reset_mock()
+        with database_connection.transaction():
+            database_connection.execute("close_ticket", ("closed",))
+        cursor.execute.assert_called_once_with("EXECUTE close_ticket (%s)", ("closed",))
+        connection.commit.assert_called_once()
+
+    @patch("src.database.database_connect.psycopg2.connect")
+    def test_listen(self, connect_mock):
+        database_connection = DatabaseConnect()
+        connection = database_connection.listen("ticket_changed")
+        self.assertIs(connection, connect_mock.return_value)
+        self.assertTrue(connection.autocommit)
+        cursor = connection.cursor.return_value.__enter__.return_value
+        cursor.execute.assert_called_once_with("LISTEN ticket_changed")
+        with self.assertRaises(ValueError):
+            database_connection.listen("ticket; DROP TABLE ticket")
+
+    @patch.dict(os.environ, {"DATABASE_SYNCHRONOUS_COMMIT": "off"})
+    def test_synchronous_commit(self):
+        parameters = DatabaseConnect.connection_parameters()
+        self.assertEqual(parameters["options"], "-c synchronous_commit=off")
+
+
+class DatabaseConnectPoolTest(unittest.TestCase):
+    def setUp(self):
+        patcher = patch(
+            "src.database.database_connect.psycopg2.pool.ThreadedConnectionPool"
+        )
+        self.pool_class_mock = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.pool_mock = self.pool_class_mock.return_value
+        self.connection = self.new_connection()
+        self.pool_mock.getconn.return_value = self.connection
+        with patch.dict(
+            os.environ, {"DATABASE_POOL_MIN": "2", "DATABASE_POOL_MAX": "5"}
+        ):
+            self.database_connection = DatabaseConnect()
+            self.database_connection.connect()
+
+    @staticmethod
+    def new_connection():
+        connection = MagicMock()
+        connection.closed = 0
+        connection.info.transaction_status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+        return connection
+
+    def test_connect(self):
+        args = self.pool_class_mock.call_args
+        self.assertEqual(args.args, (2, 5))
+        self.assertIsNone(self.database_connection.connection)
+
+    def test_fetchone_checks_connection_in(self):
+        cursor = self.connection.cursor.return_value
+        cursor.fetchone.return_value = ("Case-001",)
+        result = self.database_connection.fetchone("SELECT id FROM ticket")
+        self.assertEqual(result, ("Case-001",))
+        self.pool_mock.putconn.assert_called_once_with(self.connection, close=False)
+        self.assertTrue(self.connection.autocommit)
+
+    def test_dead_connection_is_replaced(self):
+        dead_connection = self.new_connection()
+        dead_connection.closed = 2
+        self.pool_mock.getconn.side_effect = [dead_connection, self.connection]
+        self.database_connection.execute("UPDATE ticket SET state = 'new'")
+        self.pool_mock.putconn.assert_any_call(dead_connection, close=True)
+        self.pool_mock.putconn.assert_any_call(self.connection, close=False)
+        self.connection.cursor.return_value.execute.assert_called_once()
+
+    def test_read_is_retried_on_connection_error(self):
+        broken_connection = self.new_connection()
+        broken_connection.cursor.return_value.execute.side_effect = (
+            psycopg2.OperationalError
+        )
+        self.pool_mock.getconn.side_effect = [broken_connection, self.connection]
+        self.connection.cursor.return_value.fetchall.return_value = []
+        result = self.database_connection.fetch("SELECT id FROM ticket")
+        self.assertEqual(result, [])
+        self.pool_mock.putconn.assert_any_call(broken_connection, close=True)
+
+    def test_write_is_not_retried(self):
+        self.connection.cursor.return_value.execute.side_effect = (
+            psycopg2.OperationalError
+        )
+        with self.assertRaises(psycopg2.OperationalError):
+            self.database_connection.execute("UPDATE ticket SET state = 'new'")
+        self.pool_mock.putconn.assert_called_once_with(self.connection, close=True)
+        self.assertEqual(self.pool_mock.getconn.call_count, 1)
+
+    def test_idle_connection_is_pinged(self):
+        self.database_connection.ping_idle = 0
+        dropped_connection = self.new_connection()
+        dropped_connection.cursor.return_value.execute.side_effect = (
+            psycopg2.OperationalError
+        )
+        self.pool_mock.getconn.side_effect = [dropped_connection, self.connection]
+        self.database_connection.execute("UPDATE ticket SET state = 'new'")
+        self.pool_mock.putconn.assert_any_call(dropped_connection, close=True)
+        self.connection.cursor.return_value.execute.assert_has_calls(
+            [call("SELECT 1"), call("UPDATE ticket SET state = 'new'", None)]
+        )
+
+    def test_recently_used_connection_is_not_pinged(self):
+        self.database_connection.fetch("SELECT id FROM ticket")
+        self.database_connection.fetch("SELECT id FROM ticket")
+        self.assertNotIn(
+            call("SELECT 1"),
+            self.connection.cursor.return_value.execute.call_args_list,
+        )
+
+    @patch("src.database.database_connect.psycopg2.connect")
+    def test_stream_uses_own_connection(self, connect_mock):
+        stream_connection = self.new_connection()
+        connect_mock.return_value = stream_connection
+        cursor = stream_connection.cursor.return_value
+        cursor.__iter__.return_value = iter([("Case-001",)])
+        rows = list(
+            self.database_connection.stream("SELECT id FROM ticket", itersize=10)
+        )
+        self.assertEqual(rows, [("Case-001",)])
+        self.assertEqual(cursor.itersize, 10)
+        stream_connection.rollback.assert_called_once()
+        stream_connection.close.assert_called_once()
+        self.pool_mock.getconn.assert_not_called()
+
+    @patch("src.database.database_connect.psycopg2.connect")
+    def test_unfinished_streams_do_not_block_queries(self, connect_mock):
+        def new_stream_connection(**kwargs):
+            connection = self.new_connection()
+            cursor = connection.cursor.return_value
+            cursor.__iter__.return_value = iter([("Case-001",), ("Case-002",)])
+            return connection
+
+        connect_mock.side_effect = new_stream_connection
+        streams = [
+            self.database_connection.stream("SELECT id FROM ticket") for _ in range(4)
+        ]
+        for rows in streams:
+            self.assertEqual(next(rows), ("Case-001",))
+        stream_slots = self.database_connection.stream_slots
+        self.assertFalse(stream_slots.acquire(blocking=False))
+        self.database_connection.fetch("SELECT id FROM ticket")
+        self.pool_mock.putconn.assert_called_once_with(self.connection, close=False)
+        streams[0].close()
+        self.assertTrue(stream_slots.acquire(blocking=False))
+
+    @patch("src.database.database_connect.psycopg2.extras.execute_values")
+    def test_execute_values_single_transaction(self, execute_values_mock):
+        self.connection.cursor.return_value.connection = self.connection
+        execute_values_mock.return_value = [("Case-001",)]
+        result = self.database_connection.execute_values(
+            "INSERT INTO ticket (id) VALUES %s RETURNING id", [("Case-001",)]
+        )
+        self.assertEqual(result, [("Case-001",)])
+        self.assertTrue(execute_values_mock.call_args.kwargs["fetch"])
+        self.connection.commit.assert_called_once()
+        self.assertTrue(self.connection.autocommit)
+        execute_values_mock.side_effect = psycopg2.DataError
+        with self.assertRaises(psycopg2.DataError):
+            self.database_connection.execute_values("INSERT", [("Case-001",)])
+        self.connection.rollback.assert_called_once()
+
+    def test_transaction(self):
+        cursor = self.connection.cursor.return_value
+        cursor.connection = self.connection
+        with self.database_connection.transaction() as transaction_cursor:
+            self.assertFalse(self.connection.autocommit)
+            with self.database_connection.transaction() as nested_cursor:
+                self.assertIs(nested_cursor, transaction_cursor)
+            self.database_connection.execute("UPDATE ticket SET state = 'new'")
+            self.connection.commit.assert_not_called()
+        self.connection.commit.assert_called_once()
+        self.assertTrue(self.connection.autocommit)
+        self.assertEqual(self.pool_mock.getconn.call_count, 1)
+        cursor.close.assert_called_once()
+
+    def test_transaction_rolls_back_on_error(self):
+        self.connection.cursor.return_value.connection = self.connection
+        with self.assertRaises(ValueError):
+            with self.database_connection.transaction():
+                raise ValueError
+        self.connection.rollback.assert_called_once()
+        self.connection.commit.assert_not_called()
+        self.assertTrue(self.connection.autocommit)
+
+    def test_group_commit_by_size(self):
+        self.database_connection.group_size = 2
+        self.database_connection.group_delay = 60
+        cursor = self.connection.cursor.return_value
+        self.database_connection.execute("UPDATE ticket SET state = 'new'")
+        self.connection.commit.assert_not_called()
+        self.assertFalse(self.connection.autocommit)
+        self.assertEqual(
+            cursor.execute.call_args.args[0],
+            "SAVEPOINT group_write; UPDATE ticket SET state = 'new'",
+        )
+        self.database_connection.execute("UPDATE ticket SET state = 'closed'")
+        self.connection.commit.assert_called_once()
+        self.assertTrue(self.connection.autocommit)
+        self.pool_mock.putconn.assert_called_once_with(self.connection, close=False)
+        self.assertIsNone(self.database_connection._group_timer)
+
+    def test_group_commit_flushed_before_read(self):
+        self.database_connection.group_size = 10
+        self.database_connection.group_delay = 60
+        self.database_connection.execute("UPDATE ticket SET state = 'new'")
+        self.connection.commit.assert_not_called()
+        self.database_connection.fetch("SELECT id FROM ticket")
+        self.connection.commit.assert_called_once()
+
+    def test_group_commit_not_flushed_before_read_of_other_thread(self):
+        self.database_connection.group_size = 10
+        self.database_connection.group_delay = 60
+        self.database_connection.execute("UPDATE ticket SET state = 'new'")
+        thread = threading.Thread(
+            target=self.database_connection.fetch, args=("SELECT id FROM ticket",)
+        )
+        thread.start()
+        thread.join()
+        self.connection.commit.assert_not_called()
+        self.database_connection.flush()
+        self.connection.commit.assert_called_once()
+
+    def test_group_commit_failed_write_is_rolled_back(self):
+        self.database_connection.group_size = 10
+        self.database_connection.group_delay = 60
+        cursor = self.connection.cursor.return_value
+        cursor.execute.side_effect = [psycopg2.IntegrityError, None]
+        with self.assertRaises(psycopg2.IntegrityError):
+            self.database_connection.execute("INSERT INTO ticket (id) VALUES ('x')")
+        cursor.execute.assert_called_with("ROLLBACK TO SAVEPOINT group_write")
+        self.assertEqual(self.database_connection._group_pending, 0)
+        self.database_connection.flush()
+        self.connection.commit.assert_called_once()
+
+    def test_disconnect_flushes_group(self):
+        self.database_connection.group_size = 10
+        self.database_connection.group_delay = 60
+        self.database_connection.execute("UPDATE ticket SET state = 'new'")
+        self.database_connection.disconnect()
+        self.connection.commit.assert_called_once()
+        self.pool_mock.closeall.assert_called_once()
+
+    def test_disconnect(self):
+        self.database_connection.disconnect()
+        self.pool_mock.closeall.assert_called_once()
+        self.assertIsNone(self.database_connection.pool)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,9 @@
 import datetime
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, call
 
 from src.database.database_connect import DatabaseConnect
-from src.db import DB
+from src.db import DB, PREPARED_STATEMENTS
 from src.constants import State, Responsible, Type
 from src.ticket import Ticket
 
@@ -32,6 +32,17 @@ class DBTest(unittest.TestCase):
             datetime.datetime(2024, 2, 5, 20, 5, 59, 375458),
         )
 
+    def test_prepared_statements(self):
+        for name, query in PREPARED_STATEMENTS.items():
+            self.database_connection_mock.prepare.assert_any_call(name, query)
+        self.assertIn("t.id = ANY(%s)", PREPARED_STATEMENTS["get_tickets"])
+        self.assertLess(
+            self.database_connection_mock.method_calls.index(
+                call.prepare("get_ticket", PREPARED_STATEMENTS["get_ticket"])
+            ),
+            self.database_connection_mock.method_calls.index(call.connect()),
+        )
+
     def test_data_to_ticket(self):
         ticket = self.db.data_to_ticket(self.data)
         self.assertEqual(ticket.id, "Case-011")
@@ -94,50 +105,43 @@ class DBTest(unittest.TestCase):
 
     def test_get_ticket(self):
         self.database_connection_mock.fetchone.return_value = self.data
-        query = """
-            SELECT t.id,t.name,t.description,t.ticket_type,t.state,t.responsible,t.date_created 
-            FROM  ticket t 
-            WHERE t.id = %s AND t.state != %s 
-        """
         data = ("Case-011", State.CLOSED.value)
         result = self.db.get_ticket("Case-011")
-        self.database_connection_mock.fetchone.assert_called_once_with(query, data)
+        self.database_connection_mock.fetchone.assert_called_once_with(
+            "get_ticket", data
+        )
         self.assertEqual(result.id, "Case-011")
 
     def test_get_ticket_not_found(self):
         self.database_connection_mock.fetchone.return_value = None
-        query = """
-            SELECT t.id,t.name,t.description,t.ticket_type,t.state,t.responsible,t.date_created 
-            FROM  ticket t 
-            WHERE t.id = %s AND t.state != %s 
-        """
         data = ("Case-011", State.CLOSED.value)
         result = self.db.get_ticket("Case-011")
-        self.database_connection_mock.fetchone.assert_called_once_with(query, data)
+        self.database_connection_mock.fetchone.assert_called_once_with(
+            "get_ticket", data
+        )
         self.assertIsNone(result)
 
     def test_id_exists(self):
         self.database_connection_mock.fetchone.return_value = self.data
-        query = "SELECT * FROM ticket WHERE id = %s AND state != %s"
         data = ("Case-011", State.CLOSED.value)
         result = self.db.id_exists("Case-011")
-        self.database_connection_mock.fetchone.assert_called_once_with(query, data)
+        self.database_connection_mock.fetchone.assert_called_once_with(
+            "id_exists", data
+        )
         self.assertTrue(result)
 
     def test_id_not_exists(self):
         self.database_connection_mock.fetchone.return_value = None
-        query = "SELECT * FROM ticket WHERE id = %s AND state != %s"
         data = ("Case-011", State.CLOSED.value)
         result = self.db.id_exists("Case-011")
-        self.database_connection_mock.fetchone.assert_called_once_with(query, data)
+        self.database_connection_mock.fetchone.assert_called_once_with(
+            "id_exists", data
+        )
         self.assertFalse(result)
 
     def test_create_ticket(self):
-        self.db.create_ticket(self.ticket)
-        query = """
-            INSERT INTO ticket (id, name, description, ticket_type, state, responsible)
-            VALUES (%s, %s, %s, %s, %s, %s);
-        """
+        self.database_connection_mock.execute_returning.return_value = [self.data]
+        result = self.db.create_ticket(self.ticket)
         data = (
             "Case-011",
             "name",
@@ -146,17 +150,16 @@ class DBTest(unittest.TestCase):
             State.ANALYSIS.value,
             Responsible.L2.value,
         )
-        self.database_connection_mock.execute.assert_called_once_with(query, data)
+        self.database_connection_mock.execute_returning.assert_called_once_with(
+            "create_ticket", data
+        )
+        self.assertIn("RETURNING", PREPARED_STATEMENTS["create_ticket"])
+        self.assertEqual(result, self.ticket)
 
     def test_update_ticket(self):
-        self.database_connection_mock.fetchone.return_value = self.data
+        self.database_connection_mock.execute_returning.return_value = [("Case-011",)]
         self.db.database_connection = self.database_connection_mock
-        self.db.update_ticket(self.ticket)
-        query = """
-            UPDATE ticket 
-            SET name = %s, description = %s, ticket_type = %s, state = %s, responsible = %s
-            WHERE id = %s
-        """
+        result = self.db.update_ticket(self.ticket)
         data = (
             "name",
             "details",
@@ -164,38 +167,110 @@ class DBTest(unittest.TestCase):
             State.ANALYSIS.value,
             Responsible.L2.value,
             "Case-011",
+            State.CLOSED.value,
+        )
+        self.assertTrue(result)
+        self.database_connection_mock.execute_returning.assert_called_once_with(
+            "update_ticket", data
         )
-        self.database_connection_mock.execute.assert_called_once_with(query, data)
+        self.database_connection_mock.fetchone.assert_not_called()
 
     def test_update_ticket_not_found(self):
-        self.database_connection_mock.fetchone.return_value = None
+        self.database_connection_mock.execute_returning.return_value = []
         self.db.database_connection = self.database_connection_mock
         result = self.db.update_ticket(self.ticket)
         self.assertFalse(result)
 
     def test_close_ticket(self):
-        self.database_connection_mock.fetchone.return_value = self.data
+        self.database_connection_mock.execute_returning.return_value = [("Case-011",)]
         self.db.database_connection = self.database_connection_mock
         self.ticket.state = State.CLOSED
-        query = """
-            UPDATE ticket 
-            SET state = %s
-            WHERE id = %s
-        """
         data = (
             State.CLOSED.value,
             "Case-011",
+            State.CLOSED.value,
         )
         result = self.db.close_ticket(self.ticket)
         self.assertTrue(result)
-        self.database_connection_mock.execute.assert_called_once_with(query, data)
+        self.database_connection_mock.execute_returning.assert_called_once_with(
+            "close_ticket", data
+        )
+        self.database_connection_mock.fetchone.assert_not_called()
 
     def test_close_ticket_not_found(self):
-        self.database_connection_mock.fetchone.return_value = None
+        self.database_connection_mock.execute_returning.return_value = []
         self.db.database_connection = self.database_connection_mock
         result = self.db.close_ticket(self.ticket)
         self.assertFalse(result)
 
+    def test_set_ticket_state(self):
+        self.database_connection_mock.execute_returning.return_value = [self.data]
+        result = self.db.set_ticket_state("Case-011", State.ANALYSIS, Responsible.L2)
+        query = """
+            UPDATE ticket t 
+            SET state = %s, responsible = %s
+            WHERE t.id = %s AND t.state != %s
+            RETURNING t.id,t.name,t.description,t.ticket_type,t.state,t.responsible,t.date_created
+        """
+        self.assertEqual(PREPARED_STATEMENTS["set_ticket_state_responsible"], query)
+        data = (
+            State.ANALYSIS.value,
+            Responsible.L2.value,
+            "Case-011",
+            State.CLOSED.value,
+        )
+        self.database_connection_mock.execute_returning.assert_called_once_with(
+            "set_ticket_state_responsible", data
+        )
+        self.assertEqual(result, self.ticket)
+
+    def test_set_ticket_state_only_responsible(self):
+        self.database_connection_mock.execute_returning.return_value = []
+        result = self.db.set_ticket_state(
+            "Case-011", State.CLOSED, only_responsible=Responsible.L1
+        )
+        query = """
+            UPDATE ticket t 
+            SET state = %s
+            WHERE t.id = %s AND t.state != %s AND t.responsible = %s
+            RETURNING t.id,t.name,t.description,t.ticket_type,t.state,t.responsible,t.date_created
+        """
+        self.assertEqual(
+            PREPARED_STATEMENTS["set_ticket_state_only_responsible"], query
+        )
+        data = (
+            State.CLOSED.value,
+            "Case-011",
+            State.CLOSED.value,
+            Responsible.L1.value,
+        )
+        self.database_connection_mock.execute_returning.assert_called_once_with(
+            "set_ticket_state_only_responsible", data
+        )
+        self.assertIsNone(result)
+
+    def test_filter_tickets(self):
+        self.database_connection_mock.fetch.return_value = [self.data]
+        result = self.db.filter_tickets(State.ANALYSIS, Responsible.L2)
+        query = """
+            SELECT t.id,t.name,t.description,t.ticket_type,t.state,t.responsible,t.date_created 
+            FROM ticket t 
+            WHERE t.state != %s AND t.state = %s AND t.responsible = %s"""
+        data = (State.CLOSED.value, State.ANALYSIS.value, Responsible.L2.value)
+        self.database_connection_mock.fetch.assert_called_once_with(query, data)
+        self.assertEqual(len(result), 1)
+
+    def test_filter_tickets_by_type(self):
+        self.database_connection_mock.fetch.return_value = []
+        result = self.db.filter_tickets(ticket_type=Type.IR)
+        query = """
+            SELECT t.id,t.name,t.description,t.ticket_type,t.state,t.responsible,t.date_created 
+            FROM ticket t 
+            WHERE t.state != %s AND t.ticket_type = %s"""
+        data = (State.CLOSED.value, Type.IR.value)
+        self.database_connection_mock.fetch.assert_called_once_with(query, data)
+        self.assertEqual(result, [])
+
     def test_get_old_new_ticket(self):
         self.database_connection_mock.fetch.return_value = [self.data]
         result = self.db.get_old_new_ticket()
@@ -231,6 +306,219 @@ class DBTest(unittest.TestCase):
         self.database_connection_mock.fetch.assert_called_once_with(query)
         self.assertEqual(len(result), 1)
 
+    def test_get_tar_3(self):
+        self.database_connection_mock.fetch.return_value = [
+            self.data + (True, False, True),
+            self.data + (False, False, True),
+        ]
+        result = self.db.get_tar_3()
+        self.database_connection_mock.fetch.assert_called_once()
+        self.assertEqual(
+            self.database_connection_mock.fetch.call_args.args[1],
+            (
+                State.NEW.value,
+                State.ASSIGNED.value,
+                State.NEW.value,
+                State.ASSIGNED.value,
+            ),
+        )
+        self.assertEqual(len(result["new"]), 1)
+        self.assertEqual(result["assigned"], [])
+        self.assertEqual(len(result["all"]), 2)
+        self.assertEqual(result["all"][0], self.ticket)
+
+    def test_count_tar_3(self):
+        self.database_connection_mock.fetchone.return_value = (1, 0, 3)
+        result = self.db.count_tar_3()
+        self.database_connection_mock.fetchone.assert_called_once()
+        query, data = self.database_connection_mock.fetchone.call_args.args
+        self.assertIn("count(*) FILTER", query)
+        self.assertEqual(data, (State.NEW.value, State.ASSIGNED.value))
+        self.assertEqual(result, {"new": 1, "assigned": 0, "all": 3})
+        self.database_connection_mock.fetch.assert_not_called()
+
+    def test_get_tar_3_page(self):
+        self.database_connection_mock.fetch.return_value = [self.data, self.data]
+        tickets, cursor = self.db.get_tar_3_page("new", limit=1)
+        query, data = self.database_connection_mock.fetch.call_args.args
+        self.assertNotIn("(t.date_created, t.id) >", query)
+        self.assertEqual(data, (State.NEW.value, 2))
+        self.assertEqual(tickets, [self.ticket])
+        self.assertEqual(cursor, (self.data[6], self.data[0]))
+        self.database_connection_mock.fetch.return_value = [self.data]
+        tickets, cursor = self.db.get_tar_3_page("new", cursor, limit=1)
+        query, data = self.database_connection_mock.fetch.call_args.args
+        self.assertIn("(t.date_created, t.id) > (%s, %s)", query)
+        self.assertEqual(data, (State.NEW.value, self.data[6], self.data[0], 2))
+        self.assertEqual(tickets, [self.ticket])
+        self.assertIsNone(cursor)
+
+    def test_search_tickets_page(self):
+        self.database_connection_mock.fetch.return_value = [self.data]
+        cursor = (self.data[6], "Case-010")
+        tickets, next_cursor = self.db.search_tickets_page("keyword_test", cursor, 20)
+        query, data = self.database_connection_mock.fetch.call_args.args
+        self.assertIn("OR t.responsible LIKE %s)", query)
+        self.assertTrue(
+            query.endswith(
+                " AND (t.date_created, t.id) > (%s, %s)"
+                " ORDER BY t.date_created, t.id LIMIT %s"
+            )
+        )
+        self.assertEqual(data[1], "%keyword_test%")
+        self.assertEqual(data[-3:], (self.data[6], "Case-010", 21))
+        self.assertEqual(tickets, [self.ticket])
+        self.assertIsNone(next_cursor)
+
+    def test_search_tickets_full_text(self):
+        self.db.full_text_search = True
+        self.database_connection_mock.fetch.return_value = [self.data]
+        result = self.db.search_tickets("not working")
+        query, data = self.database_connection_mock.fetch.call_args.args
+        self.assertIn("websearch_to_tsquery('english', %s) q", query)
+        self.assertIn("t.search_vector @@ q", query)
+        self.assertNotIn("LIKE", query)
+        self.assertTrue(
+            query.endswith(
+                " ORDER BY ts_rank(t.search_vector, q) DESC, t.date_created, t.id"
+            )
+        )
+        self.assertEqual(data[:2], ("not working", State.CLOSED.value))
+        self.assertEqual(result, [self.ticket])
+
+    def test_search_tickets_full_text_id_fallback(self):
+        self.db.full_text_search = True
+        self.database_connection_mock.fetch.return_value = []
+        for keyword in ("Case-0", "L1", "42"):
+            self.db.search_tickets(keyword)
+            query, data = self.database_connection_mock.fetch.call_args.args
+            self.assertIn("t.id LIKE %s", query)
+            self.assertEqual(data[1], f"%{keyword}%")
+            self.db.search_tickets_page(keyword)
+            query, data = self.database_connection_mock.fetch.call_args.args
+            self.assertIn("t.id LIKE %s", query)
+            self.assertTrue(query.endswith(" ORDER BY t.date_created, t.id LIMIT %s"))
+
+    def test_search_tickets_page_full_text(self):
+        self.db.full_text_search = True
+        self.database_connection_mock.fetch.return_value = []
+        self.database_connection_mock.fetch.return_value = [
+            self.data + (0.5,),
+            self.data + (0.5,),
+        ]
+        tickets, cursor = self.db.search_tickets_page("printer", limit=1)
+        query, data = self.database_connection_mock.fetch.call_args.args
+        self.assertIn("t.search_vector @@ q", query)
+        self.assertTrue(
+            query.endswith(
+                " ORDER BY ts_rank(t.search_vector, q) DESC, t.date_created, t.id"
+                " LIMIT %s"
+            )
+        )
+        self.assertEqual(tickets, [self.ticket])
+        self.assertEqual(cursor, (0.5, self.data[6], self.data[0]))
+        self.db.search_tickets_page("printer", cursor, limit=1)
+        query, data = self.database_connection_mock.fetch.call_args.args
+        self.assertIn("ts_rank(t.search_vector, q) < %s::real", query)
+        self.assertEqual(data[-5:], (0.5, 0.5, self.data[6], self.data[0], 2))
+
+    def test_stream_search_tickets(self):
+        self.database_connection_mock.stream.return_value = iter([self.data])
+        result = self.db.stream_search_tickets("keyword_test", itersize=10)
+        self.database_connection_mock.stream.assert_not_called()
+        self.assertEqual(list(result), [self.ticket])
+        query, data, itersize = self.database_connection_mock.stream.call_args.args
+        self.assertEqual(data[1], "%keyword_test%")
+        self.assertEqual(itersize, 10)
+        self.database_connection_mock.fetch.assert_not_called()
+
+    def test_stream_filter_tickets(self):
+        self.database_connection_mock.stream.return_value = iter([])
+        self.assertEqual(list(self.db.stream_filter_tickets(State.NEW)), [])
+        query, data, itersize = self.database_connection_mock.stream.call_args.args
+        self.assertEqual(data, (State.CLOSED.value, State.NEW.value))
+        self.assertIsNone(itersize)
+
+    def test_stream_tar_3(self):
+        self.database_connection_mock.stream.return_value = iter([self.data])
+        self.assertEqual(list(self.db.stream_tar_3("assigned")), [self.ticket])
+        query, data, itersize = self.database_connection_mock.stream.call_args.args
+        self.assertIn("ORDER BY t.date_created, t.id", query)
+        self.assertEqual(data, (State.ASSIGNED.value,))
+
+    def test_get_tickets(self):
+        self.database_connection_mock.fetch.return_value = [self.data]
+        result = self.db.get_tickets(["Case-010", "Case-011"])
+        self.database_connection_mock.fetch.assert_called_once_with(
+            "get_tickets", (["Case-010", "Case-011"], State.CLOSED.value)
+        )
+        self.assertEqual(result, [None, self.ticket])
+
+    def test_create_tickets(self):
+        self.database_connection_mock.execute_values.return_value = [("Case-011",)]
+        other = Ticket("Case-012", "n", "d", Type.IR, State.NEW, Responsible.L1)
+        result = self.db.create_tickets([self.ticket, other, self.ticket])
+        self.database_connection_mock.execute_values.assert_called_once()
+        query, rows = self.database_connection_mock.execute_values.call_args.args
+        self.assertIn("ON CONFLICT (id) DO NOTHING", query)
+        self.assertEqual([row[0] for row in rows], ["Case-011", "Case-012"])
+        self.assertEqual(result, [True, False, False])
+
+    def test_update_tickets(self):
+        self.database_connection_mock.execute_values.return_value = [("Case-011",)]
+        other = Ticket("Case-012", "n", "d", Type.IR, State.NEW, Responsible.L1)
+        changed = Ticket("Case-011", "n", "d", Type.IR, State.NEW, Responsible.L1)
+        result = self.db.update_tickets([self.ticket, other, changed])
+        query, rows = self.database_connection_mock.execute_values.call_args.args
+        self.assertIn("FROM (VALUES %s)", query)
+        self.assertIn("t.state != v.closed", query)
+        self.assertNotIn("'closed'", query)
+        self.assertEqual(
+            rows,
+            [
+                (
+                    "Case-011",
+                    "name",
+                    "details",
+                    Type.PR.value,
+                    State.ANALYSIS.value,
+                    Responsible.L2.value,
+                    State.CLOSED.value,
+                ),
+                (
+                    "Case-012",
+                    "n",
+                    "d",
+                    Type.IR.value,
+                    State.NEW.value,
+                    Responsible.L1.value,
+                    State.CLOSED.value,
+                ),
+            ],
+        )
+        self.assertEqual(result, [True, False, False])
+
+    def test_close_tickets(self):
+        self.database_connection_mock.execute_returning.return_value = [("Case-011",)]
+        result = self.db.close_tickets([self.ticket, self.ticket])
+        self.database_connection_mock.execute_returning.assert_called_once_with(
+            "close_tickets", ("closed", ["Case-011"], "closed")
+        )
+        self.assertEqual(result, [True, False])
+        self.assertEqual(self.db.close_tickets([]), [])
+
+    def test_close_tickets_only_responsible(self):
+        self.database_connection_mock.execute_returning.return_value = []
+        result = self.db.close_tickets([self.ticket], Responsible.L1)
+        self.database_connection_mock.execute_returning.assert_called_once_with(
+            "close_tickets_only_responsible",
+            ("closed", ["Case-011"], "closed", Responsible.L1.value),
+        )
+        self.assertIn(
+            "responsible = %s", PREPARED_STATEMENTS["close_tickets_only_responsible"]
+        )
+        self.assertEqual(result, [False])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,158 @@
+import unittest
+from unittest.mock import MagicMock
+
+from src.abstract_data import AbstractData
+from src.hybrid_data import HybridData
+from src.ticket import Ticket
+from src.constants import State, Responsible, Type
+
+
+class HybridDataTest(unittest.TestCase):
+    def setUp(self):
+        self.tickets = [
+            Ticket(
+                "Case-001",
+                "IUT",
+                "IUT is not working",
+                Type.PR,
+                State.NEW,
+                Responsible.L1,
+            ),
+            Ticket(
+                "Case-002",
+                "Test",
+                "Test is not working",
+                Type.IR,
+                State.NEW,
+                Responsible.L2,
+            ),
+        ]
+        self.durable_mock = MagicMock(spec=AbstractData)
+        self.durable_mock.filter_tickets.return_value = [self.tickets[0]]
+        self.data = HybridData(self.durable_mock)
+
+    def test_load(self):
+        self.durable_mock.filter_tickets.assert_called_once_with()
+        self.assertEqual(self.data.get_ticket("Case-001"), self.tickets[0])
+        self.assertEqual(self.data.search_tickets("IUT"), [self.tickets[0]])
+        self.assertEqual(
+            self.data.filter_tickets(State.NEW, Responsible.L1), [self.tickets[0]]
+        )
+        self.assertTrue(self.data.id_exists("Case-001"))
+        self.durable_mock.get_ticket.assert_not_called()
+
+    def test_reads_return_copies(self):
+        ticket = self.data.get_ticket("Case-001")
+        ticket.state = State.ASSIGNED
+        (same,) = self.data.get_tickets(["Case-001"])
+        same.responsible = Responsible.L2
+        self.assertEqual(self.data.get_ticket("Case-001"), self.tickets[0])
+
+    def test_create_ticket(self):
+        self.durable_mock.create_ticket.return_value = self.tickets[1]
+        self.assertEqual(self.data.create_ticket(self.tickets[1]), self.tickets[1])
+        self.durable_mock.create_ticket.assert_called_once_with(self.tickets[1])
+        self.assertEqual(self.data.get_ticket("Case-002"), self.tickets[1])
+        self.assertFalse(self.data.create_ticket(self.tickets[1]))
+        self.durable_mock.create_ticket.assert_called_once()
+
+    def test_create_ticket_keeps_stored_ticket(self):
+        stored = Ticket(
+            "Case-002",
+            "Test",
+            "Test is not working",
+            Type.IR,
+            State.NEW,
+            Responsible.L2,
+            self.tickets[1].timestamp + 1,
+        )
+        self.durable_mock.create_ticket.return_value = stored
+        self.assertTrue(self.data.create_ticket(self.tickets[1]))
+        self.assertEqual(self.data.get_ticket("Case-002").timestamp, stored.timestamp)
+        self.durable_mock.get_tickets.return_value = [stored]
+        self.data.refresh(["Case-002"])
+        self.assertEqual(self.data.hot.deleted_tickets, [])
+
+    def test_create_tickets_reads_stored_tickets(self):
+        stored = Ticket(
+            "Case-002",
+            "Test",
+            "Test is not working",
+            Type.IR,
+            State.NEW,
+            Responsible.L2,
+            self.tickets[1].timestamp + 1,
+        )
+        self.durable_mock.create_tickets.return_value = [False, True]
+        self.durable_mock.get_tickets.return_value = [stored]
+        self.assertEqual(self.data.create_tickets(self.tickets), [False, True])
+        self.durable_mock.get_tickets.assert_called_once_with(["Case-002"])
+        self.assertEqual(self.data.get_ticket("Case-002").timestamp, stored.timestamp)
+
+    def test_failed_write_is_not_applied(self):
+        self.durable_mock.create_ticket.side_effect = OSError
+        with self.assertRaises(OSError):
+            self.data.create_ticket(self.tickets[1])
+        self.assertFalse(self.data.id_exists("Case-002"))
+
+    def test_update_ticket(self):
+        ticket = self.data.get_ticket("Case-001")
+        ticket.state = State.ASSIGNED
+        ticket.responsible = Responsible.L2
+        self.durable_mock.update_ticket.return_value = True
+        self.assertTrue(self.data.update_ticket(ticket))
+        self.assertEqual(self.data.filter_tickets(responsible=Responsible.L2), [ticket])
+
+    def test_update_ticket_closed_elsewhere(self):
+        self.durable_mock.update_ticket.return_value = False
+        self.assertFalse(self.data.update_ticket(self.data.get_ticket("Case-001")))
+        self.assertIsNone(self.data.get_ticket("Case-001"))
+
+    def test_close_tickets(self):
+        self.durable_mock.close_tickets.return_value = [True, False]
+        self.assertEqual(self.data.close_tickets(self.tickets), [True, False])
+        self.assertEqual(self.data.filter_tickets(), [])
+
+    def test_set_ticket_state(self):
+        changed = Ticket(
+            "Case-001",
+            "IUT",
+            "IUT is not working",
+            Type.PR,
+            State.ASSIGNED,
+            Responsible.L2,
+            self.tickets[0].timestamp,
+        )
+        self.durable_mock.set_ticket_state.return_value = changed
+        self.assertEqual(
+            self.data.set_ticket_state("Case-001", State.ASSIGNED, Responsible.L2),
+            changed,
+        )
+        self.assertEqual(self.data.get_ticket("Case-001"), changed)
+        self.assertEqual(self.data.filter_tickets(State.NEW), [])
+
+    def test_refresh(self):
+        renamed = Ticket(
+            "Case-001",
+            "Renamed",
+            "IUT is not working",
+            Type.PR,
+            State.NEW,
+            Responsible.L1,
+            self.tickets[0].timestamp,
+        )
+        self.durable_mock.get_tickets.return_value = [renamed, self.tickets[1], None]
+        self.data.refresh(["Case-001", "Case-002", "Case-003"])
+        self.assertEqual(self.data.search_tickets("Renamed"), [renamed])
+        self.assertEqual(self.data.get_ticket("Case-002"), self.tickets[1])
+        self.assertEqual(self.data.filter_tickets(), [renamed, self.tickets[1]])
+        self.assertEqual(self.data.hot.deleted_tickets, [])
+        self.durable_mock.get_tickets.return_value = [None]
+        self.data.refresh(["Case-001"])
+        self.assertIsNone(self.data.get_ticket("Case-001"))
+        self.data.refresh()
+        self.assertEqual(self.data.get_tickets(["Case-001"]), [self.tickets[0]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+from unittest.mock import MagicMock, call
+
+from src.database.database_connect import DatabaseConnect
+from src.database.migrations import MigrationRunner, MIGRATIONS, TICKET_CHANNEL
+
+
+class MigrationRunnerTest(unittest.TestCase):
+    def setUp(self):
+        self.database_connection_mock = MagicMock(spec=DatabaseConnect)
+        self.migrations = [
+            (2, "second", ["CREATE INDEX b"]),
+            (1, "first", ["CREATE TABLE a", "CREATE INDEX a"]),
+        ]
+        self.runner = MigrationRunner(self.database_connection_mock, self.migrations)
+
+    def test_versions_are_unique_and_ordered(self):
+        versions = [migration[0] for migration in MIGRATIONS]
+        self.assertEqual(versions, sorted(set(versions)))
+
+    def test_search_vector_migration(self):
+        statements = dict((m[0], m[2]) for m in MIGRATIONS)[4]
+        self.assertIn("GENERATED ALWAYS AS", statements[0])
+        self.assertIn("USING gin (search_vector)", statements[1])
+
+    def test_notify_migration(self):
+        statements = dict((m[0], m[2]) for m in MIGRATIONS)[5]
+        self.assertIn(f"pg_notify('{TICKET_CHANNEL}'", statements[0])
+        self.assertIn("AFTER INSERT OR UPDATE OR DELETE ON ticket", statements[2])
+
+    def test_run_all(self):
+        self.database_connection_mock.fetch.return_value = []
+        applied = self.runner.run()
+        self.assertEqual(applied, [1, 2])
+        executed = [c.args[0] for c in self.database_connection_mock.execute.mock_calls]
+        self.assertEqual(
+            executed[1:],
+            [
+                "CREATE TABLE a",
+                "CREATE INDEX a",
+                "INSERT INTO schema_migrations (version, description) VALUES (%s, %s)",
+                "CREATE INDEX b",
+                "INSERT INTO schema_migrations (version, description) VALUES (%s, %s)",
+            ],
+        )
+        self.database_connection_mock.execute.assert_any_call(
+            "INSERT INTO schema_migrations (version, description) VALUES (%s, %s)",
+            (1, "first"),
+        )
+
+    def test_run_skips_applied(self):
+        self.database_connection_mock.fetch.return_value = [(1,)]
+        applied = self.runner.run()
+        self.assertEqual(applied, [2])
+        self.assertNotIn(
+            call("CREATE TABLE a"), self.database_connection_mock.execute.mock_calls
+        )
+
+    def test_run_up_to_date(self):
+        self.database_connection_mock.fetch.return_value = [(1,), (2,)]
+        self.assertEqual(self.runner.run(), [])
+        self.assertEqual(self.database_connection_mock.execute.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+import os
+import tempfile
+import unittest
+
+from src.backlog import Backlog
+from src.snapshot import Snapshot, write_snapshot
+from src.ticket import Ticket
+from src.constants import State, Responsible, Type
+
+
+class SnapshotTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "tickets.snapshot")
+        self.tickets = [
+            Ticket(
+                "Case-002",
+                "Café",
+                "Le café ne marche pas",
+                Type.IR,
+                State.ASSIGNED,
+                Responsible.L2,
+            ),
+            Ticket(
+                "Case-001",
+                "IUT",
+                "IUT is not working",
+                Type.PR,
+                State.NEW,
+                Responsible.L1,
+            ),
+            Ticket(
+                "Case-001",
+                "Old",
+                "",
+                Type.PR,
+                State.CLOSED,
+                Responsible.L1,
+            ),
+        ]
+
+    def test_write_and_read(self):
+        write_snapshot(self.path, self.tickets)
+        with Snapshot(self.path) as snapshot:
+            self.assertEqual(len(snapshot), 3)
+            self.assertEqual(list(snapshot), self.tickets)
+            self.assertEqual(snapshot[-1], self.tickets[2])
+            with self.assertRaises(IndexError):
+                snapshot[3]
+            self.assertEqual(snapshot.get("Case-001"), self.tickets[1])
+            self.assertEqual(snapshot.get("Case-002"), self.tickets[0])
+            self.assertIsNone(snapshot.get("Case-000"))
+            self.assertIsNone(snapshot.get("Case-003"))
+
+    def test_closed_ticket_is_not_found(self):
+        write_snapshot(self.path, self.tickets[2:])
+        with Snapshot(self.path) as snapshot:
+            self.assertIsNone(snapshot.get("Case-001"))
+
+    def test_empty_snapshot(self):
+        write_snapshot(self.path, [])
+        with Snapshot(self.path) as snapshot:
+            self.assertEqual(list(snapshot), [])
+            self.assertIsNone(snapshot.get("Case-001"))
+
+    def test_invalid_file(self):
+        with open(self.path, "wb") as file:
+            file.write(b"not a snapshot at all, not even close")
+        with self.assertRaises(ValueError):
+            Snapshot(self.path)
+        write_snapshot(self.path, self.tickets)
+        with open(self.path, "r+b") as file:
+            file.truncate(os.path.getsize(self.path) - 1)
+        with self.assertRaises(ValueError):
+            Snapshot(self.path)
+
+
+class BacklogSnapshotTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "tickets.snapshot")
+        self.tickets = [
+            Ticket(
+                "Case-002",
+                "Café",
+                "Le café ne marche pas",
+                Type.IR,
+                State.ASSIGNED,
+                Responsible.L2,
+            ),
+            Ticket(
+                "Case-001",
+                "IUT",
+                "IUT is not working",
+                Type.PR,
+                State.NEW,
+                Responsible.L1,
+            ),
+            Ticket(
+                "Case-001",
+                "Test",
+                "Test is not working",
+                Type.PR,
+                State.NEW,
+                Responsible.L1,
+            ),
+        ]
+        backlog = Backlog()
+        backlog.tickets = self.tickets[:2]
+        backlog.set_ticket_state("Case-001", State.CLOSED)
+        backlog.create_ticket(self.tickets[2])
+        backlog.save_snapshot(self.path)
+        self.backlog = Backlog()
+        self.backlog.create_ticket(
+            Ticket("Case-003", "Lost", "", Type.PR, State.NEW, Responsible.L1)
+        )
+        self.backlog.load_snapshot(self.path)
+
+    def test_lookups_before_loading(self):
+        self.assertEqual(self.backlog.get_ticket("Case-002"), self.tickets[0])
+        self.assertEqual(
+            self.backlog.get_tickets(["Case-001", "Case-003"]), [self.tickets[2], None]
+        )
+        self.assertTrue(self.backlog.id_exists("Case-001"))
+        self.assertIsNotNone(self.backlog._snapshot)
+
+    def test_load(self):
+        self.assertEqual(self.backlog.tickets, [self.tickets[0], self.tickets[2]])
+        self.assertEqual(self.backlog.deleted_tickets, [self.tickets[1]])
+        self.assertIsNone(self.backlog._snapshot)
+        self.assertEqual(
+            self.backlog.filter_tickets(State.NEW, Responsible.L1), [self.tickets[2]]
+        )
+        self.assertEqual(self.backlog.search_tickets("café"), [self.tickets[0]])
+
+    def test_write_after_load(self):
+        ticket = self.backlog.get_ticket("Case-002")
+        ticket.state = State.NEW
+        self.assertTrue(self.backlog.update_ticket(ticket))
+        self.assertFalse(self.backlog.create_ticket(self.tickets[2]))
+        self.assertEqual(
+            self.backlog.filter_tickets(State.NEW, Responsible.L2), [ticket]
+        )
+        self.backlog.save_snapshot(self.path)
+        backlog = Backlog()
+        backlog.load_snapshot(self.path)
+        self.assertEqual(backlog.get_ticket("Case-002").state, State.NEW)
+        self.assertEqual(len(backlog.deleted_tickets), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import datetime
+import unittest
+from src.ticket import Ticket, to_timestamp, from_timestamp
+from src.constants import State, Responsible, Type
+
+
+class TicketTest(unittest.TestCase):
+    def setUp(self):
+        self.date = datetime.datetime(2024, 2, 5, 20, 5, 59, 375458)
+        self.ticket = Ticket(
+            "Case-001",
+            "IUT",
+            "IUT is not working",
+            Type.PR,
+            State.NEW,
+            Responsible.L1,
+            self.date,
+        )
+
+    def test_timestamp_round_trip(self):
+        timestamp = to_timestamp(self.date)
+        self.assertEqual(from_timestamp(timestamp), self.date.replace(microsecond=0))
+        self.assertEqual(self.ticket.get_timestamp(), timestamp)
+
+    def test_date(self):
+        self.assertEqual(self.ticket.date, "2024-02-05 20:05:59")
+        self.ticket.date = "2024-02-06 08:00:00"
+        self.assertEqual(
+            self.ticket.get_datetime(), datetime.datetime(2024, 2, 6, 8, 0, 0)
+        )
+        self.ticket.date = self.date
+        self.assertEqual(self.ticket.date, "2024-02-05 20:05:59")
+
+    def test_date_from_timestamp(self):
+        ticket = Ticket(
+            "Case-001",
+            "IUT",
+            "IUT is not working",
+            Type.PR,
+            State.NEW,
+            Responsible.L1,
+            to_timestamp(self.date),
+        )
+        self.assertEqual(ticket, self.ticket)
+
+    def test_slots(self):
+        self.assertFalse(hasattr(self.ticket, "__dict__"))
+        with self.assertRaises(AttributeError):
+            self.ticket.unknown = "value"
+
+    def test_copy(self):
+        ticket = self.ticket.copy()
+        self.assertIsNot(ticket, self.ticket)
+        self.assertEqual(ticket, self.ticket)
+        ticket.state = State.CLOSED
+        self.assertEqual(self.ticket.state, State.NEW)
+
+    def test_get_age(self):
+        self.ticket.date = datetime.datetime.now() - datetime.timedelta(days=3)
+        self.assertEqual(self.ticket.get_age().days, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+import io
+import unittest
+from unittest.mock import MagicMock
+
+from src.constants import ID_PATTERN, NAME_PATTERN, State, Responsible
+from src.database.database_connect import DatabaseConnect
+from src.database.ticket_import import (
+    CsvReader,
+    JsonLinesReader,
+    TicketImporter,
+    copy_rows,
+    merge_rows,
+    reject_duplicates,
+    reject_existing,
+    validate_rows,
+)
+from src.tms import TMS
+
+
+class JsonLinesReaderTest(unittest.TestCase):
+    def test_read(self):
+        lines = [
+            '{"id": "Case-001", "name": "IUT", "description": "a, \\"b\\"", "ticket_type": "PR"}\n',
+            "\n",
+            "not json\n",
+            '{"id": "Case-002", "name": "Test"}\n',
+            "[1, 2]\n",
+        ]
+        rejected = []
+        reader = JsonLinesReader(lines, rejected)
+        text = reader.read(10) + reader.read()
+        self.assertEqual(text, '1,Case-001,IUT,"a, ""b""",PR\n' "4,Case-002,Test,,\n")
+        self.assertEqual(reader.read(), "")
+        self.assertEqual(
+            rejected, [(3, None, "invalid json"), (5, None, "invalid json")]
+        )
+
+
+class CsvReaderTest(unittest.TestCase):
+    def test_read(self):
+        lines = [
+            "id,name,description,ticket_type\n",
+            'Case-001,IUT,"a, ""b""",PR\n',
+            'Case-002,"IUT"x,d,PR\n',
+            "Case-003,Test\n",
+            'Case-004,Test,"two\nlines",IR\n',
+            "Case-005,Test,,IR\n",
+        ]
+        rejected = []
+        reader = CsvReader(lines, rejected)
+        self.assertEqual(
+            reader.read(),
+            '1,Case-001,IUT,"a, ""b""",PR\n'
+            '4,Case-004,Test,"two\nlines",IR\n'
+            "5,Case-005,Test,,IR\n",
+        )
+        self.assertEqual(
+            rejected, [(2, None, "invalid csv"), (3, "Case-003", "invalid csv")]
+        )
+
+
+class TicketImporterTest(unittest.TestCase):
+    def setUp(self):
+        self.database_connection_mock = MagicMock(spec=DatabaseConnect)
+        self.cursor = (
+            self.database_connection_mock.transaction.return_value.__enter__.return_value
+        )
+        self.database_connection_mock.transaction.return_value.__exit__.return_value = (
+            False
+        )
+        self.cursor.rowcount = 2
+        self.cursor.fetchall.return_value = [(3, "Case-1", "invalid id")]
+        self.importer = TicketImporter(self.database_connection_mock)
+
+    def test_import_csv(self):
+        self.cursor.copy_expert.side_effect = lambda query, file: file.read()
+        file = io.StringIO("id,name,description,ticket_type\nCase-001,IUT\n")
+        report = self.importer.import_tickets(file)
+        query, reader = self.cursor.copy_expert.call_args.args
+        self.assertEqual(query, copy_rows)
+        self.assertIsInstance(reader, CsvReader)
+        self.cursor.execute.assert_any_call(
+            validate_rows, (ID_PATTERN, NAME_PATTERN, ["PR", "IR"])
+        )
+        self.cursor.execute.assert_any_call(
+            merge_rows, (State.NEW.value, Responsible.L1.value)
+        )
+        self.database_connection_mock.transaction.assert_called_once_with()
+        self.assertEqual(
+            report,
+            {
+                "imported": 2,
+                "rejected": [
+                    (1, "Case-001", "invalid csv"),
+                    (3, "Case-1", "invalid id"),
+                ],
+            },
+        )
+
+    def test_import_json_lines(self):
+        self.cursor.copy_expert.side_effect = lambda query, file: file.read()
+        report = self.importer.import_tickets(["{}\n", "oops\n"], "jsonl")
+        query, reader = self.cursor.copy_expert.call_args.args
+        self.assertEqual(query, copy_rows)
+        self.assertIsInstance(reader, JsonLinesReader)
+        self.assertEqual(
+            report["rejected"],
+            [(2, None, "invalid json"), (3, "Case-1", "invalid id")],
+        )
+
+    def test_import_aborts_transaction_on_error(self):
+        self.cursor.copy_expert.side_effect = ValueError
+        with self.assertRaises(ValueError):
+            self.importer.import_tickets(io.StringIO(""))
+        exit_args = (
+            self.database_connection_mock.transaction.return_value.__exit__.call_args.args
+        )
+        self.assertIs(exit_args[0], ValueError)
+
+    def test_rejection_reasons(self):
+        # The reasons are the errors of TMS.new_ticket_error and TMS.create_tickets.
+        reasons = [
+            TMS.new_ticket_error("Case", "IUT", "IUT is not working", "PR"),
+            TMS.new_ticket_error("Case-001", "IUT", "", "PR"),
+            TMS.new_ticket_error("Case-001", "", "IUT is not working", "PR"),
+            TMS.new_ticket_error("Case-001", "IUT", "IUT is not working", "XX"),
+        ]
+        self.assertEqual(
+            reasons, ["invalid id", "invalid details", "invalid name", "invalid type"]
+        )
+        for reason in reasons:
+            self.assertIn(f"THEN '{reason}'", validate_rows)
+        self.assertIn("'duplicate id'", reject_duplicates)
+        self.assertIn("'id already exists'", reject_existing)
+        rows = [
+            (line, "Case-1", reason)
+            for line, reason in enumerate(
+                reasons + ["duplicate id", "id already exists"], start=1
+            )
+        ]
+        self.cursor.fetchall.return_value = rows
+        self.cursor.copy_expert.side_effect = lambda query, file: file.read()
+        report = self.importer.import_tickets(["{}\n"] * 6 + ["oops\n"], "jsonl")
+        self.assertEqual(report["rejected"], rows + [(7, None, "invalid json")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+import psycopg2
+
+from src.database.database_connect import DatabaseConnect
+from src.database.migrations import TICKET_CHANNEL
+from src.database.ticket_listener import TicketListener
+
+
+def notification(payload):
+    notify = MagicMock()
+    notify.payload = payload
+    return notify
+
+
+class TicketListenerTest(unittest.TestCase):
+    def setUp(self):
+        self.database_connection_mock = MagicMock(spec=DatabaseConnect)
+        self.connection = self.database_connection_mock.listen.return_value
+        self.on_change = MagicMock()
+        self.listener = TicketListener(
+            self.database_connection_mock, self.on_change, timeout=0.01
+        )
+        patcher = patch("src.database.ticket_listener.select.select")
+        self.select_mock = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_poll(self):
+        self.listener.connect()
+        self.database_connection_mock.listen.assert_called_once_with(TICKET_CHANNEL)
+        self.select_mock.return_value = ([self.connection], [], [])
+        self.connection.notifies = [
+            notification("Case-001"),
+            notification("Case-002"),
+            notification("Case-001"),
+        ]
+        self.assertEqual(self.listener.poll(), ["Case-001", "Case-002"])
+        self.connection.poll.assert_called_once()
+        self.on_change.assert_called_once_with(["Case-001", "Case-002"])
+
+    def test_poll_timeout(self):
+        self.listener.connect()
+        self.select_mock.return_value = ([], [], [])
+        self.assertEqual(self.listener.poll(), [])
+        self.connection.poll.assert_not_called()
+        self.on_change.assert_not_called()
+
+    def test_listens_again_after_connection_error(self):
+        self.select_mock.return_value = ([self.connection], [], [])
+        self.connection.notifies = []
+        polls = []
+
+        def poll():
+            polls.append(None)
+            if len(polls) == 1:
+                raise psycopg2.OperationalError
+            if len(polls) == 2:
+                self.connection.notifies.append(notification("Case-003"))
+            else:
+                self.listener._stopped.set()
+
+        self.connection.poll.side_effect = poll
+        self.listener.start()
+        self.listener._thread.join(1)
+        self.listener.stop()
+        self.assertEqual(self.database_connection_mock.listen.call_count, 2)
+        self.on_change.assert_any_call(None)
+        self.on_change.assert_any_call(["Case-003"])
+        self.assertEqual(self.connection.close.call_count, 2)
+        self.assertIsNone(self.listener.connection)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+from unittest.mock import MagicMock
+
+from src.ticket_pages import TicketPages
+
+
+class TicketPagesTest(unittest.TestCase):
+    def setUp(self):
+        self.pages = [(["a", "b"], 1), (["c"], None)]
+        self.fetch_page = MagicMock(side_effect=lambda cursor: self.pages[cursor or 0])
+        self.tickets = TicketPages(self.fetch_page, 3)
+
+    def test_nothing_fetched_until_read(self):
+        self.assertEqual(len(self.tickets), 3)
+        self.fetch_page.assert_not_called()
+
+    def test_fetches_pages_on_demand(self):
+        self.assertEqual(self.tickets[1], "b")
+        self.fetch_page.assert_called_once_with(None)
+        self.assertEqual(self.tickets[0], "a")
+        self.assertEqual(self.tickets.fetched, 2)
+        self.assertEqual(self.tickets[-1], "c")
+        self.assertEqual(self.fetch_page.call_count, 2)
+        self.assertEqual(list(self.tickets), ["a", "b", "c"])
+        self.assertEqual(self.tickets[1:], ["b", "c"])
+        self.assertEqual(self.fetch_page.call_count, 2)
+
+    def test_iteration_does_not_keep_pages(self):
+        self.assertEqual(list(self.tickets), ["a", "b", "c"])
+        self.assertEqual(self.tickets.fetched, 0)
+        self.assertEqual(self.tickets[0], "a")
+        self.assertEqual(list(self.tickets), ["a", "b", "c"])
+        self.assertEqual(self.fetch_page.call_count, 4)
+
+    def test_unknown_count(self):
+        tickets = TicketPages(self.fetch_page, first_page=self.pages[0])
+        self.assertEqual(tickets[1], "b")
+        self.fetch_page.assert_not_called()
+        self.assertEqual(len(tickets), 3)
+        self.fetch_page.assert_called_once_with(1)
+        self.assertRaises(IndexError, tickets.__getitem__, 3)
+
+    def test_empty(self):
+        tickets = TicketPages(self.fetch_page, 0)
+        self.assertEqual(list(tickets), [])
+        self.assertRaises(IndexError, tickets.__getitem__, 0)
+        self.fetch_page.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -97,30 +97,42 @@ class UpdateTicketTest(unittest.TestCase):
         self.backlog_mock.get_ticket.return_value = self.ticket
 
     def test_update_ticket(self):
+        self.backlog_mock.set_ticket_state.return_value = self.ticket
         success = self.tms.update_ticket(
             self.ticket.id,
             State.ANALYSIS.value,
             Responsible.L2.value,
         )
         self.assertTrue(success)
-        self.backlog_mock.update_ticket.assert_called_once_with(self.ticket)
+        self.backlog_mock.set_ticket_state.assert_called_once_with(
+            self.ticket.id, State.ANALYSIS, Responsible.L2
+        )
+        self.backlog_mock.get_ticket.assert_not_called()
         self.interface_mock.print_updated_ticket.assert_called_once_with(
             self.ticket.id,
             Responsible.L2.value,
             State.ANALYSIS.value,
         )
 
+    def test_update_ticket_invalid_id(self):
+        self.backlog_mock.set_ticket_state.return_value = None
+        success = self.tms.update_ticket(
+            "Case-002", State.ANALYSIS.value, Responsible.L2.value
+        )
+        self.assertFalse(success)
+        self.interface_mock.print_ticket_invalid_id.assert_called_once_with("Case-002")
+
     def test_wrong_state(self):
         success = self.tms.update_ticket(self.ticket.id, "WRONG", Responsible.L2.value)
         self.assertFalse(success)
         self.interface_mock.print_invalid_state.assert_called_once_with("WRONG")
-        self.backlog_mock.update_ticket.assert_not_called()
+        self.backlog_mock.set_ticket_state.assert_not_called()
 
     def test_wrong_responsible(self):
         success = self.tms.update_ticket(self.ticket.id, State.ANALYSIS.value, "WRONG")
         self.assertFalse(success)
         self.interface_mock.print_invalid_responsible.assert_called_once_with("WRONG")
-        self.backlog_mock.update_ticket.assert_not_called()
+        self.backlog_mock.set_ticket_state.assert_not_called()
 
 
 class CloseTicketTest(unittest.TestCase):
@@ -139,25 +151,31 @@ class CloseTicketTest(unittest.TestCase):
         self.backlog_mock.get_ticket.return_value = self.ticket
 
     def test_close_ticket(self):
+        self.backlog_mock.set_ticket_state.return_value = self.ticket
         success = self.tms.close_ticket(self.ticket.id)
         self.assertTrue(success)
-        self.backlog_mock.close_ticket.assert_called_once_with(self.ticket)
+        self.backlog_mock.set_ticket_state.assert_called_once_with(
+            self.ticket.id, State.CLOSED, only_responsible=Responsible.L1
+        )
+        self.backlog_mock.get_ticket.assert_not_called()
         self.interface_mock.print_close_ticket.assert_called_once_with(self.ticket.id)
 
     def test_close_ticket_invalid_id(self):
+        self.backlog_mock.set_ticket_state.return_value = None
         self.backlog_mock.get_ticket.return_value = None
         success = self.tms.close_ticket("Case-002")
         self.assertFalse(success)
         self.interface_mock.print_ticket_invalid_id.assert_called_once_with("Case-002")
-        self.backlog_mock.close_ticket.assert_not_called()
+        self.interface_mock.print_l1_close_ticket.assert_not_called()
 
     def test_wrong_responsible(self):
         self.ticket.responsible = Responsible.L2
+        self.backlog_mock.set_ticket_state.return_value = None
         self.backlog_mock.get_ticket.return_value = self.ticket
         success = self.tms.close_ticket(self.ticket.id)
         self.assertFalse(success)
         self.interface_mock.print_l1_close_ticket.assert_called_once()
-        self.backlog_mock.close_ticket.assert_not_called()
+        self.interface_mock.print_ticket_invalid_id.assert_not_called()
 
 
 class SearchTicketTest(unittest.TestCase):
@@ -176,15 +194,36 @@ class SearchTicketTest(unittest.TestCase):
         self.backlog_mock.search_tickets.return_value = [self.ticket]
 
     def test_search_ticket(self):
-        self.backlog_mock.search_tickets.return_value = [self.ticket]
+        self.backlog_mock.search_tickets_page.return_value = ([self.ticket], None)
         found = self.tms.search_tickets(Type.PR.value)
         self.assertTrue(found)
         self.interface_mock.print_searched_keyword.assert_called_once_with(
             Type.PR.value
         )
-        self.interface_mock.print_search.assert_called_once_with(
-            Type.PR.value, [self.ticket]
-        )
+        self.interface_mock.print_search.assert_called_once()
+        keyword, tickets = self.interface_mock.print_search.call_args.args
+        self.assertEqual(keyword, Type.PR.value)
+        self.assertEqual(list(tickets), [self.ticket])
+        self.backlog_mock.search_tickets_page.assert_called_once_with(Type.PR.value)
+        self.backlog_mock.search_tickets.assert_not_called()
+
+    def test_search_ticket_pages(self):
+        other = Ticket("Case-002", "IUT", "IUT", Type.PR, State.NEW, Responsible.L1)
+        self.backlog_mock.search_tickets_page.side_effect = [
+            ([self.ticket], ("cursor",)),
+            ([other], None),
+        ]
+        self.assertTrue(self.tms.search_tickets("IUT"))
+        self.backlog_mock.search_tickets_page.assert_called_once_with("IUT")
+        tickets = self.interface_mock.print_search.call_args.args[1]
+        self.assertEqual(list(tickets), [self.ticket, other])
+        self.backlog_mock.search_tickets_page.assert_called_with("IUT", ("cursor",))
+
+    def test_search_ticket_not_found(self):
+        self.backlog_mock.search_tickets_page.return_value = ([], None)
+        self.assertFalse(self.tms.search_tickets("nothing"))
+        self.interface_mock.print_keyword_not_found.assert_called_once_with("nothing")
+        self.interface_mock.print_search.assert_not_called()
 
 
 class PrintOneTicketTest(unittest.TestCase):
@@ -231,6 +270,7 @@ class MainTest(unittest.TestCase):
     def test_main(self):
         self.interface_mock.print_main_form.return_value = "7"
         self.tms.main()
+        self.backlog_mock.flush.assert_called_once()
 
 
 class tar3Test(unittest.TestCase):
@@ -249,21 +289,111 @@ class tar3Test(unittest.TestCase):
         self.backlog_mock.get_ticket.return_value = self.ticket
 
     def test_get_tar_3(self):
-        self.backlog_mock.get_old_new_ticket.return_value = [self.ticket]
-        self.backlog_mock.get_old_assigned_ticket.return_value = [self.ticket]
-        self.backlog_mock.get_old_ticket_list.return_value = []
+        self.backlog_mock.count_tar_3.return_value = {
+            "new": 1,
+            "assigned": 1,
+            "all": 0,
+        }
+        self.backlog_mock.get_tar_3_page.return_value = ([self.ticket], None)
         result = self.tms.get_tar_3()
         self.assertEqual(
-            result,
-            {
-                "new": {"tickets": [self.ticket], "count": 1},
-                "assigned": {"tickets": [self.ticket], "count": 1},
-                "all": {"tickets": [], "count": 0},
-            },
+            {bucket: value["count"] for bucket, value in result.items()},
+            {"new": 1, "assigned": 1, "all": 0},
+        )
+        self.backlog_mock.count_tar_3.assert_called_once()
+        self.backlog_mock.get_tar_3_page.assert_not_called()
+        self.backlog_mock.get_tar_3.assert_not_called()
+        self.assertEqual(list(result["new"]["tickets"]), [self.ticket])
+        self.backlog_mock.get_tar_3_page.assert_called_once_with("new", None)
+        self.assertEqual(list(result["all"]["tickets"]), [])
+        self.backlog_mock.get_tar_3_page.assert_called_once()
+
+
+class BatchTest(unittest.TestCase):
+    def setUp(self):
+        self.interface_mock = MagicMock(spec=Interface)
+        self.backlog = Backlog()
+        self.tms = TMS(self.interface_mock, self.backlog)
+        self.backlog.create_tickets(
+            [
+                Ticket("Case-001", "IUT", "IUT", Type.PR, State.NEW, Responsible.L1),
+                Ticket("Case-002", "Test", "Test", Type.IR, State.NEW, Responsible.L2),
+            ]
+        )
+
+    def test_create_tickets(self):
+        results = self.tms.create_tickets(
+            [
+                ("Case-003", "IUT", "IUT", "PR"),
+                ("Case-1", "IUT", "IUT", "PR"),
+                ("Case-004", "IUT", "", "PR"),
+                ("Case-005", "I U T", "IUT", "PR"),
+                ("Case-006", "IUT", "IUT", "XX"),
+                ("Case-001", "IUT", "IUT", "PR"),
+                ("Case-003", "IUT", "IUT", "IR"),
+            ]
+        )
+        self.assertEqual(
+            results,
+            [
+                None,
+                "invalid id",
+                "invalid details",
+                "invalid name",
+                "invalid type",
+                "id already exists",
+                "id already exists",
+            ],
+        )
+        self.assertEqual(self.backlog.get_ticket("Case-003").type, Type.PR)
+        self.interface_mock.assert_not_called()
+
+    def test_update_tickets(self):
+        backlog_mock = MagicMock(spec=Backlog, wraps=self.backlog)
+        self.tms.data = backlog_mock
+        results = self.tms.update_tickets(
+            ["Case-001", "Case-009", "Case-002"], "analysis", "L2"
+        )
+        self.assertEqual(results, [None, "invalid id", None])
+        backlog_mock.get_tickets.assert_called_once()
+        backlog_mock.update_tickets.assert_called_once()
+        self.assertEqual(
+            self.backlog.filter_tickets(State.ANALYSIS, Responsible.L2),
+            self.backlog.tickets,
+        )
+
+    def test_update_tickets_invalid(self):
+        self.assertEqual(
+            self.tms.update_tickets(["Case-001", "Case-002"], "closed", "L2"),
+            ["invalid state", "invalid state"],
+        )
+        self.assertEqual(
+            self.tms.update_tickets(["Case-001"], "analysis", "L4"),
+            ["invalid responsible"],
+        )
+        self.assertEqual(self.backlog.filter_tickets(State.NEW), self.backlog.tickets)
+
+    def test_close_tickets(self):
+        results = self.tms.close_tickets(["Case-001", "Case-002", "Case-003"])
+        self.assertEqual(results, [None, "not assigned to L1", "invalid id"])
+        self.assertEqual([t.id for t in self.backlog.tickets], ["Case-002"])
+        self.assertEqual(self.backlog.deleted_tickets[0].state, State.CLOSED)
+
+    def test_close_tickets_reassigned_meanwhile(self):
+        data_mock = MagicMock(spec=Backlog)
+        read = Ticket("Case-001", "IUT", "IUT", Type.PR, State.NEW, Responsible.L1)
+        reassigned = Ticket(
+            "Case-001", "IUT", "IUT", Type.PR, State.NEW, Responsible.L2
+        )
+        data_mock.get_tickets.side_effect = [[read, None], [reassigned]]
+        data_mock.close_tickets.return_value = [False]
+        tms = TMS(MagicMock(spec=Interface), data_mock)
+        results = tms.close_tickets(["Case-001", "Case-009"])
+        self.assertEqual(results, ["not assigned to L1", "invalid id"])
+        data_mock.close_tickets.assert_called_once_with(
+            [read], only_responsible=Responsible.L1
         )
-        self.backlog_mock.get_old_new_ticket.assert_called_once()
-        self.backlog_mock.get_old_assigned_ticket.assert_called_once()
-        self.backlog_mock.get_old_ticket_list.assert_called_once()
+        data_mock.get_tickets.assert_called_with(["Case-001"])
 
 
 def suite():
@@ -0,0 +1,45 @@
+import unittest
+from src.trigram_index import TrigramIndex
+
+
+class TrigramIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.index = TrigramIndex()
+        self.index.add("Case-001", ("Case-001", "IUT is not working", "L1"))
+        self.index.add("Case-002", ("Case-002", "Test is broken", "L2"))
+
+    def test_grams_of(self):
+        self.assertEqual(self.index.grams_of(("abcd", "L1", "")), {"abc", "bcd", "L1"})
+
+    def test_search(self):
+        self.assertEqual(self.index.search("Case"), ["Case-001", "Case-002"])
+        self.assertEqual(self.index.search("working"), ["Case-001"])
+        self.assertEqual(self.index.search("nothing"), [])
+
+    def test_search_short_keyword(self):
+        self.assertEqual(self.index.search("L"), ["Case-001", "Case-002"])
+        self.assertEqual(self.index.search("2"), ["Case-002"])
+        self.assertEqual(self.index.search(""), ["Case-001", "Case-002"])
+
+    def test_search_verifies_candidates(self):
+        self.index.add("Case-003", ("abcxbcd",))
+        self.assertIn("Case-003", self.index.candidates("abcd"))
+        self.assertEqual(self.index.search("abcd"), [])
+
+    def test_update(self):
+        self.assertTrue(self.index.update("Case-001", ("Case-001", "Fixed", "L3")))
+        self.assertEqual(self.index.search("working"), [])
+        self.assertEqual(self.index.search("L3"), ["Case-001"])
+        self.assertEqual(self.index.search("Case"), ["Case-001", "Case-002"])
+        self.assertFalse(self.index.update("Case-003", ("Case-003",)))
+
+    def test_remove(self):
+        self.assertTrue(self.index.remove("Case-001"))
+        self.assertFalse(self.index.remove("Case-001"))
+        self.assertEqual(self.index.search("Case"), ["Case-002"])
+        self.assertNotIn("L1", self.index.postings)
+        self.assertEqual(len(self.index), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,173 @@
+import unittest
+from unittest.mock import MagicMock
+
+from src.abstract_data import AbstractData
+from src.write_behind_data import WriteBehindData
+from src.ticket import Ticket
+from src.constants import State, Responsible, Type
+
+
+class WriteBehindDataTest(unittest.TestCase):
+    def setUp(self):
+        self.data_mock = MagicMock(spec=AbstractData)
+        self.data_mock.get_ticket.return_value = None
+        self.data_mock.id_exists.return_value = False
+        self.data_mock.create_tickets.side_effect = lambda tickets: [True] * len(
+            tickets
+        )
+        self.data_mock.update_tickets.side_effect = lambda tickets: [True] * len(
+            tickets
+        )
+        self.now = 0.0
+        # The worker does not flush during a test.
+        self.data = WriteBehindData(self.data_mock, 2, 3600.0, lambda: self.now)
+        self.ticket = Ticket(
+            "Case-001",
+            "IUT",
+            "IUT is not working",
+            Type.PR,
+            State.NEW,
+            Responsible.L1,
+        )
+
+    def tearDown(self):
+        self.data.close()
+
+    def test_read_your_writes(self):
+        self.assertTrue(self.data.create_ticket(self.ticket))
+        self.ticket.name = "Changed"
+        self.assertEqual(self.data.get_ticket("Case-001").name, "IUT")
+        self.assertTrue(self.data.id_exists("Case-001"))
+        self.assertFalse(self.data.create_ticket(self.ticket))
+        changed = self.data.set_ticket_state("Case-001", State.ASSIGNED, Responsible.L2)
+        self.assertEqual(changed.state, State.ASSIGNED)
+        self.assertEqual(self.data.get_tickets(["Case-001"])[0], changed)
+        self.data_mock.get_ticket.assert_not_called()
+        self.data_mock.create_tickets.assert_not_called()
+        self.assertEqual(self.data.stats()["queue_depth"], 1)
+
+    def test_flush_coalesces_writes(self):
+        self.data.create_ticket(self.ticket)
+        self.data.set_ticket_state("Case-001", State.ASSIGNED, Responsible.L2)
+        self.data.flush()
+        (created,) = self.data_mock.create_tickets.call_args.args
+        self.assertEqual(len(created), 1)
+        self.assertEqual(created[0].state, State.ASSIGNED)
+        self.data_mock.update_tickets.assert_not_called()
+        stats = self.data.stats()
+        self.assertEqual((stats["queue_depth"], stats["flushes"]), (0, 1))
+        self.assertEqual(stats["flushed"], 1)
+        self.data_mock.flush.assert_called_once()
+
+    def test_close_ticket(self):
+        self.data_mock.get_ticket.return_value = self.ticket
+        self.assertTrue(self.data.close_ticket(self.ticket))
+        self.assertIsNone(self.data.get_ticket("Case-001"))
+        self.assertFalse(self.data.id_exists("Case-001"))
+        self.assertFalse(self.data.update_ticket(self.ticket))
+        self.assertEqual(self.ticket.state, State.NEW)
+        self.data.flush()
+        (updated,) = self.data_mock.update_tickets.call_args.args
+        self.assertEqual(updated[0].state, State.CLOSED)
+
+    def test_create_closed_ticket(self):
+        self.data.create_ticket(self.ticket)
+        self.data.flush()
+        self.data_mock.get_ticket.return_value = self.ticket
+        self.assertIsNotNone(self.data.set_ticket_state("Case-001", State.CLOSED))
+        self.assertTrue(self.data.create_ticket(self.ticket))
+        (closed,) = self.data_mock.update_tickets.call_args.args
+        self.assertEqual(closed[0].state, State.CLOSED)
+        self.data.flush()
+        (created,) = self.data_mock.create_tickets.call_args.args
+        self.assertEqual(created[0].state, State.NEW)
+        self.assertEqual(self.data_mock.create_tickets.call_count, 2)
+
+    def test_create_existing_ticket(self):
+        self.data_mock.id_exists.return_value = True
+        self.assertFalse(self.data.create_ticket(self.ticket))
+        self.data_mock.id_exists.assert_called_once_with("Case-001")
+        self.assertEqual(self.data.stats()["queue_depth"], 0)
+
+    def test_unknown_ticket(self):
+        self.assertFalse(self.data.update_ticket(self.ticket))
+        self.assertIsNone(self.data.set_ticket_state("Case-001", State.ASSIGNED))
+        self.assertEqual(self.data.stats()["queue_depth"], 0)
+
+    def test_get_tickets(self):
+        self.data.create_ticket(self.ticket)
+        self.data_mock.get_tickets.return_value = [None]
+        self.assertEqual(
+            self.data.get_tickets(["Case-001", "Case-002"]), [self.ticket, None]
+        )
+        self.data_mock.get_tickets.assert_called_once_with(["Case-002"])
+
+    def test_other_reads_flush(self):
+        self.data.create_ticket(self.ticket)
+        self.data_mock.search_tickets.return_value = [self.ticket]
+        self.assertEqual(self.data.search_tickets("IUT"), [self.ticket])
+        self.data_mock.create_tickets.assert_called_once()
+        self.assertEqual(self.data.stats()["queue_depth"], 0)
+
+    def test_full_buffer_flushes(self):
+        for i in range(3):
+            self.ticket.id = f"Case-00{i}"
+            self.data.create_ticket(self.ticket)
+        (created,) = self.data_mock.create_tickets.call_args.args
+        self.assertEqual([ticket.id for ticket in created], ["Case-000", "Case-001"])
+        self.assertEqual(self.data.stats()["queue_depth"], 1)
+
+    def test_failed_flush_is_retried(self):
+        self.data.create_ticket(self.ticket)
+        self.data_mock.create_tickets.side_effect = OSError
+        self.now = 1.0
+        with self.assertRaises(OSError):
+            self.data.flush()
+        self.assertEqual(self.data.stats()["errors"], 1)
+        self.data.update_ticket(self.ticket)
+        self.data_mock.create_tickets.side_effect = [[True]]
+        self.data.flush()
+        self.assertEqual(len(self.data_mock.create_tickets.call_args.args[0]), 1)
+        self.data_mock.update_tickets.assert_not_called()
+
+    def test_failing_batch_is_given_up(self):
+        self.data.create_ticket(self.ticket)
+        self.data_mock.create_tickets.side_effect = OSError
+        for _ in range(4):
+            with self.assertRaises(OSError):
+                self.data.flush()
+        stats = self.data.stats()
+        self.assertEqual((stats["queue_depth"], stats["errors"]), (0, 4))
+        self.assertEqual((stats["failed"], stats["failed_ids"]), (1, ["Case-001"]))
+        self.assertIsInstance(stats["last_error"], OSError)
+        self.assertEqual(self.data_mock.create_tickets.call_count, 4)
+        self.data_mock.create_tickets.side_effect = lambda tickets: [True]
+        self.ticket.id = "Case-002"
+        self.data.create_ticket(self.ticket)
+        self.data.flush()
+        (created,) = self.data_mock.create_tickets.call_args.args
+        self.assertEqual([ticket.id for ticket in created], ["Case-002"])
+        self.assertEqual(self.data.stats()["flushed"], 1)
+
+    def test_rejected_writes_and_latency(self):
+        self.data.create_ticket(self.ticket)
+        self.data_mock.create_tickets.side_effect = lambda tickets: (
+            setattr(self, "now", 0.5) or [False]
+        )
+        self.data.flush()
+        stats = self.data.stats()
+        self.assertEqual((stats["flushed"], stats["rejected"]), (0, 1))
+        self.assertEqual(stats["rejected_ids"], ["Case-001"])
+        self.assertEqual(stats["last_flush_latency"], 0.5)
+        self.assertEqual(stats["max_flush_latency"], 0.5)
+
+    def test_worker_flushes(self):
+        data = WriteBehindData(self.data_mock, 10, 0.01)
+        data.create_ticket(self.ticket)
+        data.close()
+        self.data_mock.create_tickets.assert_called_once()
+        self.assertEqual(data.stats()["flushed"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()